@@ -0,0 +1,86 @@
+import hashlib
+import re
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, IntegerField, Value, When
+from django.utils import timezone
+
+from .models import Address, Order
+
+# ---------------------------------------------------------------------------------------------------
+# User चा address book - checkout ला तोच address परत आला तर नवीन row ऐवजी जुनीच वापरतो
+# ✅ Fields normalize करून (case, spaces, commas / dots, phone मधले फक्त digits) sha256 hash
+# ✅ (user, address_hash) unique - lookup एका index वर, concurrent checkouts मध्येही एकच row
+# Stored values user ने पहिल्यांदा दिलेल्या तशाच राहतात, फक्त matching normalized hash वर
+
+ADDRESS_FIELDS = ('full_name', 'phone', 'address', 'city', 'state', 'pincode')
+DEDUPE_BATCH_SIZE = 500
+
+_SEPARATORS = re.compile(r'[\s,.]+')
+
+
+def normalize_address(data):
+    values = []
+    for field in ADDRESS_FIELDS:
+        value = _SEPARATORS.sub(' ', str(data.get(field) or '')).strip().casefold()
+        if field == 'phone':
+            value = ''.join(char for char in value if char.isdigit())
+        elif field == 'pincode':
+            value = value.replace(' ', '')
+        values.append(value)
+    return values
+
+
+# Address fields चा dict -> hex digest
+def address_hash(data):
+    return hashlib.sha256('\x1f'.join(normalize_address(data)).encode()).hexdigest()
+
+
+def _instance_hash(address):
+    return address_hash({field: getattr(address, field) for field in ADDRESS_FIELDS})
+
+
+# Validated address data (AddressSerializer) साठी user च्या book मधली row, नसेल तर नवीन -> (address, created)
+def save_address(user, data):
+    return Address.objects.get_or_create(user=user, address_hash=address_hash(data), defaults=data)
+
+
+# ---------------------------------------------------------------------------------------------------
+# Hash नसलेल्या (जुन्या) rows hash करून duplicates merge करतो - काढलेल्या duplicate rows ची संख्या return करतो
+# ✅ Users batches मध्ये, प्रत्येक batch एक transaction: duplicates चे orders keeper कडे, मग duplicates delete
+def dedupe_addresses(batch_size=DEDUPE_BATCH_SIZE):
+    removed = 0
+    while True:
+        user_ids = list(
+            Address.objects.filter(address_hash__isnull=True)
+            .order_by('user_id').values_list('user_id', flat=True).distinct()[:batch_size]
+        )
+        if not user_ids:
+            return removed
+
+        with transaction.atomic():
+            groups = defaultdict(list)
+            for address in Address.objects.select_for_update().filter(user_id__in=user_ids).order_by('id'):
+                groups[address.user_id, _instance_hash(address)].append(address)
+
+            keepers, replaced = [], {}
+            for (_, digest), rows in groups.items():
+                # आधीच hash असलेली row असेल तर तीच ठेवायची, नाहीतर सर्वात जुनी
+                keeper = next((row for row in rows if row.address_hash == digest), rows[0])
+                replaced.update((row.pk, keeper.pk) for row in rows if row is not keeper)
+                if keeper.address_hash != digest:
+                    keeper.address_hash = digest
+                    keepers.append(keeper)
+
+            if replaced:
+                Order.objects.filter(address_id__in=replaced).update(
+                    address_id=Case(
+                        *(When(address_id=old, then=Value(new)) for old, new in replaced.items()),
+                        output_field=IntegerField(),
+                    ),
+                    updated_at=timezone.now(),
+                )
+                Address.objects.filter(pk__in=replaced).delete()
+            Address.objects.bulk_update(keepers, ['address_hash'], batch_size=batch_size)
+        removed += len(replaced)
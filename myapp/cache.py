@@ -0,0 +1,142 @@
+import hashlib
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models import F
+from rest_framework.response import Response
+
+from .models import CatalogVersion
+
+# ---------------------------------------------------------------------------------------------------
+# Product Catalog साठी Versioned Response Cache
+# ✅ प्रत्येक cache key मध्ये catalog version असतो, Product / ProductImage बदलला की version वाढतो (signals.py)
+# ✅ जुन्या version च्या entries कोणी delete करत नाही - त्या cache च्या LRU / TTL ने आपोआप निघून जातात
+# ✅ Version सगळ्या workers मध्ये shared: Redis सारख्या shared cache मध्ये, नाहीतर (LocMemCache - per process)
+#    database च्या CatalogVersion row मध्ये - एका worker मधला bump बाकीच्या workers ला पुढच्या request पासून दिसतो
+#    LocMem वर entries प्रत्येक process मध्ये वेगळ्या cache होतात, पण सगळ्या त्याच shared version खाली
+
+CATALOG_CACHE_ALIAS = getattr(settings, 'CATALOG_CACHE_ALIAS', 'default')
+CATALOG_CACHE_TIMEOUT = getattr(settings, 'CATALOG_CACHE_TIMEOUT', 300)
+CATALOG_VERSION_KEY = 'catalog:version'
+CATALOG_VERSION_NAME = 'catalog'
+
+
+def catalog_cache():
+    return caches[CATALOG_CACHE_ALIAS]
+
+
+# Cache process पुरता असेल तर version database मध्ये ठेवायचा
+def _version_in_database():
+    return isinstance(catalog_cache(), LocMemCache)
+
+
+# Version key नसेल (पहिल्यांदा किंवा evict झाला) तर current time वरून नवीन version बनवतो,
+# त्यामुळे reset झाल्यावरही जुन्या entries परत कधीच match होत नाहीत
+def _fresh_version():
+    return int(time.time() * 1000)
+
+
+def get_catalog_version():
+    if _version_in_database():
+        version = CatalogVersion.objects.filter(name=CATALOG_VERSION_NAME).values_list('value', flat=True).first()
+        if version is None:
+            CatalogVersion.objects.bulk_create(
+                [CatalogVersion(name=CATALOG_VERSION_NAME, value=_fresh_version())], ignore_conflicts=True,
+            )
+            version = CatalogVersion.objects.get(name=CATALOG_VERSION_NAME).value
+        return version
+
+    cache = catalog_cache()
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, _fresh_version(), timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    if _version_in_database():
+        if not CatalogVersion.objects.filter(name=CATALOG_VERSION_NAME).update(value=F('value') + 1):
+            get_catalog_version()
+        return get_catalog_version()
+
+    cache = catalog_cache()
+    try:
+        return cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        # Key नसेल तर incr fail होतो
+        version = _fresh_version()
+        cache.set(CATALOG_VERSION_KEY, version, timeout=None)
+        return version
+
+
+# Host + path + query string सगळं key मध्ये येतं (image URLs absolute असतात आणि pagination cursor query मध्ये असतो)
+def catalog_cache_key(request, version=None):
+    if version is None:
+        version = get_catalog_version()
+    digest = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f'catalog:v{version}:{digest}'
+
+
+# Cache मध्ये data असेल तर ORM ला हात न लावता Response देतो, नाहीतर build() call करून 200 response cache करतो
+# ✅ `compression_cache_key` मुळे CompressionMiddleware (myapp/middleware.py) compressed bytes पण याच version खाली cache करतो
+def cached_catalog_response(request, build):
+    cache = catalog_cache()
+    key = catalog_cache_key(request)
+
+    data = cache.get(key)
+    if data is not None:
+        response = Response(data)
+        response.compression_cache_key = key
+        return response
+
+    response = build()
+    if response.status_code == 200:
+        cache.set(key, response.data, CATALOG_CACHE_TIMEOUT)
+        response.compression_cache_key = key
+    return response
+
+
+# Catalog version बदलेपर्यंत एखादी computed value (उदा. validators) cache मध्ये ठेवण्यासाठी
+def cached_catalog_value(name, compute):
+    cache = catalog_cache()
+    key = f'catalog:v{get_catalog_version()}:{name}'
+
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, CATALOG_CACHE_TIMEOUT)
+    return value
+
+
+# ---------------------------------------------------------------------------------------------------
+# Cache.add() वर चालणारा छोटा lock (LocMem मध्ये एका process पुरता, Redis वर सगळ्या workers मध्ये)
+# ✅ Lock ला timeout असतो - holder crash झाला तरी lock आपोआप सुटतो
+
+
+class CacheLockTimeout(Exception):
+    pass
+
+
+# blocking=False असेल तर वाट न बघता acquired (True / False) yield करतो
+# ✅ `wait` दिला तर तेवढेच seconds थांबतो (नाहीतर lock च्या timeout इतके)
+@contextmanager
+def cache_lock(cache, key, timeout=10, blocking=True, wait=None):
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + (timeout if wait is None else wait)
+    acquired = cache.add(key, token, timeout)
+    while not acquired and blocking:
+        if time.monotonic() > deadline:
+            raise CacheLockTimeout(key)
+        time.sleep(0.01)
+        acquired = cache.add(key, token, timeout)
+
+    try:
+        yield acquired
+    finally:
+        if acquired and cache.get(key) == token:
+            cache.delete(key)
@@ -0,0 +1,96 @@
+from django.db import connection, transaction
+from django.db.models import Case, Count, DecimalField, ExpressionWrapper, F, IntegerField, Sum, Value, When, Window
+
+from .models import Cart
+
+# ---------------------------------------------------------------------------------------------------
+# Cart operations (add / set / remove) एकाच transaction मध्ये apply करण्यासाठी
+# ✅ एकाच product वरचे सगळे operations आधी एका net बदलात fold होतात (add 2, add 1, set 5 -> set 5)
+# ✅ मग operations कितीही असले तरी जास्तीत जास्त 4 queries: delete, set साठी upsert, add साठी insert + F() increment
+# ✅ (user, product) unique constraint + F('quantity') मुळे concurrent requests चे updates हरवत नाहीत
+
+ADD, SET, REMOVE = 'add', 'set', 'remove'
+
+
+# [{'op': 'add', 'product_id': 1, 'quantity': 2}, ...] -> {product_id: (ADD, n) / (SET, n) / (REMOVE, None)}
+def fold_operations(operations):
+    changes = {}
+    for operation in operations:
+        product_id, quantity = operation['product_id'], operation.get('quantity')
+        kind, current = changes.get(product_id, (ADD, 0))
+
+        if operation['op'] == ADD:
+            if kind == REMOVE:
+                changes[product_id] = (SET, quantity)
+            else:
+                changes[product_id] = (kind, current + quantity)
+        elif operation['op'] == SET and quantity > 0:
+            changes[product_id] = (SET, quantity)
+        else:
+            changes[product_id] = (REMOVE, None)
+    return changes
+
+
+# Operations validate झालेले असावेत (CartOperationSerializer) आणि products exist करत असावेत
+def apply_cart_operations(user, operations):
+    changes = fold_operations(operations)
+    removed = [product_id for product_id, (kind, _) in changes.items() if kind == REMOVE]
+    sets = {product_id: quantity for product_id, (kind, quantity) in changes.items() if kind == SET}
+    adds = {product_id: quantity for product_id, (kind, quantity) in changes.items() if kind == ADD and quantity}
+
+    with transaction.atomic():
+        if removed:
+            Cart.objects.filter(user=user, product_id__in=removed).delete()
+
+        if sets:
+            # MySQL ON DUPLICATE KEY UPDATE ला conflict target देता येत नाही
+            target = {'unique_fields': ['user', 'product']} if connection.features.supports_update_conflicts_with_target else {}
+            Cart.objects.bulk_create(
+                [Cart(user=user, product_id=product_id, quantity=quantity) for product_id, quantity in sets.items()],
+                update_conflicts=True, update_fields=['quantity'], **target,
+            )
+
+        if adds:
+            # Row नसेल तर quantity 0 ने बनतो, मग एकाच UPDATE मध्ये सगळ्या rows ला atomic increment
+            Cart.objects.bulk_create(
+                [Cart(user=user, product_id=product_id, quantity=0) for product_id in adds],
+                ignore_conflicts=True,
+            )
+            increment = Case(
+                *(When(product_id=product_id, then=Value(quantity)) for product_id, quantity in adds.items()),
+                output_field=IntegerField(),
+            )
+            Cart.objects.filter(user=user, product_id__in=adds).update(quantity=F('quantity') + increment)
+
+
+# ---------------------------------------------------------------------------------------------------
+# Cart summary साठी queryset - प्रत्येक row वर line subtotal आणि पूर्ण cart चे totals (window functions) एकाच SQL मध्ये
+# ✅ Product select_related, images prefetch - items कितीही असले तरी 2 queries
+def cart_summary_queryset(user):
+    line_subtotal = ExpressionWrapper(
+        F('quantity') * F('product__price'), output_field=DecimalField(max_digits=12, decimal_places=2),
+    )
+    return (
+        Cart.objects.filter(user=user)
+        .select_related('product')
+        .prefetch_related('product__images')
+        .annotate(
+            line_subtotal=line_subtotal,
+            cart_total=Window(Sum(line_subtotal)),
+            cart_item_count=Window(Sum('quantity')),
+            cart_line_count=Window(Count('id')),
+        )
+        .order_by('id')
+    )
+
+
+# Summary data: items + totals (rows नसतील तर 0)
+def cart_summary(user):
+    items = list(cart_summary_queryset(user))
+    first = items[0] if items else None
+    return {
+        'items': items,
+        'line_count': first.cart_line_count if first else 0,
+        'item_count': first.cart_item_count if first else 0,
+        'total': first.cart_total if first else 0,
+    }
@@ -0,0 +1,289 @@
+import atexit
+import logging
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection, connections, transaction
+from django.db.models import Q
+
+from .cache import cache_lock
+from .cart import ADD, REMOVE, SET, apply_cart_operations, fold_operations
+from .fast_serializers import serialize_cart, serialize_cart_rows
+from .models import Cart, Product
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------------------------------
+# Cart storage - settings.CART_STORE = 'database' (default) किंवा 'cache'
+#
+# 'cache' mode:
+# ✅ प्रत्येक user चा cart cache मध्ये एक compact dict: {product_id: [cart_id, quantity]} (quantity 0 = delete pending)
+# ✅ Quantity बदल / remove फक्त cache मध्ये होतात आणि background flusher batches मध्ये Cart table मध्ये लिहितो (write-behind)
+# ✅ Cart मध्ये नवीन product आला तरच row लगेच insert होते (client ला cart_id लागतो)
+# ✅ Dirty users चा map {user_id: generation} पण cache मध्ये - flush पूर्ण झाल्याशिवाय user त्यातून निघत नाही,
+#    त्यामुळे flush मध्ये process crash झाला तरी पुढचा flusher तेच users परत लिहितो
+# ✅ Cache मध्ये cart नसेल (पहिल्यांदा, evict, restart) तर Cart table मधून load होतो - database हाच recovery source
+# ✅ Checkout आधी user चा cart user-lock घेऊन database मध्ये लिहिला जातो (checkout_cart) - checkout नेहमी consistent cart वाचतो
+# Cache मधला cart flush होण्याआधी evict झाला तर शेवटच्या CART_FLUSH_INTERVAL मधले बदल हरवू शकतात
+# ✅ Cache सगळ्या workers मध्ये shared आणि eviction न करणारा असावा (Redis) - LocMem / Dummy वर प्रत्येक process चा
+#    वेगळा store आणि MAX_ENTRIES नंतर carts evict, म्हणून 'cache' mode तसा configure केला तर system check error (myapp.E002)
+
+CART_STORE = getattr(settings, 'CART_STORE', 'database')
+CART_CACHE_ALIAS = getattr(settings, 'CART_CACHE_ALIAS', 'default')
+CART_CACHE_TIMEOUT = getattr(settings, 'CART_CACHE_TIMEOUT', 60 * 60 * 24)
+CART_FLUSH_INTERVAL = getattr(settings, 'CART_FLUSH_INTERVAL', 2)
+CART_FLUSH_BATCH_SIZE = getattr(settings, 'CART_FLUSH_BATCH_SIZE', 500)
+CART_LOCK_TIMEOUT = 10
+
+DIRTY_KEY = 'cart:dirty'
+DIRTY_LOCK_KEY = 'cart:dirty:lock'
+
+_flusher_lock = threading.Lock()
+_flusher = None
+
+
+def uses_cache():
+    return CART_STORE == 'cache'
+
+
+@checks.register(checks.Tags.caches)
+def check_cart_cache(app_configs, **kwargs):
+    if not uses_cache():
+        return []
+    backend = cart_cache()
+    if isinstance(backend, (LocMemCache, DummyCache)):
+        return [checks.Error(
+            f"CART_STORE='cache' uses CART_CACHE_ALIAS ({CART_CACHE_ALIAS!r}), a {type(backend).__name__} that is not "
+            'shared between worker processes and can evict carts before they are flushed.',
+            hint='Set REDIS_URL or use CART_STORE=database.',
+            id='myapp.E002',
+        )]
+    return []
+
+
+def cart_cache():
+    return caches[CART_CACHE_ALIAS]
+
+
+def _cart_key(user_id):
+    return f'cart:{user_id}'
+
+
+def _user_lock(user_id, blocking=True):
+    return cache_lock(cart_cache(), f'cart:lock:{user_id}', CART_LOCK_TIMEOUT, blocking)
+
+
+# Cache मधला cart, नसेल तर Cart table मधून load करून cache मध्ये ठेवतो
+def _load(user_id):
+    _start_flusher()
+    cache = cart_cache()
+    items = cache.get(_cart_key(user_id))
+    if items is None:
+        rows = Cart.objects.filter(user_id=user_id).values_list('product_id', 'id', 'quantity')
+        items = {product_id: [cart_id, quantity] for product_id, cart_id, quantity in rows}
+        cache.set(_cart_key(user_id), items, CART_CACHE_TIMEOUT)
+    return items
+
+
+# ---------------------------------------------------------------------------------------------------
+# Views वापरतात ते functions (दोन्ही modes साठी)
+
+# Operations validate झालेले असावेत (CartOperationSerializer) आणि products exist करत असावेत
+def update_cart(user, operations):
+    if not uses_cache():
+        apply_cart_operations(user, operations)
+        return
+
+    changes = fold_operations(operations)
+    with _user_lock(user.pk):
+        items = _load(user.pk)
+        new = {}
+        for product_id, (kind, quantity) in changes.items():
+            cart_id, current = items.get(product_id, (None, 0))
+            if kind == ADD:
+                quantity += current
+            elif kind == REMOVE:
+                quantity = 0
+
+            if cart_id is not None:
+                items[product_id] = [cart_id, quantity]
+            elif quantity:
+                new[product_id] = quantity
+
+        if new:
+            apply_cart_operations(user, [
+                {'op': SET, 'product_id': product_id, 'quantity': quantity} for product_id, quantity in new.items()
+            ])
+            rows = Cart.objects.filter(user=user, product_id__in=new).values_list('product_id', 'id', 'quantity')
+            for product_id, cart_id, quantity in rows:
+                items[product_id] = [cart_id, quantity]
+
+        cart_cache().set(_cart_key(user.pk), items, CART_CACHE_TIMEOUT)
+
+    if len(new) < len(changes):
+        _mark_dirty(user.pk)
+
+
+# GET /cart/ सारखा output (fast-path serializer)
+def cart_data(user, request=None):
+    if not uses_cache():
+        return serialize_cart(Cart.objects.filter(user=user), request)
+
+    live = {product_id: entry for product_id, entry in _load(user.pk).items() if entry[1]}
+    products = Product.objects.filter(id__in=live).values_list('id', 'name', 'description', 'price')
+    rows = [
+        (live[product_id][0], live[product_id][1], product_id, name, description, price)
+        for product_id, name, description, price in products
+    ]
+    return serialize_cart_rows(sorted(rows), request)
+
+
+# User च्या cart मधल्या cart_id चा product (नसेल तर None)
+def cart_product_id(user, cart_id):
+    if not uses_cache():
+        return Cart.objects.filter(id=cart_id, user=user).values_list('product_id', flat=True).first()
+
+    for product_id, (entry_id, quantity) in _load(user.pk).items():
+        if entry_id == cart_id and quantity:
+            return product_id
+    return None
+
+
+# Cart table वाचण्याआधी (उदा. `?fields=` साठी DRF serializer) cache मधला cart database मध्ये लिहितो
+def sync_cart(user):
+    if not uses_cache():
+        return
+    with _user_lock(user.pk):
+        items = cart_cache().get(_cart_key(user.pk))
+        if items is not None:
+            _write_carts({user.pk: items})
+
+
+# Checkout साठी: user-lock घेऊन cart database मध्ये लिहितो, checkout होईपर्यंत कोणताही बदल / flush होऊ देत नाही
+# ✅ शेवटी cache मधला cart काढतो - पुढचा read checkout नंतरच्या Cart table मधून होतो
+@contextmanager
+def checkout_cart(user):
+    if not uses_cache():
+        yield
+        return
+
+    with _user_lock(user.pk):
+        items = cart_cache().get(_cart_key(user.pk))
+        if items is not None:
+            _write_carts({user.pk: items})
+        try:
+            yield
+        finally:
+            cart_cache().delete(_cart_key(user.pk))
+
+
+# ---------------------------------------------------------------------------------------------------
+# Write-behind flush
+
+def _mark_dirty(user_id):
+    cache = cart_cache()
+    with cache_lock(cache, DIRTY_LOCK_KEY, CART_LOCK_TIMEOUT):
+        dirty = cache.get(DIRTY_KEY) or {}
+        dirty[user_id] = dirty.get(user_id, 0) + 1
+        cache.set(DIRTY_KEY, dirty, None)
+
+
+# {user_id: items} snapshots एकाच transaction मध्ये Cart table मध्ये लिहितो (full state - delete + upsert)
+def _write_carts(snapshots):
+    if not snapshots:
+        return
+
+    product_ids = {product_id for items in snapshots.values() for product_id in items}
+    existing = set(Product.objects.filter(id__in=product_ids).values_list('id', flat=True))
+
+    stale = Q()
+    rows = []
+    for user_id, items in snapshots.items():
+        live = {product_id: entry for product_id, entry in items.items() if entry[1] and product_id in existing}
+        stale |= Q(user_id=user_id) & ~Q(product_id__in=list(live))
+        rows.extend(
+            Cart(id=cart_id, user_id=user_id, product_id=product_id, quantity=quantity)
+            for product_id, (cart_id, quantity) in live.items()
+        )
+
+    target = {'unique_fields': ['user', 'product']} if connection.features.supports_update_conflicts_with_target else {}
+    with transaction.atomic():
+        Cart.objects.filter(stale).delete()
+        if rows:
+            Cart.objects.bulk_create(rows, update_conflicts=True, update_fields=['quantity'], **target)
+
+
+# Dirty carts batches मध्ये database मध्ये लिहितो आणि किती users flush झाले ते return करतो
+# ✅ ज्या user चा lock दुसऱ्या request / checkout कडे आहे तो skip होतो आणि dirty राहतो
+def flush_carts():
+    cache = cart_cache()
+    dirty = cache.get(DIRTY_KEY) or {}
+    pending = sorted(dirty)
+    flushed = {}
+
+    for start in range(0, len(pending), CART_FLUSH_BATCH_SIZE):
+        with ExitStack() as locks:
+            snapshots = {}
+            for user_id in pending[start:start + CART_FLUSH_BATCH_SIZE]:
+                if not locks.enter_context(_user_lock(user_id, blocking=False)):
+                    continue
+                items = cache.get(_cart_key(user_id))
+                if items is None:
+                    # Flush आधीच cart evict झाला - flushed mark करत नाही, user dirty राहतो (पुढच्या load नंतर परत लिहिला जातो)
+                    continue
+                snapshots[user_id] = items
+                flushed[user_id] = dirty[user_id]
+
+            _write_carts(snapshots)
+
+            # Delete pending entries आता database मधून गेल्या - cache मधूनही काढतो
+            for user_id, items in snapshots.items():
+                live = {product_id: entry for product_id, entry in items.items() if entry[1]}
+                if len(live) != len(items):
+                    cache.set(_cart_key(user_id), live, CART_CACHE_TIMEOUT)
+
+    if flushed:
+        # Flush चालू असताना परत बदललेले users (generation वाढलेली) dirty राहतात
+        with cache_lock(cache, DIRTY_LOCK_KEY, CART_LOCK_TIMEOUT):
+            dirty = cache.get(DIRTY_KEY) or {}
+            for user_id, generation in flushed.items():
+                if dirty.get(user_id) == generation:
+                    del dirty[user_id]
+            cache.set(DIRTY_KEY, dirty, None)
+    return len(flushed)
+
+
+def _flush_loop():
+    while True:
+        time.sleep(CART_FLUSH_INTERVAL)
+        try:
+            flush_carts()
+        except Exception:
+            logger.exception('Cart flush failed')
+        finally:
+            connections.close_all()
+
+
+def _flush_at_exit():
+    try:
+        flush_carts()
+    except Exception:
+        logger.exception('Cart flush at exit failed')
+
+
+# प्रत्येक web worker process मध्ये एक daemon flusher thread (cache mode मध्ये पहिल्या cart access वर सुरू होतो)
+def _start_flusher():
+    global _flusher
+    if _flusher is not None:
+        return
+    with _flusher_lock:
+        if _flusher is None:
+            _flusher = threading.Thread(target=_flush_loop, name='cart-flusher', daemon=True)
+            _flusher.start()
+            atexit.register(_flush_at_exit)
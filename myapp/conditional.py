@@ -0,0 +1,84 @@
+import hashlib
+from calendar import timegm
+
+from django.db import connections
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils import timezone
+from django.utils.http import http_date, quote_etag
+
+from .cache import cached_catalog_value
+from .models import DeletionMark, Product, ProductImage
+
+# ---------------------------------------------------------------------------------------------------
+# Conditional GET (ETag / Last-Modified / 304) साठी helpers
+# ✅ Validators फक्त count(*) + max(updated_at) वरून बनतात (updated_at वर index आहे)
+# ✅ Delete झाला की त्या model चा DeletionMark पुढे जातो - Last-Modified = max(updated_at, शेवटचा delete),
+#    त्यामुळे फक्त If-Modified-Since पाठवणाऱ्या client ला delete नंतर 304 जात नाही
+# ✅ OrderItem बदलला / delete झाला की त्याच्या Order चा updated_at पुढे जातो (signals.py) - order validators ला items पण दिसतात
+# ✅ Client कडे latest data असेल तर serializer न चालवता 304 Not Modified जातो
+# Mark पूर्ण table साठी एक आहे - कुठलाही delete त्या model च्या सगळ्या lists चा Last-Modified पुढे नेतो (जास्तीत जास्त एक 200 जास्त)
+
+EMPTY_LAST_MODIFIED = 1
+
+
+# Queryset ची (row count, latest updated_at / delete) state
+def queryset_state(queryset):
+    state = queryset.order_by().aggregate(count=Count('pk'), last_modified=Max('updated_at'))
+    deleted_at = DeletionMark.objects.filter(model=queryset.model._meta.label_lower).values_list('deleted_at', flat=True).first()
+    return state['count'], max(filter(None, (state['last_modified'], deleted_at)), default=None)
+
+
+# Model च्या rows delete झाल्याची वेळ नोंदवतो (signals.py - post_delete)
+def mark_deleted(model, using='default'):
+    target = {'unique_fields': ['model']} if connections[using].features.supports_update_conflicts_with_target else {}
+    DeletionMark.objects.using(using).bulk_create(
+        [DeletionMark(model=model._meta.label_lower, deleted_at=timezone.now())],
+        update_conflicts=True, update_fields=['deleted_at'], **target,
+    )
+
+
+# सर्व Products + Images ची state - catalog version बदलेपर्यंत cache मध्ये राहते
+def catalog_state():
+    return cached_catalog_value('state', lambda: (
+        queryset_state(Product.objects.all()),
+        queryset_state(ProductImage.objects.all()),
+    ))
+
+
+# एका Product + त्याच्या Images ची state
+def product_state(product_id):
+    return cached_catalog_value(f'state:{product_id}', lambda: (
+        queryset_state(Product.objects.filter(pk=product_id)),
+        queryset_state(ProductImage.objects.filter(product_id=product_id)),
+    ))
+
+
+# URL + states वरून (etag, last_modified timestamp) बनवतो
+# ✅ प्रत्येक state म्हणजे (count, last_modified); scope (उदा. user id) पण etag मध्ये मिसळतो
+# ✅ `extra` - rows शिवाय response मध्ये येणारी बाकीची value (उदा. next link, approximate count), फक्त etag मध्ये
+# States मध्ये एकही row / delete नसेल तर fixed epoch Last-Modified - रिकाम्या list ला पण validator, polling ला 304
+# (Django 0 ला "Last-Modified नाही" मानतो म्हणून epoch + 1 second)
+def build_validators(request, *states, scope=None, extra=None):
+    seed = repr((request.build_absolute_uri(), scope, states, extra)).encode()
+    etag = quote_etag(hashlib.md5(seed).hexdigest())
+
+    modified = [last_modified for count, last_modified in states if last_modified is not None]
+    last_modified = timegm(max(modified).utctimetuple()) if modified else EMPTY_LAST_MODIFIED
+    return etag, last_modified
+
+
+# Request चे If-None-Match / If-Modified-Since validators शी match झाले तर 304, नाहीतर build() चा response + headers
+def conditional_get(request, validators, build):
+    etag, last_modified = validators
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        not_modified.headers['ETag'] = etag
+        return not_modified
+
+    response = build()
+    if response.status_code == 200:
+        response.headers.setdefault('ETag', etag)
+        response.headers.setdefault('Last-Modified', http_date(last_modified))
+    return response
@@ -0,0 +1,104 @@
+import csv
+from itertools import chain
+
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.response import Response
+
+from .models import Order, Product
+from .renderers import dumps as json_dumps
+from .serializers import OrderSerializer, ProductSerializer
+
+# ---------------------------------------------------------------------------------------------------
+# Catalog / Orders streaming export (NDJSON / CSV) साठी helpers
+# ✅ QuerySet.iterator(chunk_size=...) ने rows chunk-chunk मध्ये येतात, related data प्रत्येक chunk साठी prefetch होतो
+# ✅ StreamingHttpResponse मुळे पूर्ण list memory मध्ये बनत नाही आणि पहिला byte लगेच जातो
+
+EXPORT_CHUNK_SIZE = 500
+
+PRODUCT_CSV_HEADER = ['id', 'name', 'description', 'price', 'images']
+
+ORDER_CSV_HEADER = [
+    'order_id', 'created_at', 'user_name', 'user_email', 'total_price',
+    'full_name', 'phone', 'address', 'city', 'state', 'pincode',
+    'item_id', 'product_id', 'product_name', 'quantity', 'price',
+]
+
+
+# Export endpoints साठी Accept header कडे दुर्लक्ष करून पहिला renderer (फक्त error responses साठी) वापरतो
+class IgnoreClientContentNegotiation(BaseContentNegotiation):
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return (renderers[0], renderers[0].media_type)
+
+
+# csv.writer ला file ऐवजी हे दिलं की writerow() line string return करतो
+class _Echo:
+    def write(self, value):
+        return value
+
+
+# ---------------------------------------------------------------------------------------------------
+# Records - API सारखाच serialized data, एक-एक करून
+
+def product_records(request):
+    products = Product.objects.prefetch_related('images').order_by('id')
+    for product in products.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield ProductSerializer(product, context={'request': request}).data
+
+
+def order_records(request):
+    orders = Order.objects.with_details().order_by('-created_at', '-id')
+    for order in orders.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield OrderSerializer(order, context={'request': request}).data
+
+
+# ---------------------------------------------------------------------------------------------------
+# CSV rows - एका record मधून एक किंवा जास्त rows
+
+def product_csv_rows(record):
+    images = '|'.join(image['image'] or '' for image in record['images'])
+    yield [record['id'], record['name'], record['description'], record['price'], images]
+
+
+# प्रत्येक order item साठी एक row (items नसतील तर item columns रिकामे)
+def order_csv_rows(record):
+    address = record['address'] or {}
+    order_columns = [
+        record['id'], record['created_at'], record['user_name'], record['user_email'], record['total_price'],
+        address.get('full_name'), address.get('phone'), address.get('address'),
+        address.get('city'), address.get('state'), address.get('pincode'),
+    ]
+    if not record['items']:
+        yield order_columns + [None] * 5
+    for item in record['items']:
+        yield order_columns + [item['id'], item['product'], item['product_name'], item['quantity'], item['price']]
+
+
+# ---------------------------------------------------------------------------------------------------
+
+# `?output=ndjson` (default) किंवा `?output=csv` नुसार StreamingHttpResponse बनवतो
+def export_response(request, filename, records, csv_header, csv_rows):
+    output = request.query_params.get('output', 'ndjson')
+
+    if output == 'ndjson':
+        content = (json_dumps(record) + b'\n' for record in records)
+        content_type = 'application/x-ndjson'
+
+    elif output == 'csv':
+        writer = csv.writer(_Echo())
+        content = chain(
+            [writer.writerow(csv_header)],
+            (writer.writerow(row) for record in records for row in csv_rows(record)),
+        )
+        content_type = 'text/csv'
+
+    else:
+        return Response({'error': 'output must be ndjson or csv.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    response = StreamingHttpResponse(content, content_type=f'{content_type}; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{output}"'
+    return response
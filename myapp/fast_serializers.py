@@ -0,0 +1,167 @@
+import decimal
+from collections import defaultdict
+
+from django.utils import timezone
+
+from .models import OrderItem, ProductImage
+from .variants import variant_urls
+
+# ---------------------------------------------------------------------------------------------------
+# List endpoints साठी fast-path (read only) serializers
+# ✅ `.values()` rows मधून थेट dicts बनवतात - DRF field objects, get_attribute / to_representation dispatch नाही
+# ✅ Output ProductSerializer / CartSerializer / OrderSerializer सारखाच (byte-for-byte) - myapp/tests.py मध्ये parity test
+# ✅ `?fields=` / `?expand=` असतील तर views नेहमीचे DRF serializers वापरतात
+# Serializers मध्ये field बदलला तर इथेही तोच बदल करायचा (parity test fail होईल)
+
+PRODUCT_COLUMNS = ('id', 'name', 'description', 'price')
+
+ADDRESS_FIELDS = ('full_name', 'phone', 'address', 'city', 'state', 'pincode')
+
+# DRF DecimalField(max_digits=10, decimal_places=2) सारखंच quantize
+_CENT = decimal.Decimal('0.01')
+
+
+def _decimal(value, max_digits=10):
+    context = decimal.getcontext().copy()
+    context.prec = max_digits
+    return '{:f}'.format(value.quantize(_CENT, context=context))
+
+
+# DRF DateTimeField (ISO 8601, UTC साठी 'Z')
+def _datetime(value):
+    if not value:
+        return None
+    if timezone.is_aware(value):
+        value = value.astimezone(timezone.get_current_timezone())
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+# ImageField सारखा URL (request असेल तर absolute)
+def _file_url(storage, name, request):
+    if not name:
+        return None
+    url = storage.url(name)
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+# product_id -> [ProductImageSerializer सारखे dicts], एकाच query मध्ये
+def _images_by_product(product_ids, request):
+    images = defaultdict(list)
+    if not product_ids:
+        return images
+
+    storage = ProductImage._meta.get_field('image').storage
+    rows = ProductImage.objects.filter(product_id__in=product_ids).values_list('product_id', 'id', 'image', 'variants')
+    for product_id, image_id, name, variants in rows:
+        images[product_id].append({
+            'id': image_id,
+            'image': _file_url(storage, name, request),
+            'variants': variant_urls(variants, request),
+        })
+    return images
+
+
+# ---------------------------------------------------------------------------------------------------
+# Products
+
+# Product queryset -> `.values()` rows (CursorPagination dict rows वरही चालतो)
+def product_values(queryset):
+    return queryset.prefetch_related(None).values(*PRODUCT_COLUMNS)
+
+
+def serialize_products(rows, request=None):
+    rows = list(rows)
+    images = _images_by_product({row['id'] for row in rows}, request)
+    return [
+        {
+            'id': row['id'],
+            'name': row['name'],
+            'description': row['description'],
+            'price': _decimal(row['price']),
+            'images': images.get(row['id'], []),
+        }
+        for row in rows
+    ]
+
+
+# ---------------------------------------------------------------------------------------------------
+# Cart
+
+CART_COLUMNS = ('id', 'quantity', 'product_id', 'product__name', 'product__description', 'product__price')
+
+
+def serialize_cart(queryset, request=None):
+    return serialize_cart_rows(queryset.values_list(*CART_COLUMNS), request)
+
+
+# (cart id, quantity, product id, name, description, price) tuples वरून - cache मधल्या cart साठी पण (myapp/cart_store.py)
+def serialize_cart_rows(rows, request=None):
+    rows = list(rows)
+    images = _images_by_product({row[2] for row in rows}, request)
+    return [
+        {
+            'id': cart_id,
+            'product': {
+                'id': product_id,
+                'name': name,
+                'description': description,
+                'price': _decimal(price),
+                'images': images.get(product_id, []),
+            },
+            'quantity': quantity,
+            # Model चा `subtotal` property ReadOnlyField आहे - DRF तो Decimal म्हणूनच देतो
+            'subtotal': price * quantity,
+        }
+        for cart_id, quantity, product_id, name, description, price in rows
+    ]
+
+
+# ---------------------------------------------------------------------------------------------------
+# Orders
+
+def serialize_orders(queryset, request=None):
+    rows = list(queryset.values_list(
+        'id', 'user__username', 'user__email', 'address_id',
+        *(f'address__{field}' for field in ADDRESS_FIELDS),
+        'total_price', 'created_at',
+    ))
+
+    items = defaultdict(list)
+    product_ids = set()
+    if rows:
+        item_rows = OrderItem.objects.filter(order_id__in=[row[0] for row in rows]).values_list(
+            'order_id', 'id', 'product_id', 'product__name', 'quantity', 'price',
+        )
+        for order_id, item_id, product_id, product_name, quantity, price in item_rows:
+            items[order_id].append((item_id, product_id, product_name, quantity, price))
+            product_ids.add(product_id)
+    images = _images_by_product(product_ids, request)
+
+    address_end = 4 + len(ADDRESS_FIELDS)
+    result = []
+    for row in rows:
+        order_id, username, email, address_id = row[:4]
+        total_price, created_at = row[address_end:]
+        result.append({
+            'id': order_id,
+            'user_name': username,
+            'user_email': email,
+            'address': dict(zip(ADDRESS_FIELDS, row[4:address_end])) if address_id is not None else None,
+            'total_price': _decimal(total_price),
+            'created_at': _datetime(created_at),
+            'items': [
+                {
+                    'id': item_id,
+                    'product': product_id,
+                    'product_name': product_name,
+                    'product_images': images.get(product_id, []),
+                    'quantity': quantity,
+                    'price': _decimal(price),
+                }
+                for item_id, product_id, product_name, quantity, price in items[order_id]
+            ],
+        })
+    return result
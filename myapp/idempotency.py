@@ -0,0 +1,118 @@
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cache import CacheLockTimeout, cache_lock
+
+# ---------------------------------------------------------------------------------------------------
+# Mutating endpoints साठी `Idempotency-Key` header support
+# ✅ पहिल्या request चा response (user + path + key नुसार) cache मध्ये TTL सह ठेवतो, retry ला तोच response replay होतो
+# ✅ तोच key घेऊन एकाच वेळी दुसरा request आला तर तो पहिला पूर्ण होईपर्यंत lock वर थांबतो आणि मग replay होतो
+# ✅ तोच key वेगळ्या body सह वापरला तर 422; 5xx responses store होत नाहीत (client परत try करू शकतो)
+# ✅ Anonymous callers (उदा. contact form) client IP + User-Agent नुसार वेगळे - एकाचा key दुसऱ्याला replay होत नाही
+#    Proxy मागे REMOTE_ADDR सगळ्यांचा एकच, म्हणून IDEMPOTENCY_TRUSTED_PROXIES > 0 असेल तर X-Forwarded-For मधला
+#    आपल्या proxies नी लिहिलेला (उजवीकडून N वा) IP. त्याच्या डावीकडचे entries client स्वतः पाठवू शकतो - trust नाही
+#    Scope फक्त accidental collisions टाळतो; खरी boundary key च (client चा random UUID, तो दुसऱ्याला कळत नाही)
+# ✅ Cache सगळ्या workers मध्ये shared असावा लागतो (Redis / DatabaseCache) - LocMem वर lock फक्त एका process पुरता,
+#    म्हणून तसं configure केलं तर system check error (myapp.E001)
+# ✅ Lock चा TTL worker च्या request timeout पेक्षा मोठा - view चालू असताना lock expire होऊन दुसरा request आत येत नाही;
+#    दुसरा request IDEMPOTENCY_LOCK_WAIT पर्यंतच थांबतो, मग 409
+# Header नसेल तर view नेहमीसारखाच चालतो
+
+IDEMPOTENCY_CACHE_ALIAS = getattr(settings, 'IDEMPOTENCY_CACHE_ALIAS', 'default')
+IDEMPOTENCY_TTL = getattr(settings, 'IDEMPOTENCY_TTL', 60 * 60 * 24)
+IDEMPOTENCY_LOCK_TIMEOUT = getattr(settings, 'IDEMPOTENCY_LOCK_TIMEOUT', 60 * 10)
+IDEMPOTENCY_LOCK_WAIT = getattr(settings, 'IDEMPOTENCY_LOCK_WAIT', 30)
+IDEMPOTENCY_TRUSTED_PROXIES = getattr(settings, 'IDEMPOTENCY_TRUSTED_PROXIES', 0)
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+
+@checks.register(checks.Tags.caches)
+def check_idempotency_cache(app_configs, **kwargs):
+    backend = caches[IDEMPOTENCY_CACHE_ALIAS]
+    if isinstance(backend, (LocMemCache, DummyCache)):
+        return [checks.Error(
+            f'IDEMPOTENCY_CACHE_ALIAS ({IDEMPOTENCY_CACHE_ALIAS!r}) uses {type(backend).__name__}, which is not shared '
+            'between worker processes.',
+            hint='Point it at a Redis or DatabaseCache cache.',
+            id='myapp.E001',
+        )]
+    return []
+
+
+# Trusted proxies नी लिहिलेला client IP; header नसेल / कमी entries असतील तर REMOTE_ADDR
+def _client_ip(request):
+    if IDEMPOTENCY_TRUSTED_PROXIES:
+        forwarded = [ip.strip() for ip in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if ip.strip()]
+        if len(forwarded) >= IDEMPOTENCY_TRUSTED_PROXIES:
+            return forwarded[-IDEMPOTENCY_TRUSTED_PROXIES]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _client_scope(request):
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    return f"anonymous:{_client_ip(request)}:{request.META.get('HTTP_USER_AGENT', '')}"
+
+
+def _cache_key(request, key):
+    scope = _client_scope(request)
+    digest = hashlib.sha256(f'{scope}:{request.method}:{request.path}:{key}'.encode()).hexdigest()
+    return f'idempotency:{digest}'
+
+
+def _replay(entry, fingerprint):
+    if entry['fingerprint'] != fingerprint:
+        return Response(
+            {'error': 'Idempotency-Key was already used with a different request.'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    response = Response(entry['data'], status=entry['status'])
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+# APIView च्या post() / put() ... method वर decorator म्हणून
+def idempotent(method):
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get('Idempotency-Key')
+        if not key:
+            return method(self, request, *args, **kwargs)
+        if len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            return Response({'error': 'Idempotency-Key is too long.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        cache = caches[IDEMPOTENCY_CACHE_ALIAS]
+        cache_key = _cache_key(request, key)
+        fingerprint = hashlib.sha256(request.body).hexdigest()
+
+        entry = cache.get(cache_key)
+        if entry is not None:
+            return _replay(entry, fingerprint)
+
+        try:
+            with cache_lock(cache, f'{cache_key}:lock', IDEMPOTENCY_LOCK_TIMEOUT, wait=IDEMPOTENCY_LOCK_WAIT):
+                # Lock मिळेपर्यंत पहिला request पूर्ण झाला असेल तर त्याचाच response
+                entry = cache.get(cache_key)
+                if entry is not None:
+                    return _replay(entry, fingerprint)
+
+                response = method(self, request, *args, **kwargs)
+                if response.status_code < 500 and hasattr(response, 'data'):
+                    cache.set(cache_key, {
+                        'fingerprint': fingerprint, 'status': response.status_code, 'data': response.data,
+                    }, IDEMPOTENCY_TTL)
+                return response
+        except CacheLockTimeout:
+            return Response(
+                {'error': 'A request with this Idempotency-Key is still in progress.'},
+                status=status.HTTP_409_CONFLICT,
+            )
+    return wrapper
@@ -0,0 +1,200 @@
+import random
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, F, IntegerField, Q, Sum, Value, When
+from django.utils import timezone
+
+from .models import Order, OrderItem, StockReservation, StockShard
+
+# ---------------------------------------------------------------------------------------------------
+# Inventory - sharded stock counters आणि checkout reservations
+# ✅ Product चा stock STOCK_SHARDS rows मध्ये विभागलेला; checkout random shard वर conditional UPDATE करतो
+#    (`available >= qty` असेल तरच कमी होतो) - oversell शक्य नाही आणि concurrent checkouts वेगवेगळ्या rows lock करतात
+# ✅ एकाही shard मध्ये पुरेसा stock नसेल तेव्हाच product चे सगळे shards lock करून अनेक shards मधून घेतो
+# ✅ Reservation payment होईपर्यंत (mark_order_paid); expires_at नंतर expire_reservations batches मध्ये stock परत देतो
+# ✅ Shards नसलेल्या products चा stock track होत नाही - जुने products पूर्वीसारखेच विकले जातात
+
+STOCK_SHARDS = getattr(settings, 'STOCK_SHARDS', 8)
+STOCK_RESERVATION_TTL = getattr(settings, 'STOCK_RESERVATION_TTL', 60 * 15)
+STOCK_EXPIRY_BATCH_SIZE = getattr(settings, 'STOCK_EXPIRY_BATCH_SIZE', 1000)
+# Fallback (सगळे shards lock) आधी किती random shards try करायचे
+STOCK_PROBES = 2
+
+
+class OutOfStock(Exception):
+    def __init__(self, product_ids):
+        super().__init__(product_ids)
+        self.product_ids = sorted(product_ids)
+
+
+# ज्या products चे stock shards आहेत ते
+def tracked_products(product_ids):
+    return set(StockShard.objects.filter(product_id__in=product_ids).values_list('product_id', flat=True).distinct())
+
+
+# {product_id: {'available': n, 'reserved': n}} (track न होणारे products नसतात)
+def stock_levels(product_ids):
+    levels = defaultdict(lambda: {'available': 0, 'reserved': 0})
+    available = StockShard.objects.filter(product_id__in=product_ids).values('product_id').annotate(total=Sum('available')).order_by()
+    for row in available:
+        levels[row['product_id']]['available'] = row['total']
+    reserved = StockReservation.objects.filter(product_id__in=product_ids).values('product_id').annotate(total=Sum('quantity')).order_by()
+    for row in reserved:
+        levels[row['product_id']]['reserved'] = row['total']
+    return dict(levels)
+
+
+# विकता येणारा stock `quantity` करतो आणि shards मध्ये समान वाटतो (outstanding reservations वेगळे राहतात)
+# ✅ Shards कमी केले तर काढलेल्या shards वरचे reservations उरलेल्या shards वर (shard % shards) हलवतो -
+#    नाहीतर expire / cancel झाल्यावर त्यांचा stock delete झालेल्या row मध्ये परत जाऊन हरवला असता
+def set_stock(product_id, quantity, shards=STOCK_SHARDS):
+    base, extra = divmod(quantity, shards)
+    target = {'unique_fields': ['product', 'shard']} if connection.features.supports_update_conflicts_with_target else {}
+    with transaction.atomic():
+        # Reservations आधी, मग shards lock (release / expire / payment सारखाच क्रम - deadlock नाही);
+        # चालू checkouts चे shard updates पूर्ण होईपर्यंत थांबतो
+        dropped = StockReservation.objects.filter(product_id=product_id, shard__gte=shards)
+        list(dropped.select_for_update().values_list('id', flat=True))
+        list(StockShard.objects.select_for_update().filter(product_id=product_id).values_list('id', flat=True))
+        dropped.update(shard=F('shard') % shards)
+        StockShard.objects.filter(product_id=product_id, shard__gte=shards).delete()
+        StockShard.objects.bulk_create(
+            [StockShard(product_id=product_id, shard=shard, available=base + (shard < extra)) for shard in range(shards)],
+            update_conflicts=True, update_fields=['available'], **target,
+        )
+
+
+# Product च्या shards मधून `quantity` काढतो -> [(shard, quantity), ...], पुरेसा stock नसेल तर None
+def _take(product_id, quantity, shards):
+    for shard in random.sample(range(shards), min(STOCK_PROBES, shards)):
+        taken = StockShard.objects.filter(product_id=product_id, shard=shard, available__gte=quantity).update(
+            available=F('available') - quantity,
+        )
+        if taken:
+            return [(shard, quantity)]
+
+    # Stock shards मध्ये विखुरलेला / कमी - सगळे shards lock करून घेतो
+    rows = list(
+        StockShard.objects.select_for_update().filter(product_id=product_id, available__gt=0)
+        .order_by('shard').values_list('shard', 'available')
+    )
+    if sum(available for _, available in rows) < quantity:
+        return None
+
+    parts, remaining = [], quantity
+    for shard, available in rows:
+        part = min(available, remaining)
+        parts.append((shard, part))
+        remaining -= part
+        if not remaining:
+            break
+    StockShard.objects.filter(product_id=product_id, shard__in=[shard for shard, _ in parts]).update(
+        available=F('available') - Case(
+            *(When(shard=shard, then=Value(part)) for shard, part in parts), output_field=IntegerField(),
+        ),
+    )
+    return parts
+
+
+# (product_id, shard, quantity) rows चा stock shards मध्ये परत (एकाच UPDATE मध्ये)
+def _restore(rows):
+    totals = defaultdict(int)
+    for product_id, shard, quantity in rows:
+        totals[product_id, shard] += quantity
+    if not totals:
+        return
+
+    match = Q()
+    for product_id, shard in totals:
+        match |= Q(product_id=product_id, shard=shard)
+    StockShard.objects.filter(match).update(available=F('available') + Case(
+        *(When(product_id=product_id, shard=shard, then=Value(quantity)) for (product_id, shard), quantity in totals.items()),
+        output_field=IntegerField(),
+    ))
+
+
+# ---------------------------------------------------------------------------------------------------
+# Checkout / payment / cancel
+
+# Order साठी {product_id: quantity} reserve करतो - कुठलाही product कमी पडला तर OutOfStock (caller चा transaction rollback)
+# ✅ Caller च्या transaction मध्ये चालवायचा (CheckoutView) - shard locks commit पर्यंत, पण फक्त एका shard row वर
+def reserve_stock(order, quantities, shards=STOCK_SHARDS, ttl=STOCK_RESERVATION_TTL):
+    tracked = tracked_products(quantities)
+    if not tracked:
+        return
+
+    expires_at = timezone.now() + timedelta(seconds=ttl)
+    reservations, missing = [], []
+    with transaction.atomic(savepoint=False):
+        # Products नेहमी एकाच क्रमाने - दोन checkouts एकमेकांच्या locks साठी deadlock होत नाहीत
+        for product_id in sorted(tracked):
+            parts = _take(product_id, quantities[product_id], shards)
+            if parts is None:
+                missing.append(product_id)
+                continue
+            reservations.extend(
+                StockReservation(order=order, product_id=product_id, shard=shard, quantity=quantity, expires_at=expires_at)
+                for shard, quantity in parts
+            )
+        if missing:
+            raise OutOfStock(missing)
+        StockReservation.objects.bulk_create(reservations)
+
+
+# Order चे reservations काढून stock परत (order delete - signals.release_order_stock)
+def release_reservations(order):
+    with transaction.atomic():
+        reservations = StockReservation.objects.select_for_update().filter(order=order)
+        rows = list(reservations.values_list('id', 'product_id', 'shard', 'quantity'))
+        _restore(row[1:] for row in rows)
+        StockReservation.objects.filter(id__in=[row[0] for row in rows]).delete()
+
+
+# Payment confirm: reservations consume होतात (stock shards मध्ये परत जात नाही) आणि order paid होतो
+# ✅ Reservation आधीच expire झाला असेल तर stock परत reserve करायचा प्रयत्न - नसेल तर OutOfStock
+def mark_order_paid(order_id, shards=STOCK_SHARDS):
+    with transaction.atomic():
+        order = Order.objects.select_for_update().get(pk=order_id)
+        if order.paid_at is not None:
+            return order
+
+        reserved = defaultdict(int)
+        rows = list(StockReservation.objects.select_for_update().filter(order=order).values_list('id', 'product_id', 'quantity'))
+        for _, product_id, quantity in rows:
+            reserved[product_id] += quantity
+
+        needed = OrderItem.objects.filter(order=order).values('product_id').annotate(total=Sum('quantity')).order_by()
+        missing = {row['product_id']: row['total'] - reserved[row['product_id']] for row in needed}
+        missing = {product_id: quantity for product_id, quantity in missing.items() if quantity > 0}
+
+        short = []
+        for product_id in sorted(tracked_products(missing)):
+            if _take(product_id, missing[product_id], shards) is None:
+                short.append(product_id)
+        if short:
+            raise OutOfStock(short)
+
+        StockReservation.objects.filter(id__in=[row[0] for row in rows]).delete()
+        order.paid_at = timezone.now()
+        order.save(update_fields=['paid_at', 'updated_at'])
+    return order
+
+
+# ---------------------------------------------------------------------------------------------------
+# Expired reservations चा एक batch release करतो - released reservations ची संख्या return करतो
+# ✅ Postgres / MySQL 8 वर अनेक workers skip_locked ने parallel चालू शकतात
+def expire_reservations(batch_size=STOCK_EXPIRY_BATCH_SIZE):
+    with transaction.atomic():
+        expired = StockReservation.objects.filter(expires_at__lte=timezone.now()).order_by('id')
+        if connection.features.has_select_for_update_skip_locked:
+            expired = expired.select_for_update(skip_locked=True)
+        rows = list(expired.values_list('id', 'product_id', 'shard', 'quantity')[:batch_size])
+        if not rows:
+            return 0
+
+        _restore(row[1:] for row in rows)
+        StockReservation.objects.filter(id__in=[row[0] for row in rows]).delete()
+    return len(rows)
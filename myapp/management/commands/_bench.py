@@ -0,0 +1,73 @@
+import time
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from myapp.models import Address, Cart, Order, OrderItem, Product, ProductImage
+
+# ---------------------------------------------------------------------------------------------------
+# bench_* commands साठी shared helpers
+# ✅ Benchmark data एका transaction मध्ये बनतो आणि शेवटी rollback होतो - database मध्ये काहीच राहत नाही
+
+
+class Rollback(Exception):
+    pass
+
+
+# `with benchmark_data(...) as data:` - block संपला की सगळा seeded data rollback
+class benchmark_data:
+    def __init__(self, products=500, images_per_product=3, orders=200, items_per_order=4, cart_items=50):
+        self.sizes = (products, images_per_product, orders, items_per_order, cart_items)
+        self._atomic = transaction.atomic()
+
+    def __enter__(self):
+        self._atomic.__enter__()
+        return seed(*self.sizes)
+
+    def __exit__(self, exc_type, exc, tb):
+        transaction.set_rollback(True)
+        self._atomic.__exit__(exc_type, exc, tb)
+        return False
+
+
+def seed(products, images_per_product, orders, items_per_order, cart_items):
+    user = User.objects.create_user('bench-user', 'bench@example.com')
+    catalog = Product.objects.bulk_create(
+        Product(name=f'Bench product {i}', description=f'Description for bench product {i}', price=Decimal(i % 1000) + Decimal('0.99'))
+        for i in range(products)
+    )
+    # MySQL bulk insert नंतर ids देत नाही
+    catalog = list(Product.objects.filter(name__startswith='Bench product ').order_by('id'))
+
+    variants = {'thumbnail': {'webp': 'product_images/variants/bench_thumbnail.webp', 'jpeg': 'product_images/variants/bench_thumbnail.jpg'}}
+    ProductImage.objects.bulk_create(
+        ProductImage(product=product, image=f'product_images/bench/{product.pk}_{n}.jpg', variants=variants)
+        for product in catalog for n in range(images_per_product)
+    )
+
+    Cart.objects.bulk_create(
+        Cart(user=user, product=catalog[i % len(catalog)], quantity=i % 5 + 1) for i in range(cart_items)
+    )
+
+    address = Address.objects.create(
+        user=user, full_name='Bench User', phone='9999999999', address='1 Bench Street',
+        city='Pune', state='MH', pincode='411001',
+    )
+    Order.objects.bulk_create(Order(user=user, address=address, total_price=Decimal('999.00')) for _ in range(orders))
+    order_ids = list(Order.objects.filter(user=user).values_list('id', flat=True))
+    OrderItem.objects.bulk_create(
+        OrderItem(order_id=order_id, product=catalog[(order_id + n) % len(catalog)], quantity=n + 1, price=Decimal('249.50'))
+        for order_id in order_ids for n in range(items_per_order)
+    )
+    return {'user': user, 'products': catalog}
+
+
+# Function `repeat` वेळा चालवून best (सर्वात कमी) वेळ seconds मध्ये
+def best_of(function, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
@@ -0,0 +1,313 @@
+import time
+import uuid
+from collections import defaultdict
+from decimal import Decimal
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from myapp.analytics import (
+    MAX_BASKET_SIZE, MIN_PRICE_POINTS, PERCENTILES, RETENTION_PERIODS, available, basket_sizes, cohort_retention,
+    load_line_items, order_index, price_elasticity, revenue_percentiles,
+)
+from myapp.models import Order, OrderItem, Product
+from myapp.rollups import mark_days_dirty
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FIRST_MONTH = datetime(2023, 1, 1, tzinfo=dt_timezone.utc)
+
+
+# ---------------------------------------------------------------------------------------------------
+# NumPy sales report (myapp/analytics.py) vs ORM rows वरचा साधा Python loop benchmark
+#
+#   python manage.py bench_analytics                          # 10M line items (seeding ला बराच वेळ लागतो)
+#   python manage.py bench_analytics --items 1000000
+#   python manage.py bench_analytics --items 1000000 --i-know   # DEBUG = False असताना
+#
+# ✅ Data committed chunks मध्ये seed होतो (10M rows चा एकच मोठा transaction नाही) - users / products च्या नावात
+#    प्रत्येक run चा unique tag, आणि शेवटी (fail / Ctrl-C झालं तरी) तेच rows chunks मध्ये delete होतात
+# ✅ ORM loop rows stream करतो (iterator) - 10M rows ची list memory मध्ये बनत नाही
+# Seed चालू असताना refresh_rollups चालला तर bench orders rollups मध्ये येऊ शकतात - cleanup ते दिवस dirty करतो
+# ✅ दोन्ही implementations चे results सारखेच आहेत का ते पण तपासतो
+# ✅ Rows configured database मध्येच commit होतात - DEBUG नसेल (production settings) तर --i-know शिवाय चालत नाही
+# ✅ Prices discount नुसार बदलतात आणि quantity price वर अवलंबून - elasticity ला खरा signal मिळतो
+class Command(BaseCommand):
+    help = 'Benchmark the NumPy sales report against a plain ORM loop on seeded order items.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=10_000_000, help='Order line items to seed (default: 10M).')
+        parser.add_argument('--products', type=int, default=2000)
+        parser.add_argument('--users', type=int, default=50000)
+        parser.add_argument('--months', type=int, default=24)
+        parser.add_argument('--top', type=int, default=20)
+        parser.add_argument(
+            '--i-know', action='store_true',
+            help='Seed (and afterwards delete) benchmark rows even though DEBUG is off.',
+        )
+
+    def handle(self, *args, **options):
+        if not available():
+            raise CommandError('numpy is not installed.')
+        if not settings.DEBUG and not options['i_know']:
+            raise CommandError(
+                f'DEBUG is off - this commits up to {options["items"]:,} order items to the '
+                f'{connection.settings_dict["NAME"]!r} database. Pass --i-know to run it anyway.'
+            )
+
+        run = uuid.uuid4().hex[:12]
+        started = time.perf_counter()
+        try:
+            self._seed(run, options)
+            self.stdout.write(f'Seeded {options["items"]:,} line items in {time.perf_counter() - started:.1f}s')
+            self._run(options['top'])
+        finally:
+            self._cleanup(run, options)
+
+    def _seed(self, run, options):
+        rng = np.random.default_rng(7)
+        Product.objects.bulk_create(
+            (Product(name=f'Bench analytics {run} product {i}', description='', price=Decimal(i % 1000) + Decimal('0.99'))
+             for i in range(options['products'])), batch_size=5000,
+        )
+        User.objects.bulk_create(
+            (User(username=f'bench-analytics-{run}-{i}') for i in range(options['users'])), batch_size=5000,
+        )
+        user_ids = np.array(User.objects.filter(username__startswith=f'bench-analytics-{run}-').values_list('id', flat=True))
+        # MySQL bulk insert नंतर ids देत नाही
+        products = Product.objects.filter(name__startswith=f'Bench analytics {run} ').order_by('id').values_list('id', 'price')
+        product_ids = np.array([pk for pk, _ in products])
+        base_prices = np.array([float(price) for _, price in products])
+
+        # सरासरी 4 lines प्रति order; orders महिन्यांच्या क्रमाने insert होतात
+        lines_per_order = rng.integers(1, 8, size=options['items'] // 4 + 1)
+        lines_per_order = lines_per_order[np.cumsum(lines_per_order) <= options['items']]
+        months = np.sort(rng.integers(0, options['months'], size=lines_per_order.size))
+
+        last_id = Order.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        self._insert(Order, ['user_id', 'total_price', 'created_at', 'updated_at'], (
+            (int(user), 0, timezone.now(), timezone.now())
+            for user in rng.choice(user_ids, size=lines_per_order.size)
+        ))
+        # फक्त या run चे orders (एकाच वेळी आलेले खरे orders वगळण्यासाठी)
+        run_orders = Order.objects.filter(id__gt=last_id, user__username__startswith=f'bench-analytics-{run}-')
+        order_ids = np.array(run_orders.order_by('id').values_list('id', flat=True))
+
+        for month in range(options['months']):
+            ids = order_ids[months == month]
+            if ids.size:
+                run_orders.filter(id__gte=int(ids[0]), id__lte=int(ids[-1])).update(
+                    created_at=FIRST_MONTH + timedelta(days=30.5 * month),
+                )
+
+        line_orders = np.repeat(order_ids, lines_per_order)
+        choice = rng.integers(0, product_ids.size, size=line_orders.size)
+        discount = rng.choice([1.0, 0.9, 0.8, 0.7], size=line_orders.size)
+        prices = np.round(base_prices[choice] * discount, 2)
+        quantities = rng.poisson(1.5 * discount ** -1.5) + 1
+        self._insert(OrderItem, ['order_id', 'product_id', 'quantity', 'price'], (
+            (int(order), int(product_ids[product]), int(quantity), float(price))
+            for order, product, quantity, price in zip(line_orders, choice, quantities, prices)
+        ))
+
+    # Model objects न बनवता executemany (10M rows साठी bulk_create खूप हळू) - प्रत्येक batch स्वतंत्र commit (autocommit)
+    def _insert(self, model, columns, rows, batch_size=20000):
+        table = connection.ops.quote_name(model._meta.db_table)
+        names = ', '.join(connection.ops.quote_name(column) for column in columns)
+        sql = f'INSERT INTO {table} ({names}) VALUES ({", ".join(["%s"] * len(columns))})'
+        batch = []
+        with connection.cursor() as cursor:
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    cursor.executemany(sql, batch)
+                    batch = []
+            if batch:
+                cursor.executemany(sql, batch)
+
+    # Signals / cascade collector शिवाय `column IN (ids)` rows delete (OrderItem receivers प्रत्येक row साठी query करतात)
+    def _delete(self, model, column, ids):
+        table = connection.ops.quote_name(model._meta.db_table)
+        sql = f'DELETE FROM {table} WHERE {connection.ops.quote_name(column)} IN ({", ".join(["%s"] * len(ids))})'
+        with connection.cursor() as cursor:
+            cursor.execute(sql, ids)
+
+    # या run चे orders / items id chunks मध्ये, मग users आणि products
+    def _cleanup(self, run, options, batch_size=5000):
+        started = time.perf_counter()
+        # SQLite एका query मध्ये 999 parameters पर्यंतच
+        batch_size = min(batch_size, connection.features.max_query_params or batch_size)
+        orders = Order.objects.filter(user__username__startswith=f'bench-analytics-{run}-').order_by('id')
+        last = 0
+        while True:
+            ids = list(orders.filter(id__gt=last).values_list('id', flat=True)[:batch_size])
+            if not ids:
+                break
+            self._delete(OrderItem, 'order_id', ids)
+            self._delete(Order, 'id', ids)
+            last = ids[-1]
+
+        User.objects.filter(username__startswith=f'bench-analytics-{run}-').delete()
+        Product.objects.filter(name__startswith=f'Bench analytics {run} ').delete()
+        mark_days_dirty(
+            [timezone.localdate()]
+            + [timezone.localdate(FIRST_MONTH + timedelta(days=30.5 * month)) for month in range(options['months'])]
+        )
+        self.stdout.write(f'Removed benchmark data in {time.perf_counter() - started:.1f}s')
+
+    def _run(self, top):
+        started = time.perf_counter()
+        items = load_line_items()
+        loaded = time.perf_counter()
+        orders = order_index(items)
+        fast = {
+            'revenue_percentiles': revenue_percentiles(items, orders),
+            'basket_sizes': basket_sizes(items, orders),
+            'price_elasticity': price_elasticity(items, top),
+            'cohort_retention': cohort_retention(items),
+        }
+        computed = time.perf_counter()
+
+        slow = naive_report(naive_rows(), top)
+        finished = time.perf_counter()
+
+        for name in fast:
+            if not _close(fast[name], slow[name]):
+                raise CommandError(f'{name}: NumPy and ORM loop results differ.')
+
+        # ORM loop rows stream करत मोजतो, म्हणून त्याचा load / compute वेगळा मोजता येत नाही
+        self.stdout.write(
+            f'NumPy    : load {loaded - started:.2f}s + compute {computed - loaded:.2f}s = {computed - started:.2f}s\n'
+            f'ORM loop : streamed load + compute = {finished - computed:.2f}s\n'
+            f'Speedup  : {(finished - computed) / (computed - started):.1f}x overall'
+        )
+
+
+# ---------------------------------------------------------------------------------------------------
+# तेच metrics ORM rows वर साध्या Python loops ने (तुलनेसाठी)
+# Rows एका वेळी chunk_size इतकेच memory मध्ये
+def naive_rows():
+    rows = OrderItem.objects.values_list('order_id', 'order__user_id', 'product_id', 'quantity', 'price', 'order__created_at')
+    return rows.iterator(chunk_size=10000)
+
+
+def naive_report(rows, top):
+    revenue, units, lines = defaultdict(float), defaultdict(int), defaultdict(int)
+    points = defaultdict(int)
+    user_months = defaultdict(set)
+    for order_id, user_id, product_id, quantity, price, created_at in rows:
+        revenue[order_id] += quantity * float(price)
+        units[order_id] += quantity
+        lines[order_id] += 1
+        cents = round(float(price) * 100)
+        if cents > 0 and quantity > 0:
+            points[product_id, cents] += quantity
+        created_at = timezone.localtime(created_at)
+        user_months[user_id].add(created_at.year * 12 + created_at.month - 1)
+
+    return {
+        'revenue_percentiles': _naive_percentiles(revenue),
+        'basket_sizes': _naive_baskets(units, lines),
+        'price_elasticity': _naive_elasticity(points, top),
+        'cohort_retention': _naive_cohorts(user_months),
+    }
+
+
+def _percentile(values, p):
+    position = (len(values) - 1) * p / 100
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+def _naive_percentiles(revenue):
+    values = sorted(revenue.values())
+    if not values:
+        return {'orders': 0, 'total': 0, 'mean': None, 'percentiles': {}}
+    return {
+        'orders': len(values),
+        'total': round(sum(values), 2),
+        'mean': round(sum(values) / len(values), 2),
+        'percentiles': {f'p{p}': round(_percentile(values, p), 2) for p in PERCENTILES},
+    }
+
+
+def _naive_baskets(units, lines):
+    if not units:
+        return {'orders': 0, 'mean_units': None, 'median_units': None, 'mean_lines': None, 'distribution': {}}
+    distribution = {str(size): 0 for size in range(1, MAX_BASKET_SIZE)}
+    distribution[f'{MAX_BASKET_SIZE}+'] = 0
+    for value in units.values():
+        distribution[str(value) if value < MAX_BASKET_SIZE else f'{MAX_BASKET_SIZE}+'] += 1
+    values = sorted(units.values())
+    return {
+        'orders': len(values),
+        'mean_units': round(sum(values) / len(values), 3),
+        'median_units': float(_percentile(values, 50)),
+        'mean_lines': round(sum(lines.values()) / len(lines), 3),
+        'distribution': distribution,
+    }
+
+
+def _naive_elasticity(points, top):
+    by_product = defaultdict(list)
+    for (product_id, cents), quantity in points.items():
+        by_product[product_id].append((np.log(cents / 100), np.log(quantity), quantity))
+
+    result = []
+    for product_id, rows in by_product.items():
+        n = len(rows)
+        sx = sum(x for x, _, _ in rows)
+        sy = sum(y for _, y, _ in rows)
+        sxx = sum(x * x for x, _, _ in rows)
+        sxy = sum(x * y for x, y, _ in rows)
+        denominator = n * sxx - sx * sx
+        if n >= MIN_PRICE_POINTS and denominator > 1e-12:
+            result.append({
+                'product_id': product_id,
+                'elasticity': round((n * sxy - sx * sy) / denominator, 4),
+                'price_points': n,
+                'units': sum(quantity for _, _, quantity in rows),
+            })
+    result.sort(key=lambda row: (-row['units'], row['product_id']))
+    return result[:top]
+
+
+def _naive_cohorts(user_months):
+    if not user_months:
+        return []
+    last_month = max(max(months) for months in user_months.values())
+    cohorts = defaultdict(lambda: [0] * RETENTION_PERIODS)
+    for months in user_months.values():
+        first = min(months)
+        for month in months:
+            if month - first < RETENTION_PERIODS:
+                cohorts[first][month - first] += 1
+
+    result = []
+    for start in sorted(cohorts):
+        counts = cohorts[start][:min(RETENTION_PERIODS, last_month - start + 1)]
+        result.append({
+            'cohort': f'{start // 12:04d}-{start % 12 + 1:02d}',
+            'users': counts[0],
+            'retention': [round(value / counts[0], 4) for value in counts],
+        })
+    return result
+
+
+# Float rounding मधला फरक सोडून results सारखे
+def _close(fast, slow):
+    if isinstance(fast, dict) and isinstance(slow, dict):
+        return fast.keys() == slow.keys() and all(_close(fast[key], slow[key]) for key in fast)
+    if isinstance(fast, list) and isinstance(slow, list):
+        return len(fast) == len(slow) and all(_close(a, b) for a, b in zip(fast, slow))
+    if isinstance(fast, float) or isinstance(slow, float):
+        return abs(fast - slow) <= 0.011 + 1e-6 * abs(slow)
+    return fast == slow
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import json
+
+from myapp.fast_serializers import product_values, serialize_orders, serialize_products
+from myapp.models import Order, Product
+from myapp.renderers import ORJSONRenderer, orjson
+from myapp.serializers import OrderSerializer
+
+from ._bench import benchmark_data, best_of
+
+
+# ---------------------------------------------------------------------------------------------------
+# DRF stdlib JSONRenderer vs ORJSONRenderer (myapp/renderers.py) benchmark
+#
+#   python manage.py bench_renderers                  # seeded data (transaction rollback होतो)
+#   python manage.py bench_renderers --live           # database मधले खरे orders / products (read only)
+#
+# ✅ दोन्ही renderers चा output parse करून सारखाच आहे का ते पण तपासतो
+class Command(BaseCommand):
+    help = 'Benchmark the stdlib JSON renderer against the orjson renderer on order and product payloads.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--live', action='store_true', help='Use the existing orders and products instead of seeded data.')
+        parser.add_argument('--products', type=int, default=1000)
+        parser.add_argument('--orders', type=int, default=500)
+        parser.add_argument('--items', type=int, default=4, help='Items per order.')
+        parser.add_argument('--repeat', type=int, default=10)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError('orjson is not installed - ORJSONRenderer falls back to the stdlib renderer.')
+
+        if options['live']:
+            self._run(options)
+        else:
+            with benchmark_data(products=options['products'], orders=options['orders'], items_per_order=options['items']):
+                self._run(options)
+
+    def _run(self, options):
+        payloads = [
+            # AdminOrderListView (`?expand=` सह DRF serializer आणि fast path दोघांचा data)
+            ('orders (DRF data)', OrderSerializer(Order.objects.with_details().order_by('-created_at'), many=True).data),
+            ('orders (fast path)', serialize_orders(Order.objects.order_by('-created_at'))),
+            ('products', serialize_products(product_values(Product.objects.order_by('id')))),
+        ]
+
+        stdlib, fast = JSONRenderer(), ORJSONRenderer()
+        self.stdout.write(f'{"payload":<20} {"size":>10} {"stdlib":>10} {"orjson":>10} {"speedup":>8}')
+        for name, data in payloads:
+            expected, rendered = stdlib.render(data), fast.render(data)
+            if json.loads(expected) != json.loads(rendered):
+                raise CommandError(f'{name}: renderers produced different JSON.')
+
+            slow_time = best_of(lambda: stdlib.render(data), options['repeat'])
+            fast_time = best_of(lambda: fast.render(data), options['repeat'])
+            self.stdout.write(
+                f'{name:<20} {len(expected) / 1024:>8.0f}KB {slow_time * 1000:>8.1f}ms '
+                f'{fast_time * 1000:>8.1f}ms {slow_time / fast_time:>7.1f}x'
+            )
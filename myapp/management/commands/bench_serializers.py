@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+
+from myapp.fast_serializers import product_values, serialize_cart, serialize_orders, serialize_products
+from myapp.models import Cart, Order, Product
+from myapp.serializers import CartSerializer, OrderSerializer, ProductSerializer
+
+from ._bench import benchmark_data, best_of
+
+
+# ---------------------------------------------------------------------------------------------------
+# DRF serializers vs fast-path serializers (myapp/fast_serializers.py) benchmark
+#
+#   python manage.py bench_serializers --products 2000 --orders 500
+#
+# ✅ Data transaction मध्ये seed होतो आणि rollback होतो; दोन्ही paths च्या वेळेत queries पण येतात
+class Command(BaseCommand):
+    help = 'Benchmark DRF serializers against the fast-path list serializers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=1000)
+        parser.add_argument('--images', type=int, default=3, help='Images per product.')
+        parser.add_argument('--orders', type=int, default=300)
+        parser.add_argument('--items', type=int, default=4, help='Items per order.')
+        parser.add_argument('--cart', type=int, default=50, help='Cart rows.')
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        with benchmark_data(
+            products=options['products'], images_per_product=options['images'],
+            orders=options['orders'], items_per_order=options['items'], cart_items=options['cart'],
+        ) as data:
+            products = Product.objects.all()
+            cart = Cart.objects.filter(user=data['user'])
+            orders = Order.objects.filter(user=data['user']).order_by('-created_at')
+
+            cases = [
+                (
+                    'products',
+                    lambda: ProductSerializer(products.prefetch_related('images'), many=True).data,
+                    lambda: serialize_products(product_values(products)),
+                ),
+                (
+                    'cart',
+                    lambda: CartSerializer(cart.select_related('product').prefetch_related('product__images'), many=True).data,
+                    lambda: serialize_cart(cart),
+                ),
+                (
+                    'orders',
+                    lambda: OrderSerializer(orders.with_details(), many=True).data,
+                    lambda: serialize_orders(orders),
+                ),
+            ]
+
+            self.stdout.write(f'{"endpoint":<10} {"DRF":>10} {"fast":>10} {"speedup":>8}')
+            for name, slow, fast in cases:
+                slow_time = best_of(slow, options['repeat'])
+                fast_time = best_of(fast, options['repeat'])
+                self.stdout.write(
+                    f'{name:<10} {slow_time * 1000:>8.1f}ms {fast_time * 1000:>8.1f}ms {slow_time / fast_time:>7.1f}x'
+                )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from myapp.addresses import DEDUPE_BATCH_SIZE, dedupe_addresses
+from myapp.models import Address
+
+
+# ---------------------------------------------------------------------------------------------------
+# Address book आधीच्या (hash नसलेल्या) Address rows hash करून प्रत्येक user चे duplicates एकाच row मध्ये merge करतो
+#
+#   python manage.py dedupe_addresses
+#
+# ✅ Duplicates वापरणारे orders keeper row कडे वळतात, मग duplicates delete - परत चालवला तरी safe
+class Command(BaseCommand):
+    help = 'Hash legacy addresses and collapse duplicate rows per user into one address-book entry.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEDUPE_BATCH_SIZE, help='Users per transaction.')
+
+    def handle(self, *args, **options):
+        before = Address.objects.count()
+        removed = dedupe_addresses(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Removed {removed} duplicate addresses ({before - removed} remain).'))
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from myapp.media import FILE_DELETION_BATCH_SIZE, drain_file_deletions
+from myapp.models import FileDeletion
+
+
+# ---------------------------------------------------------------------------------------------------
+# FileDeletion queue मधल्या files (originals + variants) storage मधून काढण्यासाठी worker command
+#
+#   python manage.py drain_file_deletions                 # सध्या due असलेल्या सर्व entries, मग exit (cron)
+#   python manage.py drain_file_deletions --loop          # सतत चालणारा worker
+#
+# ✅ Web process commit नंतर स्वतःही queue drain करतो - हा command restart / crash नंतर राहिलेल्या entries आणि retries साठी
+class Command(BaseCommand):
+    help = 'Delete queued product image files from storage, retrying failures with backoff.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=FILE_DELETION_BATCH_SIZE, help='Entries per transaction.')
+        parser.add_argument('--loop', action='store_true', help='Keep running and poll the queue.')
+        parser.add_argument('--interval', type=float, default=10, help='Seconds between polls with --loop (default: 10).')
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            processed = drain_file_deletions(options['batch_size'])
+            total += processed
+            if processed:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        pending = FileDeletion.objects.count()
+        self.stdout.write(self.style.SUCCESS(f'Processed {total} queued deletions ({pending} pending retry).'))
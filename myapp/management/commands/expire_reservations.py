@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from myapp.inventory import STOCK_EXPIRY_BATCH_SIZE, expire_reservations
+
+
+# ---------------------------------------------------------------------------------------------------
+# Payment न झालेल्या orders चे expired stock reservations release करण्यासाठी worker command
+#
+#   python manage.py expire_reservations                 # सध्या expired असलेले सर्व reservations, मग exit (cron)
+#   python manage.py expire_reservations --loop          # सतत चालणारा worker
+class Command(BaseCommand):
+    help = 'Return stock held by expired, unpaid checkout reservations to the stock shards.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=STOCK_EXPIRY_BATCH_SIZE, help='Reservations per transaction.')
+        parser.add_argument('--loop', action='store_true', help='Keep running and poll for expired reservations.')
+        parser.add_argument('--interval', type=float, default=30, help='Seconds between polls with --loop (default: 30).')
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            released = expire_reservations(options['batch_size'])
+            total += released
+            if released:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f'Released {total} expired reservations.'))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from myapp.cart_store import flush_carts, uses_cache
+
+
+# ---------------------------------------------------------------------------------------------------
+# Cache cart store (CART_STORE = 'cache') मधले dirty carts लगेच Cart table मध्ये लिहिण्यासाठी
+#
+#   python manage.py flush_carts
+#
+# ✅ Web workers स्वतः दर CART_FLUSH_INTERVAL seconds ला flush करतात - हा command deploy आधी / crash नंतर
+class Command(BaseCommand):
+    help = 'Write cached carts with pending changes back to the Cart table.'
+
+    def handle(self, *args, **options):
+        if not uses_cache():
+            self.stdout.write('CART_STORE is not "cache" - nothing to flush.')
+            return
+
+        flushed = flush_carts()
+        self.stdout.write(self.style.SUCCESS(f'Flushed {flushed} carts.'))
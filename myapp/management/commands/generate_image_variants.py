@@ -0,0 +1,62 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from myapp.models import ProductImage
+from myapp.variants import IMAGE_VARIANT_WORKERS, generate_variants
+
+
+# ---------------------------------------------------------------------------------------------------
+# जुन्या (किंवा सर्व) Product Images साठी thumbnail / card / full variants बनवण्यासाठी command
+#
+#   python manage.py generate_image_variants                  # ज्यांचे variants नाहीत फक्त ते
+#   python manage.py generate_image_variants --all            # सर्व images (आधीच्या variant files तशाच ठेवून)
+#   python manage.py generate_image_variants --all --force    # सर्व images, variant files पुन्हा लिहून
+#
+# ✅ Upload नंतरचे background jobs process restart मध्ये हरवले तर त्या images चे variants {} राहतात -
+#    हा command (flags शिवाय) deploy नंतर / cron ने चालवला की ते परत बनतात
+# Pool thread मध्ये एक image - thread चं स्वतःचं DB connection job नंतर बंद (नाहीतर प्रत्येक thread एक connection उघडा ठेवतो)
+def _generate(image_id, force):
+    try:
+        return generate_variants(image_id, force)
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = 'Generate thumbnail/card/full WebP and JPEG variants for product images.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Regenerate variants for every image.')
+        parser.add_argument('--force', action='store_true', help='Overwrite variant files that already exist in storage.')
+        parser.add_argument('--batch-size', type=int, default=100, help='Images submitted to the pool at once.')
+
+    def handle(self, *args, **options):
+        images = ProductImage.objects.order_by('id')
+        if not options['all']:
+            images = images.filter(variants={})
+
+        dispatcher = ThreadPoolExecutor(max_workers=IMAGE_VARIANT_WORKERS)
+        ids = images.values_list('id', flat=True).iterator(chunk_size=options['batch_size'])
+        done = failed = 0
+
+        while True:
+            batch = list(islice(ids, options['batch_size']))
+            if not batch:
+                break
+
+            futures = [dispatcher.submit(_generate, image_id, options['force']) for image_id in batch]
+            for image_id, future in zip(batch, futures):
+                try:
+                    future.result()
+                    done += 1
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f'ProductImage {image_id}: {e}')
+
+            self.stdout.write(f'{done} images processed, {failed} failed')
+
+        dispatcher.shutdown()
+        self.stdout.write(self.style.SUCCESS(f'Generated variants for {done} images ({failed} failed).'))
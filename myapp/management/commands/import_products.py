@@ -0,0 +1,231 @@
+import csv
+import json
+import os
+import sys
+import time
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from myapp.cache import bump_catalog_version
+from myapp.media import enqueue_file_deletions
+from myapp.models import Product, ProductImage
+from myapp.search import index_products
+
+
+# ---------------------------------------------------------------------------------------------------
+# Supplier catalog (CSV / JSONL) मधून Products bulk मध्ये import करण्यासाठी command
+#
+#   python manage.py import_products catalog.csv --batch-size 2000 --images-dir ./photos
+#   cat catalog.jsonl | python manage.py import_products - --format jsonl
+#
+# ✅ File line-by-line stream होते, एका वेळी फक्त एक batch memory मध्ये असतो
+# ✅ प्रत्येक batch एका transaction मध्ये bulk_create / bulk_update होतो
+# ✅ Columns: id (optional - असेल तर त्या product ला update), name, description, price,
+#    images (CSV मध्ये `|` ने वेगळे paths, JSONL मध्ये list)
+class Command(BaseCommand):
+    help = 'Stream products from a CSV or JSONL file (or stdin) into the catalog in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Input file path, or '-' for stdin.")
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='Input format (default: from file extension).')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per transaction (default: 1000).')
+        parser.add_argument('--images-dir', help='Base directory for relative image paths (default: input file directory).')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be at least 1.')
+
+        fmt = options['format'] or self._format_from_path(path)
+
+        if path == '-':
+            stream = sys.stdin
+            self.images_dir = options['images_dir'] or os.getcwd()
+        else:
+            try:
+                stream = open(path, newline='', encoding='utf-8')
+            except OSError as e:
+                raise CommandError(f'Cannot open {path}: {e}')
+            self.images_dir = options['images_dir'] or os.path.dirname(os.path.abspath(path))
+
+        self.image_field = ProductImage._meta.get_field('image')
+        self.name_field = Product._meta.get_field('name')
+        self.price_field = Product._meta.get_field('price')
+        self.created = self.updated = self.images = self.skipped = 0
+
+        rows = self._read_csv(stream) if fmt == 'csv' else self._read_jsonl(stream)
+        started = time.monotonic()
+        processed = 0
+
+        try:
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+
+                self._import_batch(batch)
+                processed += len(batch)
+
+                elapsed = max(time.monotonic() - started, 1e-6)
+                self.stdout.write(f'{processed} rows processed ({processed / elapsed:,.0f} rows/s)')
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+            # bulk_create / bulk_update signals पाठवत नाहीत, म्हणून catalog cache स्वतः invalidate करतो
+            if self.created or self.updated:
+                bump_catalog_version()
+
+        elapsed = max(time.monotonic() - started, 1e-6)
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {processed} rows in {elapsed:.1f}s ({processed / elapsed:,.0f} rows/s): '
+            f'{self.created} created, {self.updated} updated, {self.images} images, {self.skipped} skipped.'
+        ))
+
+    def _format_from_path(self, path):
+        extension = os.path.splitext(path)[1].lower()
+        if extension == '.csv':
+            return 'csv'
+        if extension in ('.jsonl', '.ndjson'):
+            return 'jsonl'
+        raise CommandError('Cannot detect input format, pass --format csv or --format jsonl.')
+
+    # -----------------------------------------------------------------------------------------------
+    # Readers - प्रत्येक row dict म्हणून generator ने देतात (images नेहमी list)
+
+    def _read_csv(self, stream):
+        for row in csv.DictReader(stream):
+            images = row.get('images') or ''
+            row['images'] = [image for image in images.split('|') if image.strip()]
+            yield row
+
+    def _read_jsonl(self, stream):
+        for line_no, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                self._skip(f'line {line_no}: invalid JSON ({e})')
+                continue
+            if not isinstance(row, dict):
+                self._skip(f'line {line_no}: expected a JSON object')
+                continue
+            images = row.get('images') or []
+            images = [images] if isinstance(images, str) else images
+            if not isinstance(images, list) or not all(isinstance(image, str) for image in images):
+                self._skip(f'line {line_no}: images must be a path or a list of paths')
+                continue
+            row['images'] = images
+            yield row
+
+    # -----------------------------------------------------------------------------------------------
+
+    def _skip(self, reason):
+        self.skipped += 1
+        self.stderr.write(f'Skipped {reason}')
+
+    # Row validate करून (id, Product, image paths) बनवतो, चुकीचा असेल तर None
+    # ✅ Name / price model fields च्या validators ने तपासतो (max_length, NaN / Infinity, max_digits / decimal_places) -
+    #    चुकीची row database पर्यंत पोचून पूर्ण batch abort करत नाही
+    def _parse(self, row):
+        name = row.get('name')
+        if not isinstance(name, str) or not name.strip():
+            self._skip(f'row without name: {row!r:.80}')
+            return None
+        try:
+            name = self.name_field.clean(name.strip(), None)
+        except ValidationError as e:
+            self._skip(f'{name[:80]!r}: invalid name ({" ".join(e.messages)})')
+            return None
+
+        description = row.get('description') or ''
+        if not isinstance(description, str):
+            self._skip(f'{name!r}: description must be text')
+            return None
+
+        try:
+            price = self.price_field.clean(str(row.get('price', '')).strip(), None)
+        except ValidationError as e:
+            self._skip(f'{name!r}: invalid price {row.get("price")!r} ({" ".join(e.messages)})')
+            return None
+
+        product_id = row.get('id')
+        try:
+            product_id = int(product_id) if product_id not in (None, '') else None
+        except (TypeError, ValueError):
+            self._skip(f'{name!r}: invalid id {product_id!r}')
+            return None
+
+        product = Product(id=product_id, name=name, description=description, price=price)
+        return product, row['images']
+
+    def _import_batch(self, batch):
+        parsed = [item for item in map(self._parse, batch) if item is not None]
+
+        new = [(product, images) for product, images in parsed if product.id is None]
+        existing = [(product, images) for product, images in parsed if product.id is not None]
+
+        if existing:
+            known_ids = set(Product.objects.filter(id__in=[p.id for p, _ in existing]).values_list('id', flat=True))
+            for product, _ in existing:
+                if product.id not in known_ids:
+                    self._skip(f'{product.name!r}: unknown product id {product.id}')
+            existing = [(product, images) for product, images in existing if product.id in known_ids]
+
+        saved_files = []
+        try:
+            with transaction.atomic():
+                if connection.features.can_return_rows_from_bulk_insert:
+                    Product.objects.bulk_create([product for product, _ in new])
+                else:
+                    # MySQL bulk insert नंतर ids देत नाही - images असलेले products एक-एक save करतो
+                    Product.objects.bulk_create([product for product, images in new if not images])
+                    for product, images in new:
+                        if images:
+                            product.save()
+
+                if existing:
+                    now = timezone.now()
+                    for product, _ in existing:
+                        product.updated_at = now
+                    Product.objects.bulk_update(
+                        [product for product, _ in existing],
+                        ['name', 'description', 'price', 'updated_at'],
+                    )
+
+                product_images = []
+                for product, images in new + existing:
+                    for image_path in images:
+                        name = self._store_image(product, image_path)
+                        if name:
+                            saved_files.append(name)
+                            product_images.append(ProductImage(product=product, image=name))
+                ProductImage.objects.bulk_create(product_images)
+
+                # bulk operations signals पाठवत नाहीत, म्हणून search index इथेच update करतो
+                index_products([product for product, _ in new + existing])
+        except Exception:
+            # Transaction rollback झाला तर लिहिलेल्या image files deletion queue मध्ये (इतर rows वापरत नसतील तर निघतात)
+            enqueue_file_deletions(saved_files)
+            raise
+
+        self.created += len(new)
+        self.updated += len(existing)
+        self.images += len(product_images)
+
+    # Local image file storage मध्ये copy करून त्याचं stored name देतो
+    def _store_image(self, product, image_path):
+        full_path = os.path.join(self.images_dir, image_path.strip())
+        try:
+            with open(full_path, 'rb') as fh:
+                name = self.image_field.generate_filename(None, os.path.basename(full_path))
+                return self.image_field.storage.save(name, File(fh), max_length=self.image_field.max_length)
+        except OSError as e:
+            self.stderr.write(f'{product.name!r}: cannot read image {full_path} ({e})')
+            return None
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from myapp.search import rebuild_search_index
+
+
+# ---------------------------------------------------------------------------------------------------
+# SQLite FTS5 product search index पूर्ण परत भरतो
+#
+#   python manage.py rebuild_search_index
+#
+# ✅ QuerySet.update() / bulk_update() सारखे signals न पाठवणारे bulk writes नंतर चालवायचा
+# Postgres / MySQL वर index database स्वतः सांभाळतो - तिथे काही करत नाही
+class Command(BaseCommand):
+    help = 'Rebuild the SQLite full-text product search index from the product table.'
+
+    def handle(self, *args, **options):
+        indexed = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} products.'))
@@ -0,0 +1,42 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from myapp.rollups import RollupRefreshRunning, refresh_rollups
+
+
+# ---------------------------------------------------------------------------------------------------
+# Daily sales rollups (analytics endpoint) refresh करण्यासाठी command - फक्त शेवटच्या watermark नंतर बदललेले दिवस
+#
+#   python manage.py refresh_rollups                       # बदललेले दिवस, मग exit (cron - उदा. दर 5 मिनिटांनी)
+#   python manage.py refresh_rollups --loop --interval 60  # सतत चालणारा worker
+#   python manage.py refresh_rollups --since 2024-01-01    # त्या दिवसापासूनचे सगळे दिवस (उदा. queryset.update() नंतर)
+#   python manage.py refresh_rollups --full                # पूर्ण इतिहास परत
+class Command(BaseCommand):
+    help = 'Recompute daily sales rollups for days with orders changed since the last refresh.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Rebuild every day instead of only changed days.')
+        parser.add_argument('--since', type=date.fromisoformat, help='Also rebuild every day from this date (YYYY-MM-DD).')
+        parser.add_argument('--loop', action='store_true', help='Keep running and refresh periodically.')
+        parser.add_argument('--interval', type=float, default=300, help='Seconds between refreshes with --loop (default: 300).')
+
+    def handle(self, *args, **options):
+        try:
+            refreshed = refresh_rollups(full=options['full'], since=options['since'])
+        except RollupRefreshRunning as exc:
+            # --full / --since skip झाले तर user ला कळायला हवं
+            if not options['loop']:
+                raise CommandError(str(exc))
+            self.stdout.write(self.style.WARNING(f'{exc} Skipping this round.'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Refreshed {refreshed} days.'))
+        while options['loop']:
+            time.sleep(options['interval'])
+            try:
+                refreshed = refresh_rollups()
+            except RollupRefreshRunning as exc:
+                self.stdout.write(self.style.WARNING(f'{exc} Skipping this round.'))
+                continue
+            self.stdout.write(f'Refreshed {refreshed} days.')
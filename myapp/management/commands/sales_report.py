@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.utils import json
+from rest_framework.utils.encoders import JSONEncoder
+
+from myapp.analytics import available, sales_report
+from myapp.serializers import SalesReportQuerySerializer
+
+
+# ---------------------------------------------------------------------------------------------------
+# NumPy sales report (myapp/analytics.py) JSON मध्ये print करतो - endpoint सारखाच, पण cache शिवाय
+#
+#   python manage.py sales_report
+#   python manage.py sales_report --start 2024-01-01 --end 2024-12-31 --metrics revenue_percentiles,cohort_retention
+class Command(BaseCommand):
+    help = 'Compute revenue percentiles, basket sizes, price elasticity and cohort retention from order items.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='First order date (YYYY-MM-DD).')
+        parser.add_argument('--end', help='Last order date (YYYY-MM-DD).')
+        parser.add_argument('--metrics', help='Comma separated metrics (default: all).')
+        parser.add_argument('--top', type=int, help='Products in the elasticity list (default: 20).')
+
+    def handle(self, *args, **options):
+        if not available():
+            raise CommandError('numpy is not installed.')
+
+        params = {name: options[name] for name in ('start', 'end', 'metrics', 'top') if options[name] is not None}
+        query = SalesReportQuerySerializer(data=params)
+        if not query.is_valid():
+            raise CommandError(json.dumps(query.errors))
+
+        report = sales_report(**query.validated_data)
+        self.stdout.write(json.dumps(report, cls=JSONEncoder, indent=2, ensure_ascii=False))
@@ -0,0 +1,91 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, connections, transaction
+from django.db.models import Sum
+
+from myapp.inventory import STOCK_SHARDS, OutOfStock, reserve_stock, set_stock
+from myapp.models import Order, OrderItem, Product, StockReservation, StockShard
+
+
+# ---------------------------------------------------------------------------------------------------
+# एकाच hot product वर flash-sale सारखे concurrent checkouts - shards किती असले की throughput किती ते मोजतो
+#
+#   python manage.py stress_inventory --workers 32 --stock 5000 --shards 1,8,32
+#
+# ✅ प्रत्येक worker thread स्वतःच्या connection वर order + reservation एका transaction मध्ये करतो, stock संपेपर्यंत
+# ✅ शेवटी oversell झाला नाही ते तपासतो (reserved == sold आणि available + reserved == stock)
+# Threads ना committed data लागतो, म्हणून data rollback होत नाही - प्रत्येक run चे user / product unique नावाने बनतात
+# आणि शेवटी (fail झालं तरी) delete होतात. Production database वर चालवू नका.
+# Oversell नाही याचा automated test: myapp/tests.py मधला InventoryConcurrencyTests
+# SQLite एका वेळी एकच writer चालवतो - खरे आकडे Postgres / MySQL वरच
+class Command(BaseCommand):
+    help = 'Run concurrent checkouts against one product to measure reservation throughput per shard count.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=16, help='Concurrent checkout threads (default: 16).')
+        parser.add_argument('--stock', type=int, default=2000, help='Units put on sale (default: 2000).')
+        parser.add_argument('--quantity', type=int, default=1, help='Units per checkout (default: 1).')
+        parser.add_argument('--shards', default=f'1,{STOCK_SHARDS}', help=f'Comma separated shard counts (default: 1,{STOCK_SHARDS}).')
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'sqlite':
+            self.stdout.write(self.style.WARNING('SQLite serialises writers - run against Postgres / MySQL for real numbers.'))
+
+        run = uuid.uuid4().hex[:12]
+        user = User.objects.create_user(f'stress-inventory-{run}')
+        product = Product.objects.create(name=f'Stress inventory product {run}', description='', price=Decimal('99.00'))
+        try:
+            for shards in (int(value) for value in options['shards'].split(',')):
+                self._run(user, product, shards, options)
+        finally:
+            product.delete()
+            user.delete()
+
+    def _run(self, user, product, shards, options):
+        quantity = options['quantity']
+        set_stock(product.pk, options['stock'], shards)
+        sold_out = threading.Event()
+        counts = {'sold': 0, 'rejected': 0}
+        lock = threading.Lock()
+
+        def worker():
+            try:
+                while not sold_out.is_set():
+                    try:
+                        with transaction.atomic():
+                            order = Order.objects.create(user=user, total_price=product.price * quantity)
+                            OrderItem.objects.create(order=order, product=product, quantity=quantity, price=product.price)
+                            reserve_stock(order, {product.pk: quantity}, shards=shards)
+                    except OutOfStock:
+                        sold_out.set()
+                        with lock:
+                            counts['rejected'] += 1
+                    else:
+                        with lock:
+                            counts['sold'] += 1
+            finally:
+                connections.close_all()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options['workers']) as pool:
+            for future in [pool.submit(worker) for _ in range(options['workers'])]:
+                future.result()
+        elapsed = time.perf_counter() - started
+
+        available = StockShard.objects.filter(product=product).aggregate(total=Sum('available'))['total']
+        reserved = StockReservation.objects.filter(product=product).aggregate(total=Sum('quantity'))['total'] or 0
+        consistent = reserved == counts['sold'] * quantity and available + reserved == options['stock']
+        self.stdout.write(
+            f'{shards:>4} shards: {counts["sold"]} checkouts in {elapsed:.2f}s '
+            f'({counts["sold"] / elapsed:,.0f}/s), {counts["rejected"]} rejected, '
+            f'{available} left, ' + (self.style.SUCCESS('no oversell') if consistent else self.style.ERROR('INCONSISTENT'))
+        )
+
+        # पुढच्या run साठी orders / reservations काढतो
+        Order.objects.filter(user=user).delete()
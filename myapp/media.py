@@ -0,0 +1,189 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.utils import timezone
+from PIL import Image
+
+from .models import FileDeletion, ProductImage
+from .storage import variant_storage
+from .variants import all_variant_names
+
+IMAGE_UPLOAD_WORKERS = getattr(settings, 'IMAGE_UPLOAD_WORKERS', 4)
+MAX_IMAGE_UPLOAD_SIZE = getattr(settings, 'MAX_IMAGE_UPLOAD_SIZE', 10 * 1024 * 1024)
+MAX_IMAGE_PIXELS = getattr(settings, 'MAX_IMAGE_PIXELS', 40_000_000)
+ALLOWED_IMAGE_FORMATS = {'JPEG', 'PNG', 'WEBP', 'GIF'}
+FILE_DELETION_BATCH_SIZE = getattr(settings, 'FILE_DELETION_BATCH_SIZE', 100)
+FILE_DELETION_MAX_BACKOFF = timedelta(hours=1)
+# Upload ने file (परत) वापरल्यानंतर इतके seconds ती delete होत नाही (upload ची row commit व्हायला पुरेसा वेळ)
+FILE_DELETION_GRACE = getattr(settings, 'FILE_DELETION_GRACE', 60 * 15)
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------------------------------
+# Product image files चे reference counting
+# ✅ Content-addressed storage मध्ये एकच file अनेक ProductImage rows वापरू शकतात,
+#    म्हणून file (आणि तिचे variants) फक्त शेवटचा reference गेल्यावरच delete होते
+# ✅ Upload ला आधीच असलेल्या file चं नाव row commit होण्याआधीच मिळतं - त्या मधल्या काळात database मध्ये
+#    reference दिसत नाही. म्हणून file FILE_DELETION_GRACE seconds मध्ये upload ने (परत) वापरलेली नसेल तरच delete
+#    (ContentAddressedStorage.delete_if_idle); अशा entries grace नंतर परत तपासल्या जातात
+
+
+# दिलेल्या names पैकी ज्यांना आता एकही ProductImage row refer करत नाही ते
+def unreferenced_names(names):
+    names = set(filter(None, names))
+    if not names:
+        return set()
+    referenced = ProductImage.objects.filter(image__in=names).values_list('image', flat=True)
+    return names - set(referenced)
+
+
+def _delete_variants(name):
+    for variant in all_variant_names(name):
+        variant_storage.delete(variant)
+
+
+# Original + variants delete -> True; grace मध्ये upload ने वापरलेली file असेल तर काहीच नाही -> False
+def _delete_files(name, grace=FILE_DELETION_GRACE):
+    return ProductImage._meta.get_field('image').storage.delete_if_idle(name, grace, cleanup=_delete_variants)
+
+
+# ---------------------------------------------------------------------------------------------------
+# File deletion queue (FileDeletion table)
+# ✅ Request फक्त rows delete करून names queue मध्ये टाकतो (त्याच transaction मध्ये) - filesystem I/O request बाहेर
+# ✅ Upload / import fail झाल्यावर लिहिलेल्या files पण याच queue मधून (direct delete नाही - दुसरा upload तीच file वापरत असू शकतो)
+# ✅ Commit नंतर in-process worker thread queue drain करतो; `manage.py drain_file_deletions` cron / worker म्हणूनही चालतो
+# ✅ Fail झालेल्या files exponential backoff ने पुन्हा try होतात
+
+_lock = threading.Lock()
+_worker = None
+
+
+# Current transaction मध्येच names queue करतो आणि commit नंतर drain trigger करतो (transaction बाहेर - लगेच)
+def enqueue_file_deletions(names):
+    names = sorted(set(filter(None, names)))
+    if not names:
+        return
+    FileDeletion.objects.bulk_create([FileDeletion(name=name) for name in names])
+    transaction.on_commit(schedule_file_deletions)
+
+
+def _backoff(attempts):
+    return min(timedelta(seconds=30 * 2 ** (attempts - 1)), FILE_DELETION_MAX_BACKOFF)
+
+
+# Due असलेल्या entries चा एक batch process करतो - processed entries ची संख्या return करतो
+def drain_file_deletions(batch_size=FILE_DELETION_BATCH_SIZE, grace=FILE_DELETION_GRACE):
+    now = timezone.now()
+    with transaction.atomic():
+        entries = FileDeletion.objects.filter(next_attempt_at__lte=now).order_by('id')
+        # Postgres / MySQL 8 वर अनेक workers एकमेकांच्या rows skip करून parallel drain करू शकतात
+        if connection.features.has_select_for_update_skip_locked:
+            entries = entries.select_for_update(skip_locked=True)
+        entries = list(entries[:batch_size])
+        if not entries:
+            return 0
+
+        # अजूनही एखादी row वापरत असलेली file (उदा. तोच photo दुसऱ्या product ला) ठेवायची, फक्त entry काढायची
+        unreferenced = unreferenced_names(entry.name for entry in entries)
+        done, failed = [], []
+        for entry in entries:
+            try:
+                if entry.name in unreferenced and not _delete_files(entry.name, grace):
+                    # अलीकडेच upload ने वापरलेली file - row commit झाली का ते grace नंतर परत बघायचं (attempt मोजत नाही)
+                    entry.next_attempt_at = now + timedelta(seconds=grace)
+                    failed.append(entry)
+                    continue
+                done.append(entry.pk)
+            except Exception as exc:
+                logger.warning('Deleting %s failed (attempt %s): %s', entry.name, entry.attempts + 1, exc)
+                entry.attempts += 1
+                entry.next_attempt_at = now + _backoff(entry.attempts)
+                entry.last_error = repr(exc)
+                failed.append(entry)
+
+        FileDeletion.objects.filter(pk__in=done).delete()
+        if failed:
+            FileDeletion.objects.bulk_update(failed, ['attempts', 'next_attempt_at', 'last_error'])
+    return len(entries)
+
+
+def _drain_all():
+    try:
+        while drain_file_deletions():
+            pass
+    except Exception:
+        logger.exception('Draining file deletion queue failed')
+    finally:
+        connections.close_all()
+
+
+# Background thread मध्ये queue रिकामी होईपर्यंत drain करतो (प्रत्येक web worker process मध्ये एकच thread)
+def schedule_file_deletions():
+    global _worker
+    with _lock:
+        if _worker is None:
+            _worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix='file-deletions')
+    _worker.submit(_drain_all)
+
+
+# ---------------------------------------------------------------------------------------------------
+# Multi-image upload साठी parallel validation + file writes
+# ✅ Pillow decode करताना GIL सोडतो, म्हणून 10-20 images thread pool वर एकत्र तपासल्या जातात
+# ✅ View सर्व images valid असतील तरच files लिहितो आणि rows एकाच bulk_create मध्ये टाकतो
+
+
+# एक uploaded image पूर्ण decode करून तपासतो - invalid असेल तर error message, नाहीतर None
+def validate_image(upload):
+    if upload.size > MAX_IMAGE_UPLOAD_SIZE:
+        return f'File is larger than {MAX_IMAGE_UPLOAD_SIZE // (1024 * 1024)} MB.'
+    try:
+        upload.seek(0)
+        with Image.open(upload) as image:
+            if image.format not in ALLOWED_IMAGE_FORMATS:
+                return f'Unsupported image format: {image.format}.'
+            if image.width * image.height > MAX_IMAGE_PIXELS:
+                return 'Image dimensions are too large.'
+            # load() पूर्ण pixel data decode करतो - truncated / corrupt files इथे पकडल्या जातात
+            image.load()
+    except Image.DecompressionBombError:
+        return 'Image dimensions are too large.'
+    except Exception:
+        return 'File is not a valid image.'
+    finally:
+        upload.seek(0)
+    return None
+
+
+def _map_parallel(function, items):
+    with ThreadPoolExecutor(max_workers=max(1, min(IMAGE_UPLOAD_WORKERS, len(items)))) as pool:
+        return list(pool.map(function, items))
+
+
+# सर्व uploads parallel मध्ये validate करतो - [{'name': ..., 'error': ...}] (सगळे valid असतील तर रिकामी list)
+def validate_images(uploads):
+    errors = _map_parallel(validate_image, uploads)
+    return [{'name': upload.name, 'error': error} for upload, error in zip(uploads, errors) if error]
+
+
+# Validated uploads storage मध्ये parallel लिहितो आणि saved names return करतो
+# ✅ एखादी write fail झाली तर आधी लिहिलेल्या files deletion queue मध्ये (कुठेही refer होत नसतील तर grace नंतर निघतात)
+def save_image_files(uploads):
+    field = ProductImage._meta.get_field('image')
+
+    def save(upload):
+        try:
+            return field.storage.save(field.generate_filename(None, upload.name), upload), None
+        except Exception as exc:
+            return None, exc
+
+    results = _map_parallel(save, uploads)
+    names = [name for name, _ in results if name]
+    for _, exc in results:
+        if exc is not None:
+            enqueue_file_deletions(names)
+            raise exc
+    return names
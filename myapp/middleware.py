@@ -0,0 +1,149 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:  # brotli optional आहे - नसेल तर फक्त gzip
+    brotli = None
+
+# ---------------------------------------------------------------------------------------------------
+# API responses साठी Brotli / gzip compression
+# ✅ Accept-Encoding मधले q-values बघून br किंवा gzip निवडतो (दोन्ही चालत असतील तर br)
+# ✅ छोटे bodies, streaming responses (exports) आणि already-compressed content types skip होतात
+# ✅ JSON response वर `compression_cache_key` असेल (catalog cache - myapp/cache.py) तर compressed bytes पण cache होतात,
+#    पुढच्या hits ना तोच payload परत render / compress करावा लागत नाही
+# ✅ फक्त JSON cache होतं - browsable API (text/html) page मध्ये user चा CSRF token / username असतो, तो कधीच cache होत नाही
+# ✅ BREACH mitigation: HTML फक्त gzip ने, random bytes (Django च्या GZipMiddleware सारखे) टाकून compress होतं.
+#    JSON bodies मध्ये secret reflect होत नाही, म्हणून ते deterministic (आणि cache करता येण्यासारखे) राहतात
+
+COMPRESSION_MIN_SIZE = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+BROTLI_QUALITY = getattr(settings, 'BROTLI_QUALITY', 5)
+COMPRESSION_CACHE_ALIAS = getattr(settings, 'COMPRESSION_CACHE_ALIAS', 'default')
+COMPRESSION_CACHE_TIMEOUT = getattr(settings, 'COMPRESSION_CACHE_TIMEOUT', 300)
+
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml', 'image/svg+xml')
+CACHEABLE_TYPES = ('application/json',)
+# HTML gzip मध्ये टाकायचे कमाल random bytes (GZipMiddleware.max_random_bytes)
+BREACH_MAX_RANDOM_BYTES = 100
+
+
+# 'gzip;q=0.8, br' -> {'gzip': 0.8, 'br': 1.0}
+def _parse_accept_encoding(header):
+    accepted = {}
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+# Client ला चालणारं (q > 0) सर्वात चांगलं encoding - दोन्ही सारखे असतील तर br (लहान output)
+# ✅ html=True असेल तर फक्त gzip (brotli मध्ये random padding टाकता येत नाही)
+def negotiate_encoding(header, html=False):
+    accepted = _parse_accept_encoding(header)
+    wildcard = accepted.get('*', 0.0)
+    available = ['br', 'gzip'] if brotli is not None and not html else ['gzip']
+
+    best, best_quality = None, 0.0
+    for coding in available:
+        quality = accepted.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(content, encoding, max_random_bytes=None):
+    if encoding == 'br':
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    return compress_string(content, max_random_bytes=max_random_bytes)
+
+
+def _is_html(content_type):
+    return content_type.startswith('text/html')
+
+
+def _set_compressed(response, compressed, encoding):
+    response.content = compressed
+    response.headers['Content-Length'] = str(len(compressed))
+    response.headers['Content-Encoding'] = encoding
+
+    # Body बदलल्यामुळे strong ETag weak करतो (Django च्या GZipMiddleware सारखं) - conditional GET तरीही match होतो
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response.headers['ETag'] = 'W/' + etag
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    # Render होण्याआधी: cache मध्ये या JSON चे compressed bytes असतील तर render / compress दोन्ही skip
+    def process_template_response(self, request, response):
+        key = self._cache_key(request, response)
+        if key is None or response.status_code != 200:
+            return response
+
+        cached = caches[COMPRESSION_CACHE_ALIAS].get(key)
+        if cached is None:
+            return response
+
+        content_type, compressed = cached
+        response.headers['Content-Type'] = content_type
+        patch_vary_headers(response, ('Accept-Encoding',))
+        _set_compressed(response, compressed, self._encoding(request))
+        return response
+
+    def process_response(self, request, response):
+        if response.streaming or len(response.content) < COMPRESSION_MIN_SIZE:
+            return response
+        if response.has_header('Content-Encoding'):
+            return response
+        content_type = response.get('Content-Type', '')
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return response
+        if 'no-transform' in response.get('Cache-Control', ''):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        html = _is_html(content_type)
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''), html=html)
+        if encoding is None:
+            return response
+
+        key = self._cache_key(request, response)
+        compressed = compress(response.content, encoding, max_random_bytes=BREACH_MAX_RANDOM_BYTES if html else None)
+        if len(compressed) >= len(response.content):
+            return response
+
+        if key is not None and response.status_code == 200 and content_type.startswith(CACHEABLE_TYPES):
+            caches[COMPRESSION_CACHE_ALIAS].set(key, (content_type, compressed), COMPRESSION_CACHE_TIMEOUT)
+        _set_compressed(response, compressed, encoding)
+        return response
+
+    def _encoding(self, request):
+        return negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+
+    # JSON response + `compression_cache_key` असेल तरच key (नाहीतर None - cache नाही)
+    # ✅ Key मध्ये media type पण - `application/json` आणि `; indent=` चे bytes वेगवेगळे असतात
+    def _cache_key(self, request, response):
+        cache_key = getattr(response, 'compression_cache_key', None)
+        media_type = getattr(response, 'accepted_media_type', None) or ''
+        if cache_key is None or not media_type.startswith(CACHEABLE_TYPES):
+            return None
+        encoding = self._encoding(request)
+        if encoding is None:
+            return None
+        return f'{cache_key}:{encoding}:{hashlib.md5(media_type.encode()).hexdigest()}'
@@ -0,0 +1,48 @@
+# Generated by Django 5.0.8 on 2026-10-18 10:12
+
+from django.db import migrations
+
+
+# Database नुसार Product search साठी text index बनवतो (myapp/search.py मधले expressions याच्याशी जुळतात)
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE INDEX product_search_idx ON myapp_product USING GIN "
+            "(to_tsvector('english', coalesce(name, '') || ' ' || coalesce(description, '')))"
+        )
+
+    elif vendor == 'mysql':
+        schema_editor.execute('CREATE FULLTEXT INDEX product_search_idx ON myapp_product (name, description)')
+
+    elif vendor == 'sqlite':
+        # Standalone FTS5 table - product save / delete वर signals (myapp/signals.py) ने sync होतो
+        schema_editor.execute('CREATE VIRTUAL TABLE myapp_product_fts USING fts5(name, description)')
+        schema_editor.execute(
+            'INSERT INTO myapp_product_fts(rowid, name, description) SELECT id, name, description FROM myapp_product'
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS product_search_idx')
+
+    elif vendor == 'mysql':
+        schema_editor.execute('DROP INDEX product_search_idx ON myapp_product')
+
+    elif vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS myapp_product_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0027_contact'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.8 on 2026-10-18 19:04
+
+import myapp.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0030_productimage_variants'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='productimage',
+            name='image',
+            field=models.ImageField(db_index=True, storage=myapp.storage.ContentAddressedStorage(), upload_to='product_images/'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.8 on 2026-10-18 19:13
+
+from django.db import migrations, models
+from django.db.models import Count, Min, Sum
+
+
+# Constraint लावण्याआधी एकाच (user, product) च्या duplicate cart rows एकत्र करतो (quantity बेरीज, सर्वात जुनी row ठेवतो)
+def merge_duplicate_cart_items(apps, schema_editor):
+    Cart = apps.get_model('myapp', 'Cart')
+    duplicates = (
+        Cart.objects.values('user_id', 'product_id')
+        .annotate(rows=Count('id'), keep_id=Min('id'), total=Sum('quantity'))
+        .filter(rows__gt=1)
+    )
+    for duplicate in duplicates:
+        Cart.objects.filter(pk=duplicate['keep_id']).update(quantity=duplicate['total'])
+        Cart.objects.filter(user_id=duplicate['user_id'], product_id=duplicate['product_id']).exclude(
+            pk=duplicate['keep_id'],
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0032_filedeletion'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_cart_items, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='cart',
+            constraint=models.UniqueConstraint(fields=('user', 'product'), name='unique_cart_user_product'),
+        ),
+    ]
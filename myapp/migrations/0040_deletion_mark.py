@@ -0,0 +1,21 @@
+# Generated by Django 5.0.8 on 2026-10-18 19:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0039_catalog_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletionMark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=100, unique=True)),
+                ('deleted_at', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.8 on 2026-10-18 20:40
+
+from django.core.management import call_command
+from django.db import migrations
+
+
+# DatabaseCache caches (REDIS_URL नसताना 'idempotency' -> idempotency_cache) चे tables - manual
+# createcachetable विसरला तर Idempotency-Key असलेले POSTs 500 देत होते. Table आधीच असेल तर काही करत नाही
+def create_cache_tables(apps, schema_editor):
+    call_command('createcachetable', database=schema_editor.connection.alias, verbosity=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0040_deletion_mark'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_cache_tables, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
+from .storage import product_image_storage
 
 # ---------------------------------------------------------------------------------------------------------
 # Admin Login साठी Model
@@ -16,6 +18,7 @@ class Product(models.Model):
     name = models.CharField(max_length=255)
     description = models.TextField()
     price = models.DecimalField(max_digits=10, decimal_places=2)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return self.name
@@ -24,11 +27,46 @@ class Product(models.Model):
 # Product च्या Images साठी Model
 class ProductImage(models.Model):
     product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='images')
-    image = models.ImageField(upload_to='product_images/')
+    # ✅ Content-addressed storage - same photo पुन्हा upload केला तरी disk वर एकच file (myapp/storage.py)
+    image = models.ImageField(upload_to='product_images/', storage=product_image_storage, db_index=True)
+    # Thumbnail / card / full variants चे storage names: {'thumbnail': {'webp': ..., 'jpeg': ...}, ...}
+    variants = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f"Image for {self.product.name}"
 
+# ---------------------------------------------------------------------------------------------------------
+# Catalog cache चा version (myapp/cache.py) - cache per-process (LocMem) असेल तेव्हा सगळ्या workers साठी इथे
+class CatalogVersion(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField()
+
+    def __str__(self):
+        return f'{self.name}: {self.value}'
+
+# Product / ProductImage / Order मधला शेवटचा delete कधी झाला (myapp/conditional.py)
+# ✅ Delete मुळे max(updated_at) बदलत नाही, पण Last-Modified पुढे गेलाच पाहिजे - नाहीतर If-Modified-Since ला चुकीचा 304
+class DeletionMark(models.Model):
+    model = models.CharField(max_length=100, unique=True)
+    deleted_at = models.DateTimeField()
+
+    def __str__(self):
+        return f'{self.model}: {self.deleted_at}'
+
+# ---------------------------------------------------------------------------------------------------------
+# Storage मधून delete करायच्या files ची queue (DeleteProductImagesView rows delete करून इथे names टाकतो)
+# ✅ Background worker (myapp/media.py - drain_file_deletions) batches मध्ये files काढतो, fail झाल्यास retry
+class FileDeletion(models.Model):
+    name = models.CharField(max_length=255)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now, db_index=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
 # ---------------------------------------------------------------------------------------------------------
 # Cart साठी Model
 class Cart(models.Model):
@@ -37,6 +75,12 @@ class Cart(models.Model):
     quantity = models.PositiveIntegerField(default=1)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # ✅ एका user च्या cart मध्ये एक product एकदाच - add / set upsert ने होतात (myapp/cart.py)
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'product'], name='unique_cart_user_product'),
+        ]
+
     @property
     def subtotal(self):
         return self.product.price * self.quantity
@@ -44,6 +88,50 @@ class Cart(models.Model):
     def __str__(self):
         return f"{self.product.name} x {self.quantity} for {self.user.username}"
 
+# ---------------------------------------------------------------------------------------------------------
+# Product चा विकता येणारा stock - एका row ऐवजी अनेक shards मध्ये विभागलेला (myapp/inventory.py)
+# ✅ Flash sale मध्ये concurrent checkouts वेगवेगळ्या shard rows lock करतात, एकाच hot row वर queue लागत नाही
+# Product साठी एकही shard नसेल तर त्याचा stock track होत नाही (unlimited)
+class StockShard(models.Model):
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='stock_shards')
+    shard = models.PositiveSmallIntegerField()
+    available = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'shard'], name='unique_stock_shard'),
+            models.CheckConstraint(check=models.Q(available__gte=0), name='stock_shard_available_gte_0'),
+        ]
+
+    def __str__(self):
+        return f'{self.product_id}#{self.shard}: {self.available}'
+
+# ---------------------------------------------------------------------------------------------------------
+# Checkout वेळी order साठी shard मधून काढलेला stock - payment होईपर्यंत, expires_at नंतर shard मध्ये परत जातो
+class StockReservation(models.Model):
+    order = models.ForeignKey('Order', on_delete=models.CASCADE, related_name='stock_reservations')
+    product = models.ForeignKey(Product, on_delete=models.CASCADE)
+    shard = models.PositiveSmallIntegerField()
+    quantity = models.PositiveIntegerField()
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f'{self.product_id} x {self.quantity} for order {self.order_id}'
+
+# ---------------------------------------------------------------------------------------------------------
+# Order साठी QuerySet
+class OrderQuerySet(models.QuerySet):
+    # OrderSerializer ला लागणारा related data (user, address, items, product, images) batch मध्ये load करतो
+    # ✅ items / images output मध्ये नसतील (`?fields=` / `?expand=`) तर त्यांची query होत नाही
+    def with_details(self, items=True, images=True):
+        queryset = self.select_related('user', 'address')
+        if items:
+            item_queryset = OrderItem.objects.select_related('product')
+            if images:
+                item_queryset = item_queryset.prefetch_related('product__images')
+            queryset = queryset.prefetch_related(models.Prefetch('items', queryset=item_queryset))
+        return queryset
+
 # ---------------------------------------------------------------------------------------------------------
 # Order साठी Model
 class Order(models.Model):
@@ -51,6 +139,20 @@ class Order(models.Model):
     address = models.ForeignKey('Address', on_delete=models.SET_NULL, null=True)
     total_price = models.DecimalField(max_digits=10, decimal_places=2)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Payment confirm झाल्यावर (AdminOrderPaidView) - तोपर्यंत stock फक्त reserved असतो
+    paid_at = models.DateTimeField(null=True, blank=True)
+
+    objects = OrderQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # User चे orders नवीन आधी, (created_at, id) keyset pagination साठी (OrderKeysetPagination)
+            models.Index(fields=['user', 'created_at', 'id'], name='order_user_created_idx'),
+            # Admin order list: date range + keyset pagination सगळ्या users साठी, आणि amount range filter
+            models.Index(fields=['created_at', 'id'], name='order_created_idx'),
+            models.Index(fields=['total_price'], name='order_total_price_idx'),
+        ]
 
     def __str__(self):
         return f'Order {self.id} by {self.user.username}'
@@ -66,6 +168,68 @@ class OrderItem(models.Model):
     def __str__(self):
         return f'{self.product.name} x {self.quantity}'
 
+# ---------------------------------------------------------------------------------------------------------
+# Sales rollups - दिवसानुसार pre-aggregated totals (myapp/rollups.py, refresh_rollups command)
+# ✅ Analytics endpoint फक्त या छोट्या tables वाचतो, Order / OrderItem scan होत नाहीत
+# Day = order च्या created_at ची TIME_ZONE मधली तारीख
+class DailySales(models.Model):
+    day = models.DateField(unique=True)
+    orders = models.PositiveIntegerField(default=0)
+    units = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    def __str__(self):
+        return f'{self.day}: {self.revenue}'
+
+
+class DailyProductSales(models.Model):
+    day = models.DateField()
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='daily_sales')
+    orders = models.PositiveIntegerField(default=0)
+    units = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'product'], name='unique_daily_product_sales'),
+        ]
+
+    def __str__(self):
+        return f'{self.day} {self.product_id}: {self.revenue}'
+
+
+class DailyCitySales(models.Model):
+    day = models.DateField()
+    # Address नसलेल्या orders साठी ''
+    city = models.CharField(max_length=50, blank=True)
+    orders = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'city'], name='unique_daily_city_sales'),
+        ]
+
+    def __str__(self):
+        return f'{self.day} {self.city}: {self.revenue}'
+
+
+# Rollups शेवटचे कधी refresh झाले (Order.updated_at watermark)
+class RollupWatermark(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    value = models.DateTimeField()
+
+    def __str__(self):
+        return f'{self.name}: {self.value}'
+
+
+# Order delete झाल्यावर त्याचा दिवस पुढच्या refresh मध्ये परत मोजायचा (delete चा updated_at watermark ला दिसत नाही)
+class RollupDirtyDay(models.Model):
+    day = models.DateField(unique=True)
+
+    def __str__(self):
+        return str(self.day)
+
 # ---------------------------------------------------------------------------------------------------------
 # Address साठी Model
 class Address(models.Model):
@@ -76,6 +240,14 @@ class Address(models.Model):
     city = models.CharField(max_length=50)
     state = models.CharField(max_length=50)
     pincode = models.CharField(max_length=10)
+    # Normalized fields चा sha256 (myapp/addresses.py) - user च्या address book मध्ये तोच address परत insert होत नाही
+    # NULL = जुनी row, अजून dedupe_addresses command ने hash / merge केलेली नाही
+    address_hash = models.CharField(max_length=64, null=True, editable=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'address_hash'], name='unique_address_user_hash'),
+        ]
 
     def __str__(self):
         return f'{self.full_name} - {self.city}'
@@ -0,0 +1,142 @@
+import base64
+import json
+from datetime import datetime
+
+from django.db import DatabaseError, connection
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+# Estimate नसलेल्या databases (SQLite) वर count इथपर्यंतच मोजतो
+APPROXIMATE_COUNT_CAP = 10000
+
+
+# COUNT(*) scan न करता queryset च्या rows चा अंदाज - query planner चा estimate (Postgres / MySQL EXPLAIN)
+# ✅ Estimate मिळाला नाही तर APPROXIMATE_COUNT_CAP पर्यंतच exact count (LIMIT असलेला subquery)
+def approximate_count(queryset):
+    queryset = queryset.order_by()
+    try:
+        if connection.vendor == 'postgresql':
+            plan = json.loads(queryset.explain(format='json'))
+            return int(plan[0]['Plan']['Plan Rows'])
+        if connection.vendor == 'mysql':
+            table = json.loads(queryset.explain(format='json'))['query_block']['table']
+            return int(table.get('rows_produced_per_join', table['rows_examined_per_scan']))
+    except (DatabaseError, ValueError, KeyError, IndexError, TypeError):
+        pass
+    return queryset[:APPROXIMATE_COUNT_CAP].count()
+
+# ---------------------------------------------------------------------------------------------------
+# Product list साठी Cursor (keyset) Pagination
+# ✅ `id` primary key वर order करतो, त्यामुळे OFFSET scan होत नाही - table कितीही मोठा झाला तरी page तेवढ्याच वेळात येतो
+# ✅ `/product/` नेहमी paginated (default 20, `?page_size=` जास्तीत जास्त 100) - पूर्ण catalog एका response मध्ये येत नाही
+#    Response: {'next': ..., 'previous': ..., 'results': [...]}; पुढचा page `next` link ने
+class ProductCursorPagination(CursorPagination):
+    ordering = 'id'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+# ---------------------------------------------------------------------------------------------------
+
+# Product Search results साठी Pagination (rank नुसार order असल्यामुळे page number वापरतो)
+class ProductSearchPagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+# ---------------------------------------------------------------------------------------------------
+
+# Orders साठी composite keyset pagination - (created_at, id) वर, नवीन orders आधी
+# ✅ पुढचा page `(created_at, id) < cursor` ने - (user, created_at, id) index वरून, OFFSET scan नाही
+# ✅ एकाच timestamp चे orders id ने वेगळे होतात, DRF CursorPagination सारखा offset cursor मध्ये लागत नाही
+# ✅ पहिली query फक्त page चे (created_at, id) keys आणते, मग serializer त्या ids चेच orders load करतो
+# ✅ `?count=approximate` दिलं तर response मध्ये `approximate_count` (approximate_count - COUNT(*) scan नाही)
+# ✅ `?cursor=` किंवा `?page_size=` दिलं तरच pagination चालू होतं, जुने clients ला पूर्ण list मिळत राहते
+#    (`paginate_by_default = True` असेल तर params नसतानाही पहिला page - AdminOrderKeysetPagination)
+class OrderKeysetPagination(BasePagination):
+    paginate_by_default = False
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if not self.paginate_by_default and self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+        self.approximate_count = approximate_count(queryset) if params.get(self.count_query_param) == 'approximate' else None
+
+        keys = queryset.order_by('-created_at', '-id')
+        if position is not None:
+            created_at, pk = position
+            if reverse:
+                keys = queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)).order_by('created_at', 'id')
+            else:
+                keys = keys.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+
+        rows = list(keys.values_list('created_at', 'id')[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.has_next = True if reverse else has_more
+        self.has_previous = has_more if reverse else position is not None
+        self.first, self.last = (rows[0], rows[-1]) if rows else (None, None)
+        return queryset.filter(pk__in=[pk for _, pk in rows]).order_by('-created_at', '-id')
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(size, self.max_page_size) if size > 0 else self.page_size
+
+    # Cursor = base64 JSON {'t': created_at, 'i': id, 'r': previous direction}
+    def encode_cursor(self, position, reverse=False):
+        created_at, pk = position
+        payload = {'t': created_at.isoformat(), 'i': pk}
+        if reverse:
+            payload['r'] = 1
+        cursor = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return (datetime.fromisoformat(payload['t']), int(payload['i'])), bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next or self.last is None:
+            return None
+        return self.encode_cursor(self.last)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.first is None:
+            return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        return self.encode_cursor(self.first, reverse=True)
+
+    def get_paginated_response(self, data):
+        response = {'next': self.get_next_link(), 'previous': self.get_previous_link(), 'results': data}
+        if self.approximate_count is not None:
+            response['approximate_count'] = self.approximate_count
+        return Response(response)
+# ---------------------------------------------------------------------------------------------------
+
+# Admin orders list - सगळ्या users चे orders, म्हणून नेहमी paginated (params नसतील तर पहिला keyset page)
+class AdminOrderKeysetPagination(OrderKeysetPagination):
+    paginate_by_default = True
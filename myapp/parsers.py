@@ -0,0 +1,35 @@
+import codecs
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils import json
+
+from .renderers import ORJSONRenderer, orjson
+
+# ---------------------------------------------------------------------------------------------------
+# orjson वर चालणारा JSON parser (REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] मध्ये select केलेला)
+# ✅ UTF-8 body थेट bytes वरून parse होतो; NaN / Infinity DRF च्या strict mode सारखेच reject
+# ✅ orjson ने नाकारलेला body stdlib json ने पुन्हा parse होतो - error message DRF सारखाच
+
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read() if stream is not None else b''
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            pass
+
+        try:
+            parse_constant = json.strict_constant if self.strict else None
+            return json.loads(body.decode(encoding), parse_constant=parse_constant)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
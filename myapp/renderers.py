@@ -0,0 +1,45 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # orjson optional आहे - नसेल तर DRF चा stdlib renderer
+    orjson = None
+
+# ---------------------------------------------------------------------------------------------------
+# orjson वर चालणारा JSON renderer (REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] मध्ये select केलेला)
+# ✅ Output DRF च्या JSONRenderer सारखाच: compact, UTF-8 (ensure_ascii नाही), UTC datetimes 'Z' ने, U+2028/2029 escaped
+# ✅ orjson ला native माहित नसलेले types (Decimal, lazy strings, QuerySet ...) DRF च्या JSONEncoder.default ने
+# ✅ `; indent=N` मागितलं (browsable API) किंवा orjson नसेल / fail झाला तर stdlib renderer
+
+_drf_encoder = JSONEncoder()
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+# Python object -> JSON bytes (renderer आणि NDJSON export दोघेही वापरतात)
+def dumps(data):
+    if orjson is not None:
+        try:
+            return _escape_line_separators(orjson.dumps(data, default=_drf_encoder.default, option=ORJSON_OPTIONS))
+        except TypeError:
+            # उदा. 64-bit पेक्षा मोठा int - stdlib encoder तो handle करतो
+            pass
+    return JSONRenderer().render(data)
+
+
+# JSON JavaScript चा strict subset राहावा म्हणून (DRF पण हेच करतो)
+def _escape_line_separators(content):
+    if b'\xe2\x80' in content:
+        content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return content
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
@@ -0,0 +1,182 @@
+import datetime
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import DailyCitySales, DailyProductSales, DailySales, Order, OrderItem, RollupDirtyDay, RollupWatermark
+
+# ---------------------------------------------------------------------------------------------------
+# Daily sales rollups (DailySales / DailyProductSales / DailyCitySales) incremental refresh
+# ✅ शेवटच्या refresh नंतर बदललेले orders (Order.updated_at > watermark) + signals नी dirty केलेले दिवस (RollupDirtyDay)
+#    एवढेच दिवस परत मोजतो - पूर्ण इतिहास परत scan होत नाही
+# ✅ प्रत्येक दिवस पूर्णपणे delete + recompute होतो, त्यामुळे तोच दिवस परत refresh झाला तरी totals बरोबरच
+# ✅ Watermark च्या ROLLUP_OVERLAP seconds आधीपासून बघतो - refresh वेळी commit न झालेले orders पुढच्या वेळी चुकत नाहीत
+# ✅ Order delete, Product delete (items cascade) आणि order चा created_at बदलला तर (जुना दिवस) signals.py दिवस dirty करतो
+# ✅ OrderItem बदल / delete order चा updated_at पुढे नेतो (signals.touch_order) - dirty row नाही, नवीन orders
+#    (buy now / checkout) आजच्या RollupDirtyDay row वर lock घेत नाहीत
+# ✅ एका वेळी एकच refresh (RollupWatermark मधला lease row) - दोन refresh एकाच दिवसाचे rows बनवून IntegrityError नाही
+# queryset.update() / bulk operations signals पाठवत नाहीत - तसे बदल केले तर `refresh_rollups --since` वापरायचा
+
+ROLLUP_WATERMARK = 'sales'
+ROLLUP_LOCK = 'sales:lock'
+ROLLUP_OVERLAP = getattr(settings, 'ROLLUP_OVERLAP', 60 * 10)
+ROLLUP_DAYS_PER_BATCH = getattr(settings, 'ROLLUP_DAYS_PER_BATCH', 31)
+# Refresh चा lease - प्रत्येक batch नंतर पुढे सरकतो; process crash झाला तर एवढ्या वेळाने दुसरा refresh चालू शकतो
+ROLLUP_LOCK_TIMEOUT = getattr(settings, 'ROLLUP_LOCK_TIMEOUT', 60 * 10)
+
+
+class RollupRefreshRunning(Exception):
+    pass
+
+
+# Sorted days -> सलग दिवसांच्या [start, end) datetime ranges (TIME_ZONE मध्ये)
+def _ranges(days):
+    ranges = []
+    for day in sorted(days):
+        start = timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+        end = start + datetime.timedelta(days=1)
+        if ranges and ranges[-1][1] == start:
+            ranges[-1][1] = end
+        else:
+            ranges.append([start, end])
+    return ranges
+
+
+def _created_on(days, prefix=''):
+    condition = Q()
+    for start, end in _ranges(days):
+        condition |= Q(**{f'{prefix}created_at__gte': start, f'{prefix}created_at__lt': end})
+    return condition
+
+
+def order_days(orders):
+    return set(orders.annotate(day=TruncDate('created_at')).values_list('day', flat=True).distinct().order_by())
+
+
+# हे दिवस पुढच्या refresh मध्ये परत मोजायचे (signals.py)
+def mark_days_dirty(days, using='default'):
+    RollupDirtyDay.objects.using(using).bulk_create([RollupDirtyDay(day=day) for day in set(days)], ignore_conflicts=True)
+
+
+# ' pune ' / 'PUNE' / 'Pune' -> 'Pune' (address नसेल तर '')
+def _city(value):
+    return ' '.join((value or '').split()).title()
+
+
+# दिलेल्या दिवसांचे rollup rows एका transaction मध्ये परत बनवतो
+def _refresh_days(days):
+    orders = Order.objects.filter(_created_on(days)).annotate(day=TruncDate('created_at'))
+    items = OrderItem.objects.filter(_created_on(days, 'order__')).annotate(day=TruncDate('order__created_at'))
+    line_revenue = Sum(F('quantity') * F('price'), output_field=DecimalField(max_digits=14, decimal_places=2))
+
+    with transaction.atomic():
+        # Dirty rows आधी काढतो - recompute चालू असताना cancel झालेला order हा row परत बनवतो, पुढच्या refresh ला दिसतो
+        RollupDirtyDay.objects.filter(day__in=days).delete()
+
+        units = dict(items.values('day').annotate(units=Sum('quantity')).values_list('day', 'units').order_by())
+        daily = [
+            DailySales(day=row['day'], orders=row['orders'], units=units.get(row['day'], 0), revenue=row['revenue'])
+            for row in orders.values('day').annotate(orders=Count('id'), revenue=Sum('total_price')).order_by()
+        ]
+        products = [
+            DailyProductSales(day=row['day'], product_id=row['product_id'], orders=row['orders'], units=row['units'], revenue=row['revenue'])
+            for row in items.values('day', 'product_id').annotate(
+                orders=Count('order_id', distinct=True), units=Sum('quantity'), revenue=line_revenue,
+            ).order_by()
+        ]
+        # City नावं normalize केल्यावर एकाच दिवसात एकच row
+        cities = {}
+        for row in orders.values('day', 'address__city').annotate(orders=Count('id'), revenue=Sum('total_price')).order_by():
+            city = _city(row['address__city'])
+            entry = cities.setdefault((row['day'], city), DailyCitySales(day=row['day'], city=city, orders=0, revenue=0))
+            entry.orders += row['orders']
+            entry.revenue += row['revenue']
+
+        for model in (DailySales, DailyProductSales, DailyCitySales):
+            model.objects.filter(day__in=days).delete()
+        DailySales.objects.bulk_create(daily)
+        DailyProductSales.objects.bulk_create(products)
+        DailyCitySales.objects.bulk_create(cities.values())
+
+
+# Lease lock - conditional UPDATE (सगळ्या databases वर atomic), मोठा transaction धरून ठेवत नाही
+# ✅ दुसरा refresh चालू असेल तर RollupRefreshRunning; yield केलेला renew() lease पुढे सरकवतो
+@contextmanager
+def _refresh_lock():
+    now = timezone.now()
+    RollupWatermark.objects.bulk_create(
+        [RollupWatermark(name=ROLLUP_LOCK, value=now - datetime.timedelta(seconds=1))], ignore_conflicts=True,
+    )
+    lease = now + datetime.timedelta(seconds=ROLLUP_LOCK_TIMEOUT)
+    if not RollupWatermark.objects.filter(name=ROLLUP_LOCK, value__lte=now).update(value=lease):
+        raise RollupRefreshRunning('Another rollup refresh is running.')
+
+    def renew():
+        nonlocal lease
+        renewed = timezone.now() + datetime.timedelta(seconds=ROLLUP_LOCK_TIMEOUT)
+        RollupWatermark.objects.filter(name=ROLLUP_LOCK, value=lease).update(value=renewed)
+        lease = renewed
+
+    try:
+        yield renew
+    finally:
+        RollupWatermark.objects.filter(name=ROLLUP_LOCK, value=lease).update(value=timezone.now())
+
+
+# बदललेले दिवस refresh करतो आणि refresh केलेल्या दिवसांची संख्या return करतो
+# ✅ full=True (किंवा पहिल्यांदा) - सगळा इतिहास; since=date - त्या दिवसापासूनचे सगळे दिवस पण
+def refresh_rollups(full=False, since=None):
+    with _refresh_lock() as renew:
+        return _refresh_rollups(full, since, renew)
+
+
+def _refresh_rollups(full, since, renew):
+    started = timezone.now()
+    watermark = RollupWatermark.objects.filter(name=ROLLUP_WATERMARK).values_list('value', flat=True).first()
+
+    days = set(RollupDirtyDay.objects.values_list('day', flat=True))
+    if full or watermark is None:
+        # Orders नसलेले जुने rollup दिवस पण - ते rows काढायचे
+        days |= order_days(Order.objects.all()) | set(DailySales.objects.values_list('day', flat=True))
+    else:
+        days |= order_days(Order.objects.filter(updated_at__gt=watermark - datetime.timedelta(seconds=ROLLUP_OVERLAP)))
+    if since is not None:
+        days |= order_days(Order.objects.filter(created_at__gte=_ranges([since])[0][0]))
+        days |= set(DailySales.objects.filter(day__gte=since).values_list('day', flat=True))
+
+    days = sorted(days)
+    for start in range(0, len(days), ROLLUP_DAYS_PER_BATCH):
+        _refresh_days(days[start:start + ROLLUP_DAYS_PER_BATCH])
+        renew()
+
+    RollupWatermark.objects.update_or_create(name=ROLLUP_WATERMARK, defaults={'value': started})
+    return len(days)
+
+
+# ---------------------------------------------------------------------------------------------------
+# Analytics endpoint साठी - फक्त rollup tables वाचतो (start, end दोन्ही inclusive)
+def sales_summary(start, end, top=10):
+    daily = DailySales.objects.filter(day__gte=start, day__lte=end)
+    products = DailyProductSales.objects.filter(day__gte=start, day__lte=end)
+    cities = DailyCitySales.objects.filter(day__gte=start, day__lte=end)
+
+    totals = daily.aggregate(orders=Sum('orders'), units=Sum('units'), revenue=Sum('revenue'))
+    return {
+        'start': start,
+        'end': end,
+        'refreshed_at': RollupWatermark.objects.filter(name=ROLLUP_WATERMARK).values_list('value', flat=True).first(),
+        'totals': {key: value or 0 for key, value in totals.items()},
+        'days': list(daily.order_by('day').values('day', 'orders', 'units', 'revenue')),
+        'top_products': list(
+            products.values('product_id', 'product__name')
+            .annotate(orders=Sum('orders'), units=Sum('units'), revenue=Sum('revenue'))
+            .order_by('-revenue', 'product_id')[:top]
+        ),
+        'cities': list(
+            cities.values('city').annotate(orders=Sum('orders'), revenue=Sum('revenue')).order_by('-revenue', 'city')[:top]
+        ),
+    }
@@ -0,0 +1,93 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection, connections, transaction
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import Product
+
+# ---------------------------------------------------------------------------------------------------
+# Product Full-text Search साठी helpers
+# ✅ Postgres : name + description वर GIN (tsvector) expression index
+# ✅ MySQL    : name, description वर FULLTEXT index
+# ✅ SQLite   : standalone FTS5 virtual table (product save / delete वर signals मधून index_products / unindex_products)
+# Index migration 0028_product_search_index मध्ये बनतो - खालचे expressions त्याच्याशी जुळले पाहिजेत
+# SQLite वर QuerySet.update() / bulk_create() / bulk_update() signals पाठवत नाहीत - name / description बदलणाऱ्या
+# bulk writes नंतर index_products() स्वतः call करायचा (import_products करतो), किंवा `manage.py rebuild_search_index`
+
+PRODUCT_TABLE = Product._meta.db_table
+SQLITE_FTS_TABLE = f'{PRODUCT_TABLE}_fts'
+
+# SearchVector हे to_tsvector('english', coalesce(name, '') || ' ' || coalesce(description, '')) बनवतो - GIN index चं expression
+PG_CONFIG = 'english'
+
+MYSQL_MATCH = f"MATCH ({PRODUCT_TABLE}.name, {PRODUCT_TABLE}.description) AGAINST (%s IN NATURAL LANGUAGE MODE)"
+
+
+# FTS5 च्या query syntax मध्ये user input escape करण्यासाठी (प्रत्येक शब्द quoted phrase बनतो)
+def _fts5_query(term):
+    return ' '.join('"%s"' % word.replace('"', '""') for word in term.split())
+
+
+# Queryset वर search filter + `rank` annotation लावतो, best match आधी येतो
+def search_products(queryset, term):
+    vendor = connection.vendor
+
+    if vendor == 'postgresql':
+        document = SearchVector('name', 'description', config=PG_CONFIG)
+        query = SearchQuery(term, config=PG_CONFIG)  # plainto_tsquery
+        queryset = queryset.alias(document=document).filter(document=query)
+        rank = SearchRank(document, query)
+
+    elif vendor == 'mysql':
+        # MATCH() > 0 पण FULLTEXT index वापरतो; तोच relevance rank म्हणून
+        queryset = queryset.alias(match=RawSQL(MYSQL_MATCH, (term,), output_field=FloatField())).filter(match__gt=0)
+        rank = F('match')
+
+    elif vendor == 'sqlite':
+        fts_query = _fts5_query(term)
+        queryset = queryset.filter(
+            id__in=RawSQL(f'SELECT rowid FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH %s', (fts_query,)),
+        )
+        # bm25() जितका कमी तितका चांगला match, म्हणून minus लावला
+        rank = RawSQL(
+            f'(SELECT -bm25({SQLITE_FTS_TABLE}) FROM {SQLITE_FTS_TABLE} '
+            f'WHERE {SQLITE_FTS_TABLE} MATCH %s AND rowid = {PRODUCT_TABLE}.id)',
+            (fts_query,),
+            output_field=FloatField(),
+        )
+
+    else:
+        # Text index नसलेल्या backend साठी fallback (ranking नाही)
+        queryset = queryset.filter(Q(name__icontains=term) | Q(description__icontains=term))
+        rank = Value(0.0, output_field=FloatField())
+
+    return queryset.annotate(rank=rank).order_by('-rank', 'id')
+
+
+# SQLite FTS5 table मध्ये products (पुन्हा) index करतो - Postgres / MySQL वर index database स्वतः सांभाळतो
+def index_products(products, using='default'):
+    if connections[using].vendor != 'sqlite':
+        return
+    rows = [(product.pk, product.name, product.description) for product in products]
+    with connections[using].cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid = %s', [(row[0],) for row in rows])
+        cursor.executemany(f'INSERT INTO {SQLITE_FTS_TABLE}(rowid, name, description) VALUES (%s, %s, %s)', rows)
+
+
+def unindex_products(product_ids, using='default'):
+    if connections[using].vendor != 'sqlite':
+        return
+    with connections[using].cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid = %s', [(pk,) for pk in product_ids])
+
+
+# पूर्ण SQLite FTS5 index product table वरून परत भरतो (signals चुकवणाऱ्या bulk writes नंतर) - indexed rows return करतो
+def rebuild_search_index(using='default'):
+    if connections[using].vendor != 'sqlite':
+        return 0
+    with transaction.atomic(using=using), connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SQLITE_FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {SQLITE_FTS_TABLE}(rowid, name, description) SELECT id, name, description FROM {PRODUCT_TABLE}'
+        )
+        return cursor.rowcount
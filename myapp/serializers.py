@@ -1,7 +1,13 @@
+import copy
+from datetime import timedelta
+
 from rest_framework import serializers
 from .models import Admin, Cart, Contact, Order, OrderItem, Product, ProductImage, Address
 from django.contrib.auth.models import User
 from django.contrib.auth.hashers import make_password, check_password
+from django.utils import timezone
+from .analytics import METRICS
+from .variants import variant_urls
 
 # ---------------------------------------------------------------------------------------------------
 # Admin login तपासण्यासाठी Serializer
@@ -26,21 +32,107 @@ class AdminLoginSerializer(serializers.Serializer):
         data['admin_obj'] = admin
         return data
 
+# ---------------------------------------------------------------------------------------------------
+# Sparse fieldsets (`?fields=`) आणि expansion (`?expand=`) साठी helpers
+#   ?fields=id,name,price           -> फक्त हे fields
+#   ?fields=id,product.name         -> nested serializer मध्ये dotted path
+#   ?expand=product                 -> फक्त product expand, बाकीचे expandable relations collapse / drop
+#   ?expand=                        -> कुठलंच relation expand नाही
+# Params नसतील तर output पूर्वीसारखाच (सगळे fields, सगळे relations expanded)
+
+# 'id,product.name' -> {'id': {}, 'product': {'name': {}}}
+def _parse_field_spec(value):
+    tree = {}
+    for path in value.split(','):
+        node = tree
+        for part in filter(None, (p.strip() for p in path.split('.'))):
+            node = node.setdefault(part, {})
+    return tree
+
+
+# GET request च्या query params मधून serializer साठी `fields` / `expand` kwargs
+def requested_fields(request):
+    if request.method != 'GET':
+        return {}
+
+    params = request.query_params
+    spec = {}
+    if 'fields' in params:
+        spec['fields'] = _parse_field_spec(params['fields'])
+    if 'expand' in params:
+        spec['expand'] = _parse_field_spec(params['expand'])
+    return spec
+
+
+# Serializer output मध्ये 'product.images' सारखं nested relation (serializer म्हणून) येणार आहे का
+# ✅ Views त्यानुसार select_related / prefetch ठरवतात
+def renders(serializer, path):
+    field = serializer
+    for part in path.split('.'):
+        if isinstance(field, serializers.ListSerializer):
+            field = field.child
+        if not isinstance(field, serializers.Serializer):
+            return False
+        field = field.fields.get(part)
+    return isinstance(field, serializers.BaseSerializer)
+
+
+# ✅ Meta.expandable_fields = {'relation': collapsed field किंवा None (drop)}
+class DynamicFieldsMixin:
+    def __init__(self, *args, **kwargs):
+        self._field_spec = kwargs.pop('fields', None)
+        self._expand_spec = kwargs.pop('expand', None)
+        super().__init__(*args, **kwargs)
+
+    def get_fields(self):
+        fields = super().get_fields()
+
+        if self._expand_spec is not None:
+            for name, collapsed in getattr(self.Meta, 'expandable_fields', {}).items():
+                if name in fields and name not in self._expand_spec:
+                    if collapsed is None:
+                        del fields[name]
+                    else:
+                        fields[name] = copy.deepcopy(collapsed)
+
+        if self._field_spec:
+            for name in list(fields):
+                if name not in self._field_spec:
+                    del fields[name]
+
+        # Nested serializers ना त्यांचा भाग pass करतो
+        for name, field in fields.items():
+            nested = field.child if isinstance(field, serializers.ListSerializer) else field
+            if isinstance(nested, DynamicFieldsMixin):
+                if self._field_spec:
+                    nested._field_spec = self._field_spec.get(name) or None
+                if self._expand_spec is not None:
+                    nested._expand_spec = self._expand_spec.get(name, {})
+
+        return fields
+
 # ---------------------------------------------------------------------------------------------------
 # Product Image साठी Serializer
-class ProductImageSerializer(serializers.ModelSerializer):
+class ProductImageSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    # Thumbnail / card / full variants चे URLs (background मध्ये तयार होईपर्यंत {})
+    variants = serializers.SerializerMethodField()
+
     class Meta:
         model = ProductImage
-        fields = ['id', 'image']
+        fields = ['id', 'image', 'variants']
+
+    def get_variants(self, obj):
+        return variant_urls(obj.variants, self.context.get('request'))
 
 # ---------------------------------------------------------------------------------------------------
 # Images सह Product साठी Serializer
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     images = ProductImageSerializer(many=True, read_only=True)
 
     class Meta:
         model = Product
         fields = ['id', 'name', 'description', 'price', 'images']
+        expandable_fields = {'images': None}
 
 # ---------------------------------------------------------------------------------------------------
 # Default User साठी Serializer
@@ -58,7 +150,7 @@ class UserSerializer(serializers.ModelSerializer):
 
 # ---------------------------------------------------------------------------------------------------
 # Cart साठी Serializer
-class CartSerializer(serializers.ModelSerializer):
+class CartSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     product = ProductSerializer(read_only=True)
     product_id = serializers.IntegerField(write_only=True)
 
@@ -66,6 +158,45 @@ class CartSerializer(serializers.ModelSerializer):
         model = Cart
         fields = ['id', 'product', 'product_id', 'quantity', 'subtotal']
         read_only_fields = ['id', 'subtotal']
+        expandable_fields = {'product': serializers.IntegerField(source='product_id', read_only=True)}
+
+# ---------------------------------------------------------------------------------------------------
+# Cart summary साठी Serializers - subtotal / totals database मध्ये calculate झालेले (myapp/cart.py - cart_summary)
+class CartSummaryItemSerializer(CartSerializer):
+    subtotal = serializers.DecimalField(source='line_subtotal', max_digits=12, decimal_places=2, read_only=True)
+
+    class Meta(CartSerializer.Meta):
+        fields = ['id', 'product', 'quantity', 'subtotal']
+
+
+class CartSummarySerializer(serializers.Serializer):
+    items = CartSummaryItemSerializer(many=True, read_only=True)
+    line_count = serializers.IntegerField(read_only=True)
+    item_count = serializers.IntegerField(read_only=True)
+    total = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
+
+# ---------------------------------------------------------------------------------------------------
+# Cart batch endpoint (`cart/batch/`) मधील एका operation साठी Serializer
+#   {"op": "add", "product_id": 5, "quantity": 2}   -> quantity वाढवतो (item नसेल तर add)
+#   {"op": "set", "product_id": 5, "quantity": 3}   -> quantity set करतो (0 म्हणजे remove)
+#   {"op": "remove", "product_id": 5}
+class CartOperationSerializer(serializers.Serializer):
+    op = serializers.ChoiceField(choices=['add', 'set', 'remove'])
+    product_id = serializers.IntegerField(min_value=1)
+    quantity = serializers.IntegerField(min_value=0, max_value=10000, required=False)
+
+    def validate(self, data):
+        if data['op'] == 'add':
+            data['quantity'] = data.get('quantity', 1)
+            if data['quantity'] < 1:
+                raise serializers.ValidationError({'quantity': 'Must be at least 1 for add.'})
+        elif data['op'] == 'set' and 'quantity' not in data:
+            raise serializers.ValidationError({'quantity': 'This field is required for set.'})
+        return data
+
+
+class CartBatchSerializer(serializers.Serializer):
+    operations = CartOperationSerializer(many=True, allow_empty=False, max_length=100)
 
 # ---------------------------------------------------------------------------------------------------
 # Address साठी Serializer
@@ -74,19 +205,26 @@ class AddressSerializer(serializers.ModelSerializer):
         model = Address
         fields = ['full_name', 'phone', 'address', 'city', 'state', 'pincode']
 
+# ---------------------------------------------------------------------------------------------------
+# Address book (AddressBookView) साठी - checkout ला `address_id` म्हणून पाठवायचा id सह
+class AddressBookSerializer(AddressSerializer):
+    class Meta(AddressSerializer.Meta):
+        fields = ['id', *AddressSerializer.Meta.fields]
+
 # ---------------------------------------------------------------------------------------------------
 # Order मधील Item साठी Serializer
-class OrderItemSerializer(serializers.ModelSerializer):
+class OrderItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     product_name = serializers.CharField(source='product.name', read_only=True)
     product_images = ProductImageSerializer(source='product.images', many=True, read_only=True)
 
     class Meta:
         model = OrderItem
         fields = ['id', 'product', 'product_name', 'product_images', 'quantity', 'price']
+        expandable_fields = {'product_images': None}
 
 # ---------------------------------------------------------------------------------------------------
 # Order साठी Serializer
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     items = OrderItemSerializer(many=True, read_only=True)
     address = AddressSerializer()
     user_email = serializers.EmailField(source='user.email', read_only=True)
@@ -95,6 +233,99 @@ class OrderSerializer(serializers.ModelSerializer):
     class Meta:
         model = Order
         fields = ['id', 'user_name', 'user_email', 'address', 'total_price', 'created_at', 'items']
+        expandable_fields = {
+            'items': None,
+            'address': serializers.IntegerField(source='address_id', read_only=True, allow_null=True),
+        }
+
+# ---------------------------------------------------------------------------------------------------
+# Admin order list चे query params filters: ?created_after=&created_before=&user=&min_total=&max_total=
+# ✅ Date range half-open: created_after <= created_at < created_before (date किंवा ISO datetime)
+class AdminOrderFilterSerializer(serializers.Serializer):
+    created_after = serializers.DateTimeField(required=False, input_formats=['iso-8601', '%Y-%m-%d'])
+    created_before = serializers.DateTimeField(required=False, input_formats=['iso-8601', '%Y-%m-%d'])
+    user = serializers.IntegerField(required=False, min_value=1)
+    min_total = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    max_total = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+
+    lookups = {
+        'created_after': 'created_at__gte',
+        'created_before': 'created_at__lt',
+        'user': 'user_id',
+        'min_total': 'total_price__gte',
+        'max_total': 'total_price__lte',
+    }
+
+    # Validated filters queryset वर लावतो
+    def filter(self, queryset):
+        return queryset.filter(**{self.lookups[name]: value for name, value in self.validated_data.items()})
+
+# ---------------------------------------------------------------------------------------------------
+# Sales analytics (AdminSalesAnalyticsView) - query params आणि rollups (myapp/rollups.py) चा output
+# ✅ ?start=&end= (दोन्ही inclusive, default शेवटचे 30 दिवस), ?top= (top products / cities)
+class SalesAnalyticsQuerySerializer(serializers.Serializer):
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    top = serializers.IntegerField(required=False, min_value=1, max_value=100, default=10)
+
+    def validate(self, data):
+        data.setdefault('end', timezone.localdate())
+        data.setdefault('start', data['end'] - timedelta(days=29))
+        if data['start'] > data['end']:
+            raise serializers.ValidationError('start must not be after end')
+        return data
+
+
+class SalesTotalsSerializer(serializers.Serializer):
+    orders = serializers.IntegerField()
+    units = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+class SalesDaySerializer(SalesTotalsSerializer):
+    day = serializers.DateField()
+
+
+class ProductSalesSerializer(SalesTotalsSerializer):
+    product_id = serializers.IntegerField()
+    product_name = serializers.CharField(source='product__name')
+
+
+class CitySalesSerializer(serializers.Serializer):
+    city = serializers.CharField()
+    orders = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+class SalesSummarySerializer(serializers.Serializer):
+    start = serializers.DateField()
+    end = serializers.DateField()
+    refreshed_at = serializers.DateTimeField(allow_null=True)
+    totals = SalesTotalsSerializer()
+    days = SalesDaySerializer(many=True)
+    top_products = ProductSalesSerializer(many=True)
+    cities = CitySalesSerializer(many=True)
+
+# ---------------------------------------------------------------------------------------------------
+# NumPy sales report (AdminSalesReportView / sales_report command) चे query params
+# ✅ ?start=&end= (order dates, दोन्ही inclusive, नसतील तर पूर्ण history), ?metrics=a,b (default सगळे), ?top=
+class SalesReportQuerySerializer(serializers.Serializer):
+    start = serializers.DateField(required=False, default=None)
+    end = serializers.DateField(required=False, default=None)
+    metrics = serializers.CharField(required=False, default=','.join(METRICS))
+    top = serializers.IntegerField(required=False, min_value=1, max_value=100, default=20)
+
+    def validate_metrics(self, value):
+        metrics = tuple(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+        unknown = [name for name in metrics if name not in METRICS]
+        if unknown or not metrics:
+            raise serializers.ValidationError(f'Choose from: {", ".join(METRICS)}')
+        return metrics
+
+    def validate(self, data):
+        if data['start'] and data['end'] and data['start'] > data['end']:
+            raise serializers.ValidationError('start must not be after end')
+        return data
 
 # ---------------------------------------------------------------------------------------------------
 # Contact Form साठी Serializer
@@ -0,0 +1,89 @@
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import bump_catalog_version
+from .conditional import mark_deleted
+from .inventory import release_reservations
+from .models import Order, OrderItem, Product, ProductImage
+from .rollups import mark_days_dirty, order_days
+from .search import index_products, unindex_products
+
+# ---------------------------------------------------------------------------------------------------
+# Product किंवा Product Image बदलला / delete झाला की catalog cache चा version वाढवतो
+# ✅ Commit नंतरच version वाढतो, नाहीतर commit आधीचा जुना data नवीन version खाली cache होऊ शकतो
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=ProductImage)
+@receiver(post_delete, sender=ProductImage)
+def invalidate_catalog_cache(sender, **kwargs):
+    transaction.on_commit(bump_catalog_version)
+# ---------------------------------------------------------------------------------------------------
+
+# Delete मुळे max(updated_at) बदलत नाही - conditional GET चा Last-Modified पुढे नेण्यासाठी (myapp/conditional.py)
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=ProductImage)
+@receiver(post_delete, sender=Order)
+def record_deletion(sender, using, **kwargs):
+    mark_deleted(sender, using)
+
+
+# Order / Product delete मधला OrderItem cascade? (त्या deletes चे स्वतःचे receivers आहेत)
+def _cascaded(origin):
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return origin is not None and origin_model in (Order, Product)
+
+
+# Orders चे validators फक्त Order rows वरून बनतात - OrderItem बदलला / delete झाला की त्याच्या Order चा updated_at पुढे
+@receiver(post_save, sender=OrderItem)
+@receiver(post_delete, sender=OrderItem)
+def touch_order(sender, instance, using, origin=None, **kwargs):
+    if _cascaded(origin):
+        return
+    Order.objects.using(using).filter(pk=instance.order_id).update(updated_at=timezone.now())
+# ---------------------------------------------------------------------------------------------------
+
+# Order कुठूनही delete झाला (cancel, admin, user delete cascade) तरी unpaid order चा reserved stock परत shards मध्ये -
+# नाहीतर StockReservation cascade होऊन stock कायमचा हरवतो
+@receiver(pre_delete, sender=Order)
+def release_order_stock(sender, instance, **kwargs):
+    release_reservations(instance)
+# ---------------------------------------------------------------------------------------------------
+
+# Product save / delete वर search index sync ठेवतो (SQLite FTS5; इतर databases वर काही करत नाही)
+@receiver(post_save, sender=Product)
+def index_product(sender, instance, using, **kwargs):
+    index_products([instance], using=using)
+
+
+@receiver(post_delete, sender=Product)
+def unindex_product(sender, instance, using, **kwargs):
+    unindex_products([instance.pk], using=using)
+# ---------------------------------------------------------------------------------------------------
+
+# Sales rollups (myapp/rollups.py) - updated_at watermark ला न दिसणारे बदल: त्या orders चे दिवस dirty,
+# पुढचा refresh_rollups ते दिवस परत मोजतो
+# OrderItem बदल / delete वेगळा mark होत नाही - touch_order मुळे order watermark pass मध्ये येतो
+
+# Order delete (cancel)
+@receiver(post_delete, sender=Order)
+def mark_rollup_day_dirty(sender, instance, using, **kwargs):
+    mark_days_dirty([timezone.localdate(instance.created_at)], using)
+
+
+# Order चा created_at बदलला - जुना दिवस (नवीन दिवस updated_at मुळे watermark ला दिसतो)
+@receiver(pre_save, sender=Order)
+def mark_moved_order_day_dirty(sender, instance, using, raw=False, update_fields=None, **kwargs):
+    if raw or instance.pk is None or (update_fields is not None and 'created_at' not in update_fields):
+        return
+    previous = Order.objects.using(using).filter(pk=instance.pk).values_list('created_at', flat=True).first()
+    if previous is not None and previous != instance.created_at:
+        mark_days_dirty([timezone.localdate(previous)], using)
+
+
+# Product delete - त्याचे OrderItems cascade होतात; सगळे दिवस एकाच query मध्ये
+@receiver(pre_delete, sender=Product)
+def mark_product_sales_days_dirty(sender, instance, using, **kwargs):
+    mark_days_dirty(order_days(Order.objects.using(using).filter(items__product=instance)), using)
@@ -0,0 +1,168 @@
+import hashlib
+import os
+import tempfile
+import time
+import uuid
+
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+from django.utils.deconstruct import deconstructible
+
+# ---------------------------------------------------------------------------------------------------
+# Product Images साठी Content-addressed (deduplicated) storage
+# ✅ File चं नाव त्याच्या SHA-256 hash वरून: product_images/ab/ab12...ef.jpg
+# ✅ तोच photo कितीही products ला upload केला तरी disk वर एकच file आणि एकच URL (CDN / whitenoise cache एकदाच)
+# ✅ एकाच file ला अनेक ProductImage rows refer करू शकतात - delete करताना myapp/media.py refcount तपासतो
+# ✅ Save मध्ये आधीच असलेली file परत मिळाली तर तिचा mtime "आता" होतो - row commit होण्याआधीचा (in-flight) upload
+#    पण file वापरतोय हे drainer ला दिसतं; delete_if_idle grace period मधल्या files काढत नाही
+
+
+def _content_name(directory, digest, extension):
+    return os.path.join(directory, digest[:2], f'{digest}{extension}').replace('\\', '/')
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    # Hash वरून नाव ठरत असल्यामुळे Django ने random suffix लावायची गरज नाही
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def _save(self, name, content):
+        directory = os.path.dirname(name)
+        extension = os.path.splitext(name)[1].lower()
+
+        # Upload handler ने stream होतानाच hash काढला असेल तर file आधीच आहे का ते लगेच बघतो
+        digest = getattr(content, 'content_hash', None)
+        if digest is not None:
+            final_name = _content_name(directory, digest, extension)
+            if self._touch(final_name):
+                return final_name
+
+        # नाहीतर temp file मध्ये लिहितानाच hash काढतो (data एकदाच वाचला जातो)
+        temp_dir = self.path(directory)
+        os.makedirs(temp_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=temp_dir, prefix='.upload-')
+        try:
+            hasher = hashlib.sha256()
+            with os.fdopen(fd, 'wb') as out:
+                for chunk in content.chunks():
+                    hasher.update(chunk)
+                    out.write(chunk)
+
+            final_name = _content_name(directory, hasher.hexdigest(), extension)
+            full_path = self.path(final_name)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+
+            if self._touch(final_name):
+                os.remove(temp_path)
+            else:
+                # Same filesystem वर rename atomic असतो - दोन requests एकच file लिहीत असल्या तरी चालतं
+                os.replace(temp_path, full_path)
+                if self.file_permissions_mode is not None:
+                    os.chmod(full_path, self.file_permissions_mode)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        return final_name
+
+    # आधीच असलेल्या file चा mtime आता करतो - file नसेल (किंवा delete साठी बाजूला केली असेल) तर False
+    def _touch(self, name):
+        try:
+            os.utime(self.path(name))
+        except FileNotFoundError:
+            return False
+        return True
+
+    # Grace seconds मध्ये कोणत्याही upload ने न वापरलेली file delete करतो -> True, अलीकडे वापरली असेल तर False
+    # ✅ आधी file atomic rename ने बाजूला (parked) - त्यानंतरचा upload file नाही असं पाहून ती परत लिहितो,
+    #    आणि rename आधी upload ने touch केली असेल तर mtime नवीन दिसतो आणि file परत जागेवर जाते
+    # ✅ cleanup(name) (उदा. variants delete) original काढण्याआधी; fail झाला तर file परत जागेवर
+    def delete_if_idle(self, name, grace, cleanup=None):
+        path = self.path(name)
+        parked = f'{path}.deleting-{uuid.uuid4().hex}'
+        try:
+            os.replace(path, parked)
+        except FileNotFoundError:
+            parked = None
+
+        try:
+            if parked is not None and time.time() - os.stat(parked).st_mtime < grace:
+                os.replace(parked, path)
+                return False
+            if cleanup is not None:
+                cleanup(name)
+        except BaseException:
+            if parked is not None and os.path.exists(parked):
+                os.replace(parked, path)
+            raise
+
+        if parked is not None:
+            os.remove(parked)
+        return True
+
+
+product_image_storage = ContentAddressedStorage()
+
+
+# ---------------------------------------------------------------------------------------------------
+# Deterministic नावांच्या files (image variants) साठी storage
+# ✅ तेच नाव परत save केलं तर random suffix नाही - temp file लिहून atomic rename ने जुनी file replace होते
+# ✅ एकाच image चे दोन jobs एकाच वेळी चालले तरी एकच file राहते (orphan `_AbC123` copies नाहीत), आणि
+#    overwrite चालू असताना file कधीच गायब / अर्धवट दिसत नाही
+
+@deconstructible
+class OverwriteStorage(FileSystemStorage):
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def _save(self, name, content):
+        full_path = self.path(name)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(full_path), prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                for chunk in content.chunks():
+                    out.write(chunk)
+            os.replace(temp_path, full_path)
+            if self.file_permissions_mode is not None:
+                os.chmod(full_path, self.file_permissions_mode)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return name
+
+
+variant_storage = OverwriteStorage()
+
+
+# ---------------------------------------------------------------------------------------------------
+# Upload stream होत असतानाच chunk-by-chunk SHA-256 काढणारे upload handlers
+# ✅ uploaded file वर `content_hash` attribute लागतो, storage तो वापरून duplicate file लगेच ओळखतो
+
+class HashingUploadMixin:
+    def new_file(self, *args, **kwargs):
+        self.hasher = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        # Memory handler activate नसेल तर data पुढच्या (temporary file) handler कडे जातो, तिथे hash होतो
+        if getattr(self, 'activated', True):
+            self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded = super().file_complete(file_size)
+        if uploaded is not None:
+            uploaded.content_hash = self.hasher.hexdigest()
+        return uploaded
+
+
+class HashingMemoryFileUploadHandler(HashingUploadMixin, MemoryFileUploadHandler):
+    pass
+
+
+class HashingTemporaryFileUploadHandler(HashingUploadMixin, TemporaryFileUploadHandler):
+    pass
@@ -1,3 +1,1419 @@
-from django.test import TestCase
+import csv
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from io import BytesIO, StringIO
+from types import SimpleNamespace
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import jwt
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, connection, connections, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models import F
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from PIL import Image
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from . import cart_store, idempotency
+from .analytics import available as analytics_available, load_line_items, sales_report
+from .cache import get_catalog_version
+from .cart import apply_cart_operations, cart_summary
+from .cart_store import cart_data, checkout_cart, flush_carts, update_cart
+from .addresses import dedupe_addresses, save_address
+from .fast_serializers import product_values, serialize_cart, serialize_orders, serialize_products
+from .inventory import OutOfStock, expire_reservations, mark_order_paid, release_reservations, reserve_stock, set_stock, stock_levels
+from .media import FILE_DELETION_GRACE, FILE_DELETION_MAX_BACKOFF, _backoff, drain_file_deletions, enqueue_file_deletions
+from .models import Admin, Address, Cart, CatalogVersion, Contact, DailyProductSales, DailySales, DeletionMark, FileDeletion, Order, OrderItem, Product, ProductImage, RollupDirtyDay, RollupWatermark, StockReservation, StockShard
+from .pagination import OrderKeysetPagination, approximate_count
+from .parsers import ORJSONParser
+from .renderers import ORJSONRenderer
+from .rollups import ROLLUP_LOCK, RollupRefreshRunning, _refresh_lock, refresh_rollups, sales_summary
+from .search import rebuild_search_index, search_products
+from .serializers import CartSerializer, CartSummarySerializer, OrderSerializer, ProductSerializer
+from .storage import product_image_storage, variant_storage
+from .thumbnails import VARIANT_FORMATS, VARIANT_SIZES, render_variants
+from .variants import variant_name
+
+
+# Admin JWT (AdminJWTAuthentication) असलेला API client
+def admin_client():
+    admin = Admin.objects.create(email='admin@example.com', password='x')
+    token = jwt.encode(
+        {'id': admin.id, 'email': admin.email, 'exp': datetime.utcnow() + timedelta(hours=1), 'is_admin': True},
+        settings.SECRET_KEY, algorithm='HS256',
+    )
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+# Pillow ने बनवलेली छोटी PNG upload (वेगळा color = वेगळा content hash)
+def image_upload(name='photo.png', size=(300, 120), color=(200, 30, 30, 255)):
+    buffer = BytesIO()
+    Image.new('RGBA', size, color).save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+# Files temp MEDIA_ROOT मध्ये लिहिणारे tests
+class TempMediaMixin:
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = self.settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+
+# ---------------------------------------------------------------------------------------------------
+# Fast-path serializers (myapp/fast_serializers.py) चा output DRF serializers सारखाच byte-for-byte आहे का
+class FastSerializerParityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('asha', 'asha@example.com', 'pass')
+        cls.tea = Product.objects.create(name='चहा पावडर', description='Assam tea', price=Decimal('249.5'))
+        cls.honey = Product.objects.create(name='Honey', description='', price=Decimal('0.00'))
+        Product.objects.create(name='Ghee', description='No images', price=Decimal('99999999.99'))
+
+        ProductImage.objects.create(product=cls.tea, image='product_images/ab/ab12.jpg', variants={
+            'thumbnail': {'webp': 'product_images/variants/ab12_jpg_thumbnail.webp'},
+        })
+        ProductImage.objects.create(product=cls.tea, image='product_images/cd/cd34.png')
+        ProductImage.objects.create(product=cls.honey, image='product_images/ef/ef56.jpg')
+
+        Cart.objects.create(user=cls.user, product=cls.tea, quantity=3)
+        Cart.objects.create(user=cls.user, product=cls.honey, quantity=1)
+
+        address = Address.objects.create(
+            user=cls.user, full_name='Asha Patil', phone='9999999999', address='12 MG Road',
+            city='Pune', state='MH', pincode='411001',
+        )
+        order = Order.objects.create(user=cls.user, address=address, total_price=Decimal('748.50'))
+        OrderItem.objects.create(order=order, product=cls.tea, quantity=3, price=Decimal('249.50'))
+        OrderItem.objects.create(order=order, product=cls.honey, quantity=1, price=Decimal('0'))
+        # Address नसलेला आणि items नसलेला order
+        Order.objects.create(user=cls.user, address=None, total_price=Decimal('10'))
+
+    def setUp(self):
+        self.request = Request(APIRequestFactory().get('/'))
+
+    def assertSameJSON(self, fast, slow):
+        self.assertEqual(JSONRenderer().render(fast), JSONRenderer().render(slow))
+
+    def test_products(self):
+        products = Product.objects.order_by('id')
+        slow = ProductSerializer(products.prefetch_related('images'), many=True, context={'request': self.request}).data
+        self.assertSameJSON(serialize_products(product_values(products), self.request), slow)
+
+    def test_products_without_request(self):
+        products = Product.objects.order_by('id')
+        self.assertSameJSON(serialize_products(product_values(products)), ProductSerializer(products, many=True).data)
+
+    def test_cart(self):
+        cart = Cart.objects.filter(user=self.user).order_by('id')
+        slow = CartSerializer(cart.select_related('product'), many=True, context={'request': self.request}).data
+        self.assertSameJSON(serialize_cart(cart, self.request), slow)
+
+    def test_orders(self):
+        orders = Order.objects.order_by('-created_at', '-id')
+        slow = OrderSerializer(orders.with_details(), many=True, context={'request': self.request}).data
+        self.assertSameJSON(serialize_orders(orders, self.request), slow)
+
+
+# ---------------------------------------------------------------------------------------------------
+# ORJSONRenderer / ORJSONParser (myapp/renderers.py, myapp/parsers.py) DRF च्या stdlib versions सारखेच वागतात का
+class ORJSONRendererTests(TestCase):
+    data = {
+        'price': '249.50',
+        'subtotal': Decimal('748.50'),
+        'created_at': datetime(2024, 5, 1, 10, 30, 15, 120000, tzinfo=dt_timezone.utc),
+        'label': gettext_lazy('Product'),
+        'name': 'चहा पावडर',
+        1: [None, True, 3],
+    }
+
+    def test_matches_stdlib_renderer(self):
+        self.assertEqual(ORJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+    def test_indent_uses_stdlib(self):
+        accepted = 'application/json; indent=4'
+        self.assertEqual(
+            ORJSONRenderer().render(self.data, accepted), JSONRenderer().render(self.data, accepted),
+        )
+
+    def test_parser(self):
+        parser = ORJSONParser()
+        self.assertEqual(parser.parse(BytesIO('{"name": "चहा", "qty": 2}'.encode())), {'name': 'चहा', 'qty': 2})
+        with self.assertRaises(ParseError):
+            parser.parse(BytesIO(b'{"price": NaN}'))
+        with self.assertRaises(ParseError):
+            parser.parse(BytesIO(b'{"price": '))
+
+
+# ---------------------------------------------------------------------------------------------------
+# Sharded stock reservations (myapp/inventory.py) - oversell नाही, expire / payment नंतर stock बरोबर
+class InventoryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('asha', 'asha@example.com', 'pass')
+        cls.product = Product.objects.create(name='Sale item', description='', price=Decimal('10'))
+        cls.untracked = Product.objects.create(name='Regular item', description='', price=Decimal('5'))
+
+    def order(self, quantity):
+        order = Order.objects.create(user=self.user, total_price=Decimal('10') * quantity)
+        OrderItem.objects.create(order=order, product=self.product, quantity=quantity, price=Decimal('10'))
+        return order
+
+    def levels(self):
+        return stock_levels([self.product.pk])[self.product.pk]
+
+    def test_reservations_never_oversell(self):
+        set_stock(self.product.pk, 5, shards=4)
+        reserve_stock(self.order(3), {self.product.pk: 3, self.untracked.pk: 1}, shards=4)
+        with self.assertRaises(OutOfStock) as raised, transaction.atomic():
+            reserve_stock(self.order(3), {self.product.pk: 3}, shards=4)
+        self.assertEqual(raised.exception.product_ids, [self.product.pk])
+        self.assertEqual(self.levels(), {'available': 2, 'reserved': 3})
+
+    def test_expired_reservations_return_stock(self):
+        set_stock(self.product.pk, 5, shards=4)
+        order = self.order(4)
+        reserve_stock(order, {self.product.pk: 4}, shards=4)
+        expired = StockReservation.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(expire_reservations(), expired)
+        self.assertEqual(self.levels(), {'available': 5, 'reserved': 0})
+
+        # Expire नंतर payment - stock परत घेतला जातो
+        mark_order_paid(order.pk, shards=4)
+        self.assertEqual(self.levels(), {'available': 1, 'reserved': 0})
+
+    def test_fewer_shards_keep_outstanding_reservations(self):
+        set_stock(self.product.pk, 8, shards=4)
+        order = self.order(3)
+        StockShard.objects.filter(product=self.product, shard=3).update(available=F('available') - 2)
+        StockShard.objects.filter(product=self.product, shard=2).update(available=F('available') - 1)
+        StockReservation.objects.bulk_create(
+            StockReservation(order=order, product=self.product, shard=shard, quantity=quantity, expires_at=timezone.now())
+            for shard, quantity in ((3, 2), (2, 1))
+        )
+
+        set_stock(self.product.pk, 10, shards=2)
+        self.assertEqual(sorted(StockReservation.objects.values_list('shard', flat=True)), [0, 1])
+        self.assertEqual(self.levels(), {'available': 10, 'reserved': 3})
+
+        # Cancel झाल्यावर तिन्ही units उरलेल्या shards मध्ये परत
+        release_reservations(order)
+        self.assertEqual(self.levels(), {'available': 13, 'reserved': 0})
+
+    # CancelOrderView शिवाय delete (admin, queryset, user cascade) - reservations stock सोबत परत
+    def test_deleting_order_returns_stock(self):
+        set_stock(self.product.pk, 5, shards=4)
+        orders = [self.order(2), self.order(1)]
+        for order in orders:
+            reserve_stock(order, {self.product.pk: order.items.get().quantity}, shards=4)
+
+        Order.objects.filter(pk=orders[0].pk).delete()
+        self.assertEqual(self.levels(), {'available': 4, 'reserved': 1})
+
+        self.user.delete()
+        self.assertEqual(self.levels(), {'available': 5, 'reserved': 0})
+        self.assertFalse(StockReservation.objects.exists())
+
+
+# Threads वेगवेगळ्या connections वर एकाच वेळी checkout करतात - SQLite वर writers serialize होतात (select_for_update नाही)
+@skipUnlessDBFeature('has_select_for_update')
+class InventoryConcurrencyTests(TransactionTestCase):
+    def test_concurrent_checkouts_never_oversell(self):
+        user = User.objects.create_user('asha')
+        product = Product.objects.create(name='Sale item', description='', price=Decimal('10'))
+        set_stock(product.pk, 40, shards=4)
+
+        def checkout(_):
+            try:
+                with transaction.atomic():
+                    order = Order.objects.create(user=user, total_price=product.price)
+                    OrderItem.objects.create(order=order, product=product, quantity=1, price=product.price)
+                    reserve_stock(order, {product.pk: 1}, shards=4)
+                return True
+            except OutOfStock:
+                return False
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(8) as pool:
+            sold = sum(pool.map(checkout, range(60)))
+        self.assertEqual(sold, 40)
+        self.assertEqual(stock_levels([product.pk])[product.pk], {'available': 0, 'reserved': 40})
+        self.assertEqual(Order.objects.filter(stock_reservations__isnull=False).distinct().count(), 40)
+
+
+# ---------------------------------------------------------------------------------------------------
+# Address book (myapp/addresses.py) - normalized hash वर dedupe, जुन्या rows चे merge
+class AddressBookTests(TestCase):
+    address = {'full_name': 'Asha Patil', 'phone': '+91 99999 99999', 'address': '12, MG Road', 'city': 'Pune', 'state': 'MH', 'pincode': '411001'}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('asha', 'asha@example.com', 'pass')
+
+    def test_same_address_is_reused(self):
+        first, created = save_address(self.user, self.address)
+        same, created_again = save_address(self.user, {
+            **self.address, 'full_name': ' asha  PATIL', 'address': '12 MG Road.', 'phone': '919999999999', 'pincode': '411 001',
+        })
+        self.assertTrue(created)
+        self.assertFalse(created_again)
+        self.assertEqual(first.pk, same.pk)
+        self.assertTrue(save_address(self.user, {**self.address, 'city': 'Mumbai'})[1])
+
+    def test_dedupe_merges_legacy_rows(self):
+        legacy = [Address.objects.create(user=self.user, **self.address) for _ in range(3)]
+        orders = [Order.objects.create(user=self.user, address=address, total_price=Decimal('1')) for address in legacy]
+
+        self.assertEqual(dedupe_addresses(), 2)
+        self.assertEqual(Address.objects.filter(user=self.user).count(), 1)
+        self.assertEqual({order.address_id for order in Order.objects.filter(pk__in=[o.pk for o in orders])}, {legacy[0].pk})
+        self.assertEqual(save_address(self.user, self.address)[0].pk, legacy[0].pk)
+
+
+# ---------------------------------------------------------------------------------------------------
+# Product list (ProductViewSet) - default cursor page, images page प्रमाणे एकाच query मध्ये
+class ProductListPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(25):
+            product = Product.objects.create(name=f'Product {i}', description='', price=Decimal('10'))
+            ProductImage.objects.create(product=product, image=f'product_images/p{i}.jpg')
+
+    def test_list_is_paginated_by_default(self):
+        first = self.client.get('/product/').json()
+        self.assertEqual(len(first['results']), 20)
+        self.assertIsNone(first['previous'])
+
+        rest = self.client.get(first['next']).json()
+        self.assertEqual(len(rest['results']), 5)
+        self.assertIsNone(rest['next'])
+        ids = [product['id'] for product in first['results'] + rest['results']]
+        self.assertEqual(ids, list(Product.objects.order_by('id').values_list('id', flat=True)))
+
+    def test_queries_do_not_grow_with_page_size(self):
+        self.client.get('/product/?page_size=1')  # catalog state cache warm
+        with CaptureQueriesContext(connection) as small:
+            self.client.get('/product/?page_size=2&fields=id,images')
+        with CaptureQueriesContext(connection) as large:
+            self.client.get('/product/?page_size=20&fields=id,images')
+        self.assertEqual(len(small), len(large))
+
+
+# ---------------------------------------------------------------------------------------------------
+# Catalog cache (myapp/cache.py) - दुसऱ्या worker ने version वाढवला तरी (फक्त database row बदलते) जुना response जात नाही
+class CatalogCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.product = Product.objects.create(name='Tea', description='', price=Decimal('10'))
+
+    def name(self):
+        return self.client.get(f'/product/{self.product.pk}/').json()['name']
+
+    def test_version_is_shared_through_database(self):
+        self.assertEqual(self.name(), 'Tea')
+        # update() signals पाठवत नाही - response अजून cache मधूनच
+        Product.objects.filter(pk=self.product.pk).update(name='Green tea')
+        self.assertEqual(self.name(), 'Tea')
+
+        CatalogVersion.objects.filter(name='catalog').update(value=F('value') + 1)
+        self.assertEqual(self.name(), 'Green tea')
+        self.assertEqual(get_catalog_version(), CatalogVersion.objects.get(name='catalog').value)
+
+
+# ---------------------------------------------------------------------------------------------------
+# Compression (myapp/middleware.py) - JSON चे compressed bytes cache (hit वर render पण नाही), HTML कधीच cache नाही
+class CompressionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(20):
+            Product.objects.create(name=f'Product {i}', description='Loose leaf tea ' * 10, price=Decimal('10'))
+
+    def get(self, **headers):
+        return self.client.get('/product/', **{'HTTP_ACCEPT_ENCODING': 'gzip', **headers})
+
+    def test_json_hit_skips_render_and_compression(self):
+        first = self.get()
+        self.assertEqual(first['Content-Encoding'], 'gzip')
+        self.assertEqual(len(json.loads(gzip.decompress(first.content))['results']), 20)
+
+        with mock.patch.object(ORJSONRenderer, 'render', side_effect=AssertionError('rendered again')), \
+                mock.patch('myapp.middleware.compress', side_effect=AssertionError('compressed again')):
+            second = self.get()
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['Content-Type'], first['Content-Type'])
+        self.assertIn('Accept-Encoding', second['Vary'])
+
+    def test_html_is_padded_and_never_cached(self):
+        pages = [self.get(HTTP_ACCEPT='text/html', HTTP_ACCEPT_ENCODING='br, gzip') for _ in range(2)]
+        # HTML फक्त gzip, random bytes मुळे दर वेळी वेगळे bytes (cache मधून आलेले नाहीत)
+        self.assertEqual([page['Content-Encoding'] for page in pages], ['gzip', 'gzip'])
+        self.assertNotEqual(pages[0].content, pages[1].content)
+        self.assertIn(b'Product 0', gzip.decompress(pages[1].content))
+
+
+# ---------------------------------------------------------------------------------------------------
+# Conditional GET (myapp/conditional.py) - ETag / If-Modified-Since ला 304, delete नंतर परत 200
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('asha', 'asha@example.com', 'pass')
+        cls.products = [Product.objects.create(name=f'Product {i}', description='', price=Decimal('10')) for i in range(2)]
+        cls.orders = [Order.objects.create(user=cls.user, total_price=Decimal('10')) for _ in range(2)]
+        # जुने timestamps - delete त्याच second मध्ये झाला तरी Last-Modified पुढे गेलेला दिसावा
+        past = timezone.now() - timedelta(hours=1)
+        Product.objects.update(updated_at=past)
+        Order.objects.update(updated_at=past)
+
+    def setUp(self):
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def assertRevalidates(self, url, first, status_code):
+        self.assertEqual(self.api.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, status_code)
+        self.assertEqual(self.api.get(url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified']).status_code, status_code)
+
+    def test_products(self):
+        first = self.api.get('/product/')
+        self.assertRevalidates('/product/', first, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.products[0].delete()
+        self.assertRevalidates('/product/', first, 200)
+
+    def test_orders(self):
+        first = self.api.get('/my-orders/')
+        self.assertEqual(len(first.json()), 2)
+        self.assertRevalidates('/my-orders/', first, 304)
+
+        self.assertEqual(self.api.delete(f'/cancel-order/{self.orders[0].pk}/').status_code, 200)
+        self.assertRevalidates('/my-orders/', first, 200)
+
+    def test_order_items(self):
+        item = OrderItem.objects.create(order=self.orders[1], product=self.products[1], quantity=1, price=Decimal('10'))
+        Order.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        first = self.api.get('/my-orders/')
+        self.assertRevalidates('/my-orders/', first, 304)
+
+        item.quantity = 3
+        item.save()
+        self.assertRevalidates('/my-orders/', first, 200)
+
+    # Rows नाहीत, delete पण नाही - तरी epoch Last-Modified, polling ला 304
+    def test_empty_list(self):
+        Product.objects.all()._raw_delete('default')
+        Order.objects.all()._raw_delete('default')
+        first = self.api.get('/product/')
+        self.assertEqual(first['Last-Modified'], 'Thu, 01 Jan 1970 00:00:01 GMT')
+        self.assertRevalidates('/product/', first, 304)
+
+        first = self.api.get('/my-orders/')
+        self.assertEqual(first.json(), [])
+        self.assertRevalidates('/my-orders/', first, 304)
+
+
+# ---------------------------------------------------------------------------------------------------
+# import_products command - चांगल्या rows import होतात, चुकीच्या rows skip (batch abort होत नाही)
+class ImportProductsTests(TestCase):
+    def run_import(self, name, content):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, name)
+            with open(path, 'w', encoding='utf-8') as fh:
+                fh.write(content)
+            out, err = StringIO(), StringIO()
+            call_command('import_products', path, '--batch-size', '2', stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_csv(self):
+        existing = Product.objects.create(name='Old tea', description='', price=Decimal('1'))
+        out, err = self.run_import('catalog.csv', (
+            'id,name,description,price\n'
+            ',Tea,Assam,249.50\n'
+            ',Bad price,,abc\n'
+            ',Too precise,,1.234\n'
+            ',Too big,,123456789.00\n'
+            ',Not a number,,NaN\n'
+            f'{existing.pk},New tea,Darjeeling,99\n'
+            ',,No name,1\n'
+        ))
+        self.assertIn('1 created, 1 updated, 0 images, 5 skipped', out)
+        self.assertIn("'Too big': invalid price", err)
+        self.assertEqual(
+            list(Product.objects.order_by('id').values_list('name', 'price')),
+            [('New tea', Decimal('99')), ('Tea', Decimal('249.50'))],
+        )
+
+    def test_jsonl(self):
+        out, err = self.run_import('catalog.jsonl', '\n'.join([
+            '{"name": "Honey", "description": "Raw", "price": "120"}',
+            '{"name": 5, "price": "1"}',
+            '{"name": "Infinite", "price": "Infinity"}',
+            '{"name": "Bad images", "price": "1", "images": 5}',
+            '{"name": "Bad description", "price": "1", "description": ["x"]}',
+            '{"name": "' + 'x' * 300 + '", "price": "1"}',
+            'not json',
+            '[1, 2]',
+            '{"name": "Ghee", "price": 450.5}',
+        ]))
+        self.assertIn('2 created, 0 updated, 0 images, 7 skipped', out)
+        self.assertIn('images must be a path or a list of paths', err)
+        self.assertEqual(
+            list(Product.objects.order_by('id').values_list('name', 'price')),
+            [('Honey', Decimal('120')), ('Ghee', Decimal('450.5'))],
+        )
+
+
+# ---------------------------------------------------------------------------------------------------
+# `?fields=` / `?expand=` (DynamicFieldsMixin) - फक्त मागितलेले fields, collapse केलेले relations load होत नाहीत
+class SparseFieldsetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('asha', 'asha@example.com', 'pass')
+        cls.tea = Product.objects.create(name='Tea', description='Assam', price=Decimal('249.50'))
+        ProductImage.objects.create(product=cls.tea, image='product_images/ab/ab12.jpg')
+        Cart.objects.create(user=cls.user, product=cls.tea, quantity=2)
+        order = Order.objects.create(user=cls.user, total_price=Decimal('499'))
+        OrderItem.objects.create(order=order, product=cls.tea, quantity=2, price=Decimal('249.50'))
+
+    def setUp(self):
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def test_products(self):
+        results = self.api.get('/product/?fields=id,name').json()['results']
+        self.assertEqual(results, [{'id': self.tea.pk, 'name': 'Tea'}])
+
+        results = self.api.get('/product/?expand=').json()['results']
+        self.assertEqual(set(results[0]), {'id', 'name', 'description', 'price'})
+
+        results = self.api.get('/product/?fields=id,images.id').json()['results']
+        self.assertEqual(results[0]['images'], [{'id': self.tea.images.get().pk}])
+
+    def test_cart(self):
+        self.assertEqual(self.api.get('/cart/?expand=&fields=product,quantity').json(), [{'product': self.tea.pk, 'quantity': 2}])
+        self.assertEqual(
+            self.api.get('/cart/?fields=product.name,quantity').json(), [{'product': {'name': 'Tea'}, 'quantity': 2}],
+        )
+
+    def test_orders_skip_collapsed_relations(self):
+        with CaptureQueriesContext(connection) as collapsed:
+            orders = self.api.get('/my-orders/?fields=id,items&expand=').json()
+        self.assertEqual(set(orders[0]), {'id'})
+        self.assertFalse(any('myapp_orderitem' in query['sql'] for query in collapsed))
+
+        orders = self.api.get('/my-orders/?fields=id,items.product_name&expand=items').json()
+        self.assertEqual(orders[0]['items'], [{'product_name': 'Tea'}])
+
+
+# ---------------------------------------------------------------------------------------------------
+# Streaming exports (myapp/exports.py) - NDJSON / CSV, एका order item साठी एक CSV row
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user('asha', 'asha@example.com', 'pass')
+        cls.tea = Product.objects.create(name='Tea, Assam', description='Strong "CTC"', price=Decimal('249.50'))
+        ProductImage.objects.create(product=cls.tea, image='product_images/ab/ab12.jpg')
+        ProductImage.objects.create(product=cls.tea, image='product_images/cd/cd34.png')
+        Product.objects.create(name='Honey', description='', price=Decimal('120'))
+
+        cls.order = Order.objects.create(user=user, total_price=Decimal('499'))
+        OrderItem.objects.create(order=cls.order, product=cls.tea, quantity=2, price=Decimal('249.50'))
+        cls.empty = Order.objects.create(user=user, total_price=Decimal('0'))
+
+    def content(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_products_ndjson(self):
+        response = self.client.get('/export/products/')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        records = [json.loads(line) for line in self.content(response).splitlines()]
+        self.assertEqual([record['name'] for record in records], ['Tea, Assam', 'Honey'])
+        self.assertEqual(len(records[0]['images']), 2)
+
+    def test_products_csv(self):
+        response = self.client.get('/export/products/?output=csv')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="products.csv"')
+        rows = list(csv.reader(StringIO(self.content(response))))
+        self.assertEqual(rows[0], ['id', 'name', 'description', 'price', 'images'])
+        self.assertEqual(rows[1][1:4], ['Tea, Assam', 'Strong "CTC"', '249.50'])
+        self.assertEqual(len(rows[1][4].split('|')), 2)
+        self.assertEqual(len(rows), 3)
+
+    def test_orders_csv(self):
+        response = admin_client().get('/api/admin/orders/export/?output=csv')
+        rows = list(csv.DictReader(StringIO(self.content(response))))
+        self.assertEqual([(row['order_id'], row['product_name'], row['quantity']) for row in rows], [
+            (str(self.empty.pk), '', ''), (str(self.order.pk), 'Tea, Assam', '2'),
+        ])
+
+    def test_unknown_output(self):
+        self.assertEqual(self.client.get('/export/products/?output=xml').status_code, 400)
+        self.assertEqual(self.client.get('/api/admin/orders/export/').status_code, 403)
+
+
+# ---------------------------------------------------------------------------------------------------
+# Multi-image upload (ProductImageUploadView) - सगळ्या images valid तरच save, DB fail झालं तर rows rollback
+class ProductImageUploadTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.product = Product.objects.create(name='Tea', description='', price=Decimal('10'))
+
+    def upload(self, *images):
+        return APIClient().post('/upload-images/', {'product_id': self.product.pk, 'images': list(images)}, format='multipart')
+
+    def stored_files(self):
+        return sorted(
+            os.path.relpath(os.path.join(root, filename), settings.MEDIA_ROOT)
+            for root, _, filenames in os.walk(settings.MEDIA_ROOT) for filename in filenames
+        )
+
+    def test_uploads_all_images(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.upload(image_upload('a.png'), image_upload('b.png', color=(0, 0, 255, 255)), image_upload('c.png'))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(ProductImage.objects.filter(product=self.product).count(), 3)
+        # a.png आणि c.png एकच content - एकच file
+        self.assertEqual(len(self.stored_files()), 2)
+        self.assertTrue(callbacks)
+
+    def test_one_invalid_image_saves_nothing(self):
+        response = self.upload(image_upload('a.png'), SimpleUploadedFile('broken.png', b'not an image', content_type='image/png'))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['name'] for error in response.json()['images']], ['broken.png'])
+        self.assertFalse(ProductImage.objects.exists())
+        self.assertEqual(self.stored_files(), [])
+
+    def test_failed_insert_rolls_back_rows_and_queues_files(self):
+        with mock.patch.object(ProductImage.objects, 'bulk_create', side_effect=DatabaseError('insert failed')):
+            with self.assertRaises(DatabaseError):
+                self.upload(image_upload('a.png'), image_upload('b.png', color=(0, 0, 255, 255)))
+        self.assertFalse(ProductImage.objects.exists())
+        # Files लगेच delete होत नाहीत - deletion queue मधून grace नंतर निघतात
+        queued = sorted(FileDeletion.objects.values_list('name', flat=True))
+        self.assertEqual(len(queued), 2)
+        self.assertEqual(queued, self.stored_files())
+
+
+# ---------------------------------------------------------------------------------------------------
+# Content-addressed storage (myapp/storage.py, myapp/media.py) - duplicate uploads एकच file,
+# row commit होण्याआधीच्या (in-flight) upload ने वापरलेली file deletion queue delete करत नाही
+class ContentAddressedStorageTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.product = Product.objects.create(name='Tea', description='', price=Decimal('10'))
+
+    def save(self, name='product_images/tea.png', **kwargs):
+        return product_image_storage.save(name, image_upload(**kwargs))
+
+    # File शेवटची grace period आधी वापरली गेली होती
+    def age(self, name):
+        past = time.time() - 2 * FILE_DELETION_GRACE
+        os.utime(product_image_storage.path(name), (past, past))
+
+    def test_duplicate_uploads_share_one_file(self):
+        name = self.save()
+        self.assertEqual(self.save('product_images/copy.png'), name)
+        self.assertNotEqual(self.save(color=(0, 0, 255, 255)), name)
+
+    def test_in_flight_upload_keeps_queued_file(self):
+        name = self.save()
+        ProductImage.objects.create(product=self.product, image=name).delete()
+        self.age(name)
+        enqueue_file_deletions([name])
+
+        # दुसरा upload तोच photo - नाव मिळालं, पण त्याची row अजून commit झालेली नाही
+        self.assertEqual(self.save('product_images/again.png'), name)
+        self.assertEqual(drain_file_deletions(), 1)
+        self.assertTrue(product_image_storage.exists(name))
+        entry = FileDeletion.objects.get()
+        self.assertEqual(entry.attempts, 0)
+        self.assertGreater(entry.next_attempt_at, timezone.now())
+
+        # Row commit झाली - grace नंतर entry निघते, file राहते
+        ProductImage.objects.create(product=self.product, image=name)
+        self.age(name)
+        FileDeletion.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(drain_file_deletions(), 1)
+        self.assertTrue(product_image_storage.exists(name))
+        self.assertFalse(FileDeletion.objects.exists())
+
+    def test_idle_unreferenced_file_and_variants_are_deleted(self):
+        name = self.save()
+        variant = variant_storage.save(variant_name(name, 'thumbnail', 'webp'), ContentFile(b'webp'))
+        self.age(name)
+        enqueue_file_deletions([name])
+
+        self.assertEqual(drain_file_deletions(), 1)
+        self.assertFalse(product_image_storage.exists(name))
+        self.assertFalse(variant_storage.exists(variant))
+        self.assertFalse(FileDeletion.objects.exists())
+
+    def test_upload_while_file_is_parked_rewrites_it(self):
+        name = self.save()
+        self.age(name)
+
+        # delete_if_idle ने file बाजूला केली असताना तोच photo upload झाला
+        def upload_meanwhile(_):
+            self.assertFalse(product_image_storage.exists(name))
+            self.assertEqual(self.save('product_images/again.png'), name)
+
+        self.assertTrue(product_image_storage.delete_if_idle(name, FILE_DELETION_GRACE, cleanup=upload_meanwhile))
+        self.assertTrue(product_image_storage.exists(name))
+
+
+# ---------------------------------------------------------------------------------------------------
+# File deletion queue (myapp/media.py) - fail झालेल्या deletes backoff ने retry, command queue drain करतो
+class FileDeletionQueueTests(TempMediaMixin, TestCase):
+    # Storage मधली, कुठेही refer न होणारी, grace पेक्षा जुनी file queue मध्ये टाकतो
+    def queued_file(self, **kwargs):
+        name = product_image_storage.save('product_images/tea.png', image_upload(**kwargs))
+        past = time.time() - 2 * FILE_DELETION_GRACE
+        os.utime(product_image_storage.path(name), (past, past))
+        enqueue_file_deletions([name])
+        return name
+
+    def assertRetryIn(self, entry, seconds):
+        delay = (entry.next_attempt_at - timezone.now()).total_seconds()
+        self.assertAlmostEqual(delay, seconds, delta=5)
+
+    def test_failed_delete_backs_off_then_retries(self):
+        name = self.queued_file()
+        with mock.patch('myapp.media.variant_storage.delete', side_effect=OSError('storage down')), \
+                self.assertLogs('myapp.media', 'WARNING'):
+            drain_file_deletions()
+            entry = FileDeletion.objects.get()
+            self.assertEqual(entry.attempts, 1)
+            self.assertRetryIn(entry, 30)
+            self.assertIn('storage down', entry.last_error)
+            # Cleanup fail झाला तर original file परत जागेवर
+            self.assertTrue(product_image_storage.exists(name))
+
+            # Due नसलेली entry परत try होत नाही
+            self.assertEqual(drain_file_deletions(), 0)
+
+            FileDeletion.objects.update(next_attempt_at=timezone.now())
+            drain_file_deletions()
+            entry = FileDeletion.objects.get()
+            self.assertEqual(entry.attempts, 2)
+            self.assertRetryIn(entry, 60)
+
+        FileDeletion.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(drain_file_deletions(), 1)
+        self.assertFalse(FileDeletion.objects.exists())
+        self.assertFalse(product_image_storage.exists(name))
+
+    def test_backoff_is_capped(self):
+        self.assertEqual(_backoff(1), timedelta(seconds=30))
+        self.assertEqual(_backoff(20), FILE_DELETION_MAX_BACKOFF)
+
+    # 50 images - एकच DELETE, एक DeletionMark upsert आणि catalog / queue चे एक-एकच on_commit callbacks
+    def test_delete_product_images_queries(self):
+        product = Product.objects.create(name='Tea', description='', price=Decimal('10'))
+        ProductImage.objects.bulk_create([ProductImage(product=product, image=f'product_images/{i}.png') for i in range(50)])
+        with self.captureOnCommitCallbacks() as callbacks, self.assertNumQueries(6):
+            response = APIClient().delete(f'/delete-product-images/{product.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(callbacks), 2)
+        self.assertFalse(ProductImage.objects.exists())
+        self.assertEqual(FileDeletion.objects.count(), 50)
+        self.assertTrue(DeletionMark.objects.filter(model='myapp.productimage').exists())
+
+    def test_command_drains_queue(self):
+        names = [self.queued_file(), self.queued_file(color=(0, 0, 255, 255))]
+        out = StringIO()
+        call_command('drain_file_deletions', '--batch-size', '1', stdout=out)
+        self.assertIn('Processed 2 queued deletions (0 pending retry)', out.getvalue())
+        self.assertFalse(any(product_image_storage.exists(name) for name in names))
+
+
+# ---------------------------------------------------------------------------------------------------
+# Image variants (myapp/variants.py, generate_image_variants command) - missing variants बनतात, --force corrupt files दुरुस्त करतो
+# Command jobs threads मध्ये (वेगळे DB connections) चालतात, म्हणून TransactionTestCase
+class ImageVariantTests(TempMediaMixin, TransactionTestCase):
+    def setUp(self):
+        super().setUp()
+        product = Product.objects.create(name='Tea', description='', price=Decimal('10'))
+        self.image = ProductImage.objects.create(product=product, image=product_image_storage.save('product_images/tea.png', image_upload()))
+
+    def variant_size(self, variant, fmt):
+        with variant_storage.open(self.image.variants[variant][fmt]) as fh, Image.open(fh) as image:
+            return image.format, image.size
+
+    def test_render_variants(self):
+        rendered = render_variants(image_upload(size=(3000, 1500)).read())
+        self.assertEqual(set(rendered), {(variant, fmt) for variant in VARIANT_SIZES for fmt in VARIANT_FORMATS})
+        with Image.open(BytesIO(rendered['full', 'jpeg'])) as full:
+            self.assertEqual((full.format, full.mode, full.size), ('JPEG', 'RGB', (1600, 800)))
+
+    def test_command_fills_missing_and_force_rewrites(self):
+        call_command('generate_image_variants', stdout=StringIO())
+        self.image.refresh_from_db()
+        self.assertEqual(self.variant_size('thumbnail', 'webp'), ('WEBP', (200, 200)))
+        self.assertEqual(self.variant_size('card', 'jpeg'), ('JPEG', (600, 600)))
+
+        # Corrupt variant file - --all ते तसेच ठेवतो, --force परत लिहितो
+        name = self.image.variants['thumbnail']['webp']
+        with variant_storage.open(name, 'wb') as fh:
+            fh.write(b'broken')
+        call_command('generate_image_variants', '--all', stdout=StringIO())
+        self.assertEqual(variant_storage.open(name).read(), b'broken')
+
+        call_command('generate_image_variants', '--all', '--force', stdout=StringIO())
+        self.image.refresh_from_db()
+        self.assertEqual(self.image.variants['thumbnail']['webp'], name)
+        self.assertEqual(self.variant_size('thumbnail', 'webp'), ('WEBP', (200, 200)))
+
+    # दोन jobs एकाच variant वर - दुसरा save तीच file replace करतो, `_AbC123` suffix ची orphan copy नाही
+    def test_racing_saves_share_one_file(self):
+        name = variant_name(self.image.image.name, 'thumbnail', 'webp')
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            saved = set(pool.map(lambda i: variant_storage.save(name, ContentFile(b'webp')), range(8)))
+        self.assertEqual(saved, {name})
+        self.assertEqual(variant_storage.listdir(os.path.dirname(name))[1], [os.path.basename(name)])
+
+    # Command चे pool threads प्रत्येक image नंतर आपलं DB connection बंद करतात
+    def test_command_closes_thread_connections(self):
+        with mock.patch('myapp.management.commands.generate_image_variants.generate_variants'), \
+                mock.patch('myapp.management.commands.generate_image_variants.connection') as thread_connection:
+            call_command('generate_image_variants', stdout=StringIO())
+        self.assertEqual(thread_connection.close.call_count, 1)
+
+
+# ---------------------------------------------------------------------------------------------------
+# Cart batch / upsert (myapp/cart.py) - operations fold होतात, (user, product) ची एकच row
+class CartBatchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('asha', 'asha@example.com', 'pass')
+        cls.products = [Product.objects.create(name=f'Product {i}', description='', price=Decimal('10')) for i in range(3)]
+
+    def setUp(self):
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def quantities(self):
+        return dict(Cart.objects.filter(user=self.user).values_list('product_id', 'quantity'))
+
+    def test_batch_folds_operations(self):
+        first, second, third = (product.pk for product in self.products)
+        Cart.objects.create(user=self.user, product_id=third, quantity=4)
+
+        response = self.api.post('/cart/batch/', {'operations': [
+            {'op': 'add', 'product_id': first, 'quantity': 2},
+            {'op': 'add', 'product_id': first, 'quantity': 1},
+            {'op': 'add', 'product_id': second, 'quantity': 1},
+            {'op': 'set', 'product_id': second, 'quantity': 5},
+            {'op': 'remove', 'product_id': third},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.quantities(), {first: 3, second: 5})
+        self.assertEqual(sorted(item['quantity'] for item in response.json()), [3, 5])
+
+    def test_unknown_product_changes_nothing(self):
+        response = self.api.post('/cart/batch/', {'operations': [
+            {'op': 'add', 'product_id': self.products[0].pk, 'quantity': 1},
+            {'op': 'add', 'product_id': 999999, 'quantity': 1},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json()['product_ids'], [999999])
+        self.assertEqual(self.quantities(), {})
+
+    def test_repeated_add_increments_one_row(self):
+        for _ in range(3):
+            self.api.post('/cart/', {'product_id': self.products[0].pk, 'quantity': 2}, format='json')
+        self.assertEqual(Cart.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(self.quantities(), {self.products[0].pk: 6})
+
+
+# Cart summary (myapp/cart.py) - subtotals / totals SQL मध्येच, items कितीही असले तरी 2 queries
+class CartSummaryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('asha', 'asha@example.com', 'pass')
+        for i in range(5):
+            product = Product.objects.create(name=f'Product {i}', description='', price=Decimal('2.50') * (i + 1))
+            ProductImage.objects.create(product=product, image=f'product_images/{i}.png')
+            Cart.objects.create(user=cls.user, product=product, quantity=i + 1)
+
+    def test_totals(self):
+        api = APIClient()
+        api.force_authenticate(self.user)
+        data = api.get('/cart/summary/').json()
+        self.assertEqual((data['line_count'], data['item_count'], Decimal(data['total'])), (5, 15, Decimal('137.50')))
+        self.assertEqual([Decimal(item['subtotal']) for item in data['items']], [Decimal('2.50') * (i + 1) ** 2 for i in range(5)])
+        self.assertEqual(len(data['items'][0]['product']['images']), 1)
+
+    def test_query_count_does_not_grow_with_items(self):
+        with self.assertNumQueries(2):
+            summary = CartSummarySerializer(cart_summary(self.user)).data
+        self.assertEqual(len(summary['items']), 5)
+
+        # खाली cart - prefetch query पण नाही
+        empty = User.objects.create_user('ravi')
+        with self.assertNumQueries(1):
+            self.assertEqual(cart_summary(empty)['total'], 0)
+
+
+# Cache cart store (myapp/cart_store.py, CART_STORE = 'cache') - बदल cache मध्ये, flush नंतर Cart table मध्ये
+class CacheCartStoreTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('asha', 'asha@example.com', 'pass')
+        cls.tea, cls.coffee = (Product.objects.create(name=name, description='', price=Decimal('10')) for name in ('Tea', 'Coffee'))
+
+    def setUp(self):
+        # Background flusher thread नको - tests flush_carts() स्वतः call करतात
+        self.enterContext(mock.patch('myapp.cart_store.CART_STORE', 'cache'))
+        self.enterContext(mock.patch('myapp.cart_store._start_flusher', lambda: None))
+        # LocMem cache tests मध्ये shared असतो
+        cart_store.cart_cache().delete_many([cart_store._cart_key(self.user.pk), cart_store.DIRTY_KEY])
+        update_cart(self.user, [
+            {'op': 'add', 'product_id': self.tea.pk, 'quantity': 2},
+            {'op': 'add', 'product_id': self.coffee.pk, 'quantity': 1},
+        ])
+
+    def stored(self):
+        return dict(Cart.objects.filter(user=self.user).values_list('product_id', 'quantity'))
+
+    def cached(self):
+        return {item['product']['id']: item['quantity'] for item in cart_data(self.user)}
+
+    def test_new_items_are_inserted_immediately(self):
+        self.assertEqual(self.stored(), {self.tea.pk: 2, self.coffee.pk: 1})
+        self.assertEqual(flush_carts(), 0)
+
+    def test_changes_are_written_behind(self):
+        update_cart(self.user, [
+            {'op': 'set', 'product_id': self.tea.pk, 'quantity': 5},
+            {'op': 'remove', 'product_id': self.coffee.pk},
+        ])
+        self.assertEqual(self.cached(), {self.tea.pk: 5})
+        self.assertEqual(self.stored(), {self.tea.pk: 2, self.coffee.pk: 1})
+
+        self.assertEqual(flush_carts(), 1)
+        self.assertEqual(self.stored(), {self.tea.pk: 5})
+        self.assertEqual(flush_carts(), 0)
+
+        # Cache मधला cart गेला तरी database मधून परत load
+        cart_store.cart_cache().delete(cart_store._cart_key(self.user.pk))
+        self.assertEqual(self.cached(), {self.tea.pk: 5})
+
+    # Flush आधी cart evict झाला - flushed म्हणून mark नाही; परत load झाल्यावर पुढचा flush लिहितो
+    def test_evicted_cart_stays_dirty(self):
+        update_cart(self.user, [{'op': 'set', 'product_id': self.tea.pk, 'quantity': 5}])
+        cart_store.cart_cache().delete(cart_store._cart_key(self.user.pk))
+        self.assertEqual(flush_carts(), 0)
+        self.assertIn(self.user.pk, cart_store.cart_cache().get(cart_store.DIRTY_KEY))
+
+        self.assertEqual(self.cached(), {self.tea.pk: 2, self.coffee.pk: 1})
+        self.assertEqual(flush_carts(), 1)
+        self.assertEqual(cart_store.cart_cache().get(cart_store.DIRTY_KEY), {})
+
+    def test_process_local_cache_is_rejected(self):
+        self.assertEqual([error.id for error in cart_store.check_cart_cache(None)], ['myapp.E002'])
+        with mock.patch('myapp.cart_store.CART_STORE', 'database'):
+            self.assertEqual(cart_store.check_cart_cache(None), [])
+
+    def test_locked_user_stays_dirty(self):
+        update_cart(self.user, [{'op': 'add', 'product_id': self.tea.pk, 'quantity': 1}])
+        with cart_store._user_lock(self.user.pk):
+            self.assertEqual(flush_carts(), 0)
+        self.assertEqual(self.stored()[self.tea.pk], 2)
+
+        self.assertEqual(flush_carts(), 1)
+        self.assertEqual(self.stored()[self.tea.pk], 3)
+
+    def test_checkout_reads_latest_cart(self):
+        update_cart(self.user, [{'op': 'set', 'product_id': self.coffee.pk, 'quantity': 4}])
+        with checkout_cart(self.user):
+            self.assertEqual(self.stored(), {self.tea.pk: 2, self.coffee.pk: 4})
+        self.assertIsNone(cart_store.cart_cache().get(cart_store._cart_key(self.user.pk)))
+
+
+# Cart checkout (CheckoutView) - order, items, stock reservation आणि cart delete एकाच transaction मध्ये
+class CartCheckoutTests(TestCase):
+    address = AddressBookTests.address
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('asha', 'asha@example.com', 'pass')
+        cls.products = [Product.objects.create(name=f'Product {i}', description='', price=Decimal('10') * (i + 1)) for i in range(3)]
+
+    def setUp(self):
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def fill_cart(self, count):
+        for i, product in enumerate(self.products[:count]):
+            Cart.objects.create(user=self.user, product=product, quantity=i + 1)
+
+    def checkout(self, **data):
+        return self.api.post('/checkout/', {'checkout_type': 'cart', **self.address, **data}, format='json')
+
+    def test_checkout_creates_order_and_empties_cart(self):
+        self.fill_cart(3)
+        set_stock(self.products[0].pk, 5, shards=4)
+
+        self.assertEqual(self.checkout().status_code, 201)
+        order = Order.objects.get(user=self.user)
+        self.assertEqual(order.total_price, Decimal('140'))
+        self.assertEqual(sorted(order.items.values_list('quantity', 'price')), [(1, Decimal('10')), (2, Decimal('20')), (3, Decimal('30'))])
+        self.assertEqual(order.address.city, 'Pune')
+        self.assertFalse(Cart.objects.filter(user=self.user).exists())
+        self.assertEqual(stock_levels([self.products[0].pk])[self.products[0].pk], {'available': 4, 'reserved': 1})
+
+    def test_out_of_stock_rolls_back_everything(self):
+        self.fill_cart(2)
+        set_stock(self.products[1].pk, 1, shards=4)
+
+        response = self.checkout()
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['product_ids'], [self.products[1].pk])
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(OrderItem.objects.exists())
+        self.assertFalse(StockReservation.objects.exists())
+        self.assertEqual(Cart.objects.filter(user=self.user).count(), 2)
+
+    def test_invalid_address_keeps_cart(self):
+        self.fill_cart(1)
+        self.assertEqual(self.checkout(pincode='').status_code, 400)
+        self.assertEqual(self.checkout(address_id=999999).status_code, 400)
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(Cart.objects.filter(user=self.user).count(), 1)
+
+    def test_empty_cart(self):
+        self.assertEqual(self.checkout().status_code, 400)
+
+    def test_buy_now_total_covers_quantity(self):
+        response = self.api.post('/checkout/', {
+            'checkout_type': 'buy_now', 'products': [{'product_id': self.products[1].pk, 'quantity': 3}], **self.address,
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        order = Order.objects.get(user=self.user)
+        self.assertEqual(order.total_price, Decimal('60'))
+        self.assertEqual(order.total_price, sum(item.price * item.quantity for item in order.items.all()))
+
+    # Buy now - product, address, order, item, stock shards (+ savepoint) - RollupDirtyDay / order touch नाही
+    def test_buy_now_queries(self):
+        address_id = save_address(self.user, self.address)[0].pk
+        with self.assertNumQueries(7):
+            response = self.api.post('/checkout/', {
+                'checkout_type': 'buy_now', 'products': [{'product_id': self.products[1].pk, 'quantity': 1}], 'address_id': address_id,
+            }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(RollupDirtyDay.objects.exists())
+
+    def test_queries_do_not_grow_with_cart_size(self):
+        address_id = save_address(self.user, self.address)[0].pk
+        self.fill_cart(1)
+        with CaptureQueriesContext(connection) as small:
+            self.checkout(address_id=address_id)
+        self.fill_cart(3)
+        with CaptureQueriesContext(connection) as large:
+            self.checkout(address_id=address_id)
+        self.assertEqual(len(small), len(large))
+
+
+# Idempotency-Key (myapp/idempotency.py) - retry ला replay, वेगळी body 422, चालू request वर दुसरा थांबतो / 409
+class IdempotencyTests(TestCase):
+    contact = {'name': 'Asha', 'email': 'asha@example.com', 'subject': 'Hi', 'message': 'Hello'}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('asha', 'asha@example.com', 'pass')
+        cls.product = Product.objects.create(name='Tea', description='', price=Decimal('10'))
+
+    def setUp(self):
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+        self.key = uuid.uuid4().hex
+
+    def add(self, quantity=1, api=None):
+        return (api or self.api).post(
+            '/cart/', {'product_id': self.product.pk, 'quantity': quantity}, format='json', HTTP_IDEMPOTENCY_KEY=self.key,
+        )
+
+    def quantity(self):
+        return Cart.objects.get(user=self.user, product=self.product).quantity
+
+    def test_retry_is_replayed(self):
+        first, retry = self.add(2), self.add(2)
+        self.assertEqual((first.status_code, retry.status_code), (200, 200))
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(self.quantity(), 2)
+
+    def test_key_reused_with_different_body(self):
+        self.add(2)
+        self.assertEqual(self.add(3).status_code, 422)
+        self.assertEqual(self.quantity(), 2)
+
+    def test_anonymous_callers_do_not_share_keys(self):
+        def submit(ip):
+            return self.client.post('/contact/', self.contact, content_type='application/json', HTTP_IDEMPOTENCY_KEY=self.key, REMOTE_ADDR=ip)
+
+        self.assertEqual([submit(ip).status_code for ip in ('10.0.0.1', '10.0.0.2')], [201, 201])
+        self.assertTrue(submit('10.0.0.1').has_header('Idempotent-Replayed'))
+        self.assertEqual(Contact.objects.count(), 2)
+
+    # Proxy मागे सगळ्यांचा REMOTE_ADDR एकच - proxy ने लिहिलेला शेवटचा X-Forwarded-For IP scope ठरवतो,
+    # client ने स्वतः टाकलेले डावीकडचे entries नाहीत
+    @mock.patch('myapp.idempotency.IDEMPOTENCY_TRUSTED_PROXIES', 1)
+    def test_anonymous_scope_behind_proxy(self):
+        def submit(forwarded):
+            return self.client.post(
+                '/contact/', self.contact, content_type='application/json', HTTP_IDEMPOTENCY_KEY=self.key,
+                REMOTE_ADDR='10.0.0.254', HTTP_X_FORWARDED_FOR=forwarded,
+            )
+
+        self.assertEqual([submit(ip).status_code for ip in ('203.0.113.1', '203.0.113.2')], [201, 201])
+        self.assertTrue(submit('198.51.100.7, 203.0.113.1').has_header('Idempotent-Replayed'))
+        self.assertEqual(Contact.objects.count(), 2)
+
+    @mock.patch('myapp.idempotency.IDEMPOTENCY_LOCK_WAIT', 0.05)
+    def test_concurrent_request_gets_conflict(self):
+        # पहिला request चालू असतानाच तोच key घेऊन दुसरा request येतो
+        inner = []
+
+        def add_while_running(user, operations):
+            inner.append(self.add(api=self.api))
+            apply_cart_operations(user, operations)
+
+        with mock.patch('myapp.views.update_cart', side_effect=add_while_running):
+            self.assertEqual(self.add().status_code, 200)
+        self.assertEqual(inner[0].status_code, 409)
+        self.assertEqual(self.quantity(), 1)
+        self.assertEqual(self.add()['Idempotent-Replayed'], 'true')
+
+    def test_waiting_request_replays_first_response(self):
+        cache = caches[idempotency.IDEMPOTENCY_CACHE_ALIAS]
+        request = SimpleNamespace(user=self.user, method='POST', path='/cart/', META={})
+        cache_key = idempotency._cache_key(request, self.key)
+        body = json.dumps({'product_id': self.product.pk, 'quantity': 1}).encode()
+
+        # दुसऱ्या worker मधला पहिला request lock धरून आहे आणि थोड्या वेळाने response store करतो
+        cache.add(f'{cache_key}:lock', 'other-worker', 60)
+
+        def finish_first():
+            cache.set(cache_key, {'fingerprint': hashlib.sha256(body).hexdigest(), 'status': 200, 'data': {'message': 'first'}})
+            cache.delete(f'{cache_key}:lock')
+
+        with mock.patch('myapp.cache.time.sleep', side_effect=lambda _: finish_first()):
+            response = self.api.post('/cart/', body, content_type='application/json', HTTP_IDEMPOTENCY_KEY=self.key)
+        self.assertEqual(response.json(), {'message': 'first'})
+        self.assertFalse(Cart.objects.exists())
+
+    def test_process_local_cache_is_rejected(self):
+        with mock.patch('myapp.idempotency.IDEMPOTENCY_CACHE_ALIAS', 'default'):
+            self.assertEqual([error.id for error in idempotency.check_idempotency_cache(None)], ['myapp.E001'])
+        self.assertEqual(idempotency.check_idempotency_cache(None), [])
+
+
+# Migration 0033 - unique constraint लावण्याआधी duplicate cart rows एकत्र (quantity बेरीज, सर्वात जुनी row)
+class CartDuplicateMergeMigrationTests(TransactionTestCase):
+    migrate_from = [('myapp', '0032_filedeletion')]
+    migrate_to = [('myapp', '0033_cart_unique_user_product')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+        super().tearDown()
+
+    def test_duplicates_are_merged(self):
+        apps = self.migrate(self.migrate_from)
+        user = apps.get_model('auth', 'User').objects.create(username='asha')
+        other = apps.get_model('auth', 'User').objects.create(username='ravi')
+        product = apps.get_model('myapp', 'Product').objects.create(name='Tea', description='', price=Decimal('10'))
+        HistoricalCart = apps.get_model('myapp', 'Cart')
+        keep = HistoricalCart.objects.create(user=user, product=product, quantity=2)
+        HistoricalCart.objects.create(user=user, product=product, quantity=3)
+        HistoricalCart.objects.create(user=user, product=product, quantity=1)
+        single = HistoricalCart.objects.create(user=other, product=product, quantity=7)
+
+        apps = self.migrate(self.migrate_to)
+        rows = apps.get_model('myapp', 'Cart').objects.order_by('id').values_list('id', 'quantity')
+        self.assertEqual(list(rows), [(keep.pk, 6), (single.pk, 7)])
+
+
+# ---------------------------------------------------------------------------------------------------
+# Product search (myapp/search.py) - ranking, save / delete वर index sync, bulk update नंतर rebuild
+class ProductSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.tea = Product.objects.create(name='Assam tea', description='Strong tea, tea lovers favourite', price=Decimal('10'))
+        cls.mug = Product.objects.create(name='Mug', description='Good for tea', price=Decimal('5'))
+        Product.objects.create(name='Honey', description='Raw forest honey', price=Decimal('7'))
+
+    def search(self, term):
+        return [product.pk for product in search_products(Product.objects.all(), term)]
+
+    def test_ranked_matches(self):
+        self.assertEqual(self.search('tea'), [self.tea.pk, self.mug.pk])
+        self.assertEqual(self.search('"unknown'), [])
+
+        response = self.client.get('/product/search/', {'q': 'honey'})
+        self.assertEqual([product['name'] for product in response.json()['results']], ['Honey'])
+        self.assertEqual(self.client.get('/product/search/').status_code, 400)
+
+    def test_index_follows_writes(self):
+        self.mug.name = 'Coffee mug'
+        self.mug.description = ''
+        self.mug.save()
+        self.assertEqual(self.search('tea'), [self.tea.pk])
+        self.assertEqual(self.search('coffee'), [self.mug.pk])
+
+        self.tea.delete()
+        self.assertEqual(self.search('tea'), [])
+
+        # QuerySet.update() signals पाठवत नाही - rebuild नंतरच index मध्ये
+        Product.objects.filter(pk=self.mug.pk).update(name='Green tea mug')
+        rebuild_search_index()
+        self.assertEqual(self.search('green'), [self.mug.pk])
+
+
+# ---------------------------------------------------------------------------------------------------
+# OrderKeysetPagination (myapp/pagination.py) - same created_at असलेले orders पण pages मध्ये चुकत / repeat होत नाहीत
+class OrderKeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('asha', 'asha@example.com', 'pass')
+        Order.objects.bulk_create(Order(user=cls.user, total_price=Decimal('1')) for _ in range(7))
+        Order.objects.filter(user=cls.user).update(created_at=timezone.now())
+
+    def page(self, url):
+        paginator = OrderKeysetPagination()
+        request = Request(APIRequestFactory().get(url))
+        ids = list(paginator.paginate_queryset(Order.objects.all(), request).values_list('id', flat=True))
+        return ids, paginator.get_next_link(), paginator.get_previous_link()
+
+    def test_walks_all_orders_in_both_directions(self):
+        expected = list(Order.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        seen, url, pages = [], '/my-orders/?page_size=3', []
+        while url:
+            ids, url, previous = self.page(url)
+            seen += ids
+            pages.append((ids, previous))
+        self.assertEqual(seen, expected)
+
+        ids, _, _ = self.page(pages[-1][1])
+        self.assertEqual(ids, pages[-2][0])
+
+
+# ---------------------------------------------------------------------------------------------------
+# Admin orders list (AdminOrderListView) - filters, params नसतानाही keyset page, approximate count
+class AdminOrderListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [User.objects.create_user(name) for name in ('asha', 'ravi')]
+        cls.start = timezone.now() - timedelta(days=30)
+        for i in range(25):
+            order = Order.objects.create(user=cls.users[i % 2], total_price=Decimal(10 * (i + 1)))
+            Order.objects.filter(pk=order.pk).update(created_at=cls.start + timedelta(days=i))
+
+    def setUp(self):
+        self.api = admin_client()
+
+    def assertFiltered(self, query, **filters):
+        response = self.api.get(f'/api/admin/orders/?page_size=100{query}')
+        self.assertEqual(response.status_code, 200)
+        expected = Order.objects.filter(**filters).order_by('-created_at', '-id').values_list('id', flat=True)
+        self.assertEqual([order['id'] for order in response.json()['results']], list(expected))
+
+    def test_paginated_by_default(self):
+        first = self.api.get('/api/admin/orders/').json()
+        self.assertEqual(len(first['results']), 20)
+        self.assertNotIn('approximate_count', first)
+        rest = self.api.get(first['next']).json()
+        self.assertEqual(len(rest['results']), 5)
+        self.assertIsNone(rest['next'])
+
+    def test_filters(self):
+        self.assertFiltered(f'&user={self.users[1].pk}', user=self.users[1])
+        self.assertFiltered('&min_total=50&max_total=120', total_price__gte=50, total_price__lte=120)
+        after, before = (self.start + timedelta(days=days) for days in (3, 9))
+        self.assertFiltered(
+            f'&created_after={after.isoformat()}&created_before={before.isoformat()}'.replace('+', '%2B'),
+            created_at__gte=after, created_at__lt=before,
+        )
+        self.assertEqual(self.api.get('/api/admin/orders/?min_total=abc').status_code, 400)
+
+    def test_approximate_count(self):
+        data = self.api.get(f'/api/admin/orders/?count=approximate&user={self.users[0].pk}').json()
+        self.assertEqual(data['approximate_count'], 13)
+
+        # Planner estimate नसलेल्या database वर count cap पर्यंतच
+        with mock.patch('myapp.pagination.APPROXIMATE_COUNT_CAP', 10):
+            self.assertEqual(approximate_count(Order.objects.all()), 10)
+        self.assertEqual(approximate_count(Order.objects.filter(total_price__gt=200)), 5)
+
+
+# ---------------------------------------------------------------------------------------------------
+# Daily sales rollups (myapp/rollups.py) - totals orders सारखेच, cancel झालेला order पुढच्या refresh मध्ये निघतो
+class SalesRollupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('asha', 'asha@example.com', 'pass')
+        cls.product = Product.objects.create(name='Tea', description='', price=Decimal('100'))
+        address = Address.objects.create(
+            user=cls.user, full_name='Asha', phone='1', address='MG Road', city=' pune ', state='MH', pincode='411001',
+        )
+        for quantity in (1, 2, 3):
+            order = Order.objects.create(user=cls.user, address=address, total_price=Decimal('100') * quantity)
+            OrderItem.objects.create(order=order, product=cls.product, quantity=quantity, price=Decimal('100'))
+
+    def test_refresh_and_cancel(self):
+        today = timezone.localdate()
+        self.assertEqual(refresh_rollups(), 1)
+        summary = sales_summary(today, today)
+        self.assertEqual(summary['totals'], {'orders': 3, 'units': 6, 'revenue': Decimal('600')})
+        self.assertEqual([(row['city'], row['orders']) for row in summary['cities']], [('Pune', 3)])
+
+        Order.objects.filter(total_price=Decimal('300')).delete()
+        refresh_rollups()
+        self.assertEqual(DailySales.objects.get(day=today).revenue, Decimal('300'))
+
+    # Orders watermark च्या खूप आधी बदललेले - फक्त dirty days मुळेच परत मोजले जातात
+    def settle(self):
+        refresh_rollups()
+        Order.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+
+    def units(self, day=None):
+        return DailySales.objects.get(day=day or timezone.localdate()).units
+
+    def test_item_changes_and_product_delete(self):
+        self.settle()
+        item = OrderItem.objects.get(quantity=1)
+        item.quantity = 4
+        item.save()
+        refresh_rollups()
+        self.assertEqual(self.units(), 9)
+
+        coffee = Product.objects.create(name='Coffee', description='', price=Decimal('50'))
+        OrderItem.objects.create(order=item.order, product=coffee, quantity=2, price=Decimal('50'))
+        self.settle()
+        self.assertEqual(self.units(), 11)
+        self.assertEqual(DailyProductSales.objects.filter(day=timezone.localdate()).count(), 2)
+
+        # Cascade ने items गेले - त्यांचा दिवस पण परत मोजला जातो
+        coffee.delete()
+        refresh_rollups()
+        self.assertEqual(self.units(), 9)
+
+        OrderItem.objects.get(quantity=4).delete()
+        refresh_rollups()
+        self.assertEqual(self.units(), 5)
+
+    def test_moved_order_refreshes_old_day(self):
+        self.settle()
+        order = Order.objects.get(total_price=Decimal('300'))
+        order.created_at -= timedelta(days=2)
+        order.save()
+        refresh_rollups()
+        self.assertEqual(DailySales.objects.get(day=timezone.localdate()).orders, 2)
+        self.assertEqual(self.units(timezone.localdate(order.created_at)), 3)
+
+    def test_one_refresh_at_a_time(self):
+        with _refresh_lock():
+            with self.assertRaises(RollupRefreshRunning):
+                refresh_rollups()
+            with self.assertRaises(CommandError):
+                call_command('refresh_rollups', stdout=StringIO())
+        self.assertEqual(refresh_rollups(), 1)
+
+        # Crash झालेल्या refresh चा lease संपल्यावरच पुढचा refresh
+        lease = RollupWatermark.objects.filter(name=ROLLUP_LOCK)
+        lease.update(value=timezone.now() + timedelta(minutes=5))
+        with self.assertRaises(RollupRefreshRunning):
+            refresh_rollups()
+        lease.update(value=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(refresh_rollups(), 1)
+
+
+# ---------------------------------------------------------------------------------------------------
+# NumPy sales report (myapp/analytics.py) - छोट्या data वर हाताने मोजलेल्या values शी तुलना
+@skipUnless(analytics_available(), 'numpy is not installed')
+class SalesReportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.product = Product.objects.create(name='Tea', description='', price=Decimal('100'))
+        asha = User.objects.create_user('asha', 'asha@example.com', 'pass')
+        ravi = User.objects.create_user('ravi', 'ravi@example.com', 'pass')
+        # Price जितका कमी तितके जास्त units: (user, महिना, price, quantity)
+        rows = ((asha, 1, '100', 1), (asha, 2, '50', 4), (ravi, 2, '25', 16))
+        for user, month, price, quantity in rows:
+            order = Order.objects.create(user=user, total_price=Decimal(price) * quantity)
+            OrderItem.objects.create(order=order, product=cls.product, quantity=quantity, price=Decimal(price))
+            Order.objects.filter(pk=order.pk).update(created_at=datetime(2024, month, 10, tzinfo=dt_timezone.utc))
+
+    def test_metrics(self):
+        report = sales_report()
+        self.assertEqual(report['line_items'], 3)
+        self.assertEqual(report['revenue_percentiles']['total'], 700)
+        self.assertEqual(report['revenue_percentiles']['percentiles']['p50'], 200)
+        self.assertEqual(report['basket_sizes']['distribution']['4'], 1)
+        self.assertEqual(report['basket_sizes']['median_units'], 4)
+        self.assertEqual(report['price_elasticity'], [{'product_id': self.product.pk, 'elasticity': -2.0, 'price_points': 3, 'units': 21}])
+        self.assertEqual(report['cohort_retention'], [
+            {'cohort': '2024-01', 'users': 1, 'retention': [1.0, 1.0]},
+            {'cohort': '2024-02', 'users': 1, 'retention': [1.0]},
+        ])
+
+    def test_zero_quantity_lines_skip_elasticity(self):
+        # quantity 0 -> log(0) = -inf; तो point fit मधून वगळला पाहिजे (NaN elasticity नको)
+        order = Order.objects.create(user=User.objects.get(username='asha'), total_price=0)
+        OrderItem.objects.create(order=order, product=self.product, quantity=0, price=Decimal('10'))
+        report = sales_report(metrics=('price_elasticity',))
+        self.assertEqual(report['price_elasticity'], [{'product_id': self.product.pk, 'elasticity': -2.0, 'price_points': 3, 'units': 21}])
+
+    def test_date_range(self):
+        report = sales_report(start=datetime(2024, 2, 1).date(), metrics=('basket_sizes',))
+        self.assertEqual(report['line_items'], 2)
+        self.assertNotIn('cohort_retention', report)
+
+    # float64 मधून गेले तर 2**53 नंतरचे ids बदलतात
+    def test_large_ids_stay_exact(self):
+        product = Product.objects.create(pk=2 ** 53 + 1, name='Coffee', description='', price=Decimal('10'))
+        order = Order.objects.create(pk=2 ** 53 + 3, user=User.objects.get(username='ravi'), total_price=Decimal('10'))
+        OrderItem.objects.create(order=order, product=product, quantity=1, price=Decimal('10'))
+        items = load_line_items()
+        self.assertEqual(items['product_id'].dtype.name, 'int64')
+        self.assertIn(2 ** 53 + 1, items['product_id'].tolist())
+        self.assertIn(2 ** 53 + 3, items['order_id'].tolist())
+
+    # DEBUG = False (tests / production) - --i-know शिवाय database मध्ये काहीच seed होत नाही
+    def test_bench_refuses_without_debug(self):
+        with self.assertRaisesMessage(CommandError, '--i-know'):
+            call_command('bench_analytics', '--items', '10', stdout=StringIO())
+        self.assertEqual(Product.objects.count(), 1)
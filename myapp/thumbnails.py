@@ -0,0 +1,55 @@
+from io import BytesIO
+
+from PIL import Image, ImageOps
+
+# ---------------------------------------------------------------------------------------------------
+# Product Image variants render करण्यासाठी pure Pillow code
+# ✅ हा module Django import करत नाही - variants.py मधला process pool ह्यालाच worker process मध्ये चालवतो
+
+# variant name -> (size, crop)
+# crop=True म्हणजे grid साठी fixed size box (center crop), False म्हणजे aspect ratio ठेवून box मध्ये बसवणे
+VARIANT_SIZES = {
+    'thumbnail': ((200, 200), True),
+    'card': ((600, 600), True),
+    'full': ((1600, 1600), False),
+}
+
+# format -> (file extension, Pillow format, save options)
+VARIANT_FORMATS = {
+    'webp': ('webp', 'WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('jpg', 'JPEG', {'quality': 85, 'optimize': True, 'progressive': True}),
+}
+
+
+def _has_alpha(image):
+    return image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+
+
+# JPEG ला transparency चालत नाही, म्हणून white background वर paste करतो
+def _flatten(image):
+    background = Image.new('RGB', image.size, (255, 255, 255))
+    background.paste(image, mask=image.getchannel('A'))
+    return background
+
+
+# Original image bytes -> {(variant, format): encoded bytes}
+def render_variants(data):
+    with Image.open(BytesIO(data)) as source:
+        source = ImageOps.exif_transpose(source)
+        source = source.convert('RGBA' if _has_alpha(source) else 'RGB')
+
+    results = {}
+    for variant, (size, crop) in VARIANT_SIZES.items():
+        if crop:
+            resized = ImageOps.fit(source, size, Image.Resampling.LANCZOS)
+        else:
+            resized = source.copy()
+            resized.thumbnail(size, Image.Resampling.LANCZOS)
+
+        for fmt, (_, pil_format, options) in VARIANT_FORMATS.items():
+            frame = _flatten(resized) if pil_format == 'JPEG' and resized.mode == 'RGBA' else resized
+            buffer = BytesIO()
+            frame.save(buffer, pil_format, **options)
+            results[(variant, fmt)] = buffer.getvalue()
+
+    return results
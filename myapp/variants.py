@@ -0,0 +1,135 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .cache import bump_catalog_version
+from .models import ProductImage
+from .storage import variant_storage
+from .thumbnails import VARIANT_FORMATS, VARIANT_SIZES, render_variants
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------------------------------
+# Product Image variants (thumbnail / card / full × webp / jpeg) pipeline
+# ✅ Upload request फक्त job schedule करतो, resize चं CPU काम process pool मध्ये request च्या बाहेर होतं
+# ✅ Dispatcher thread original file वाचतो, pool कडून variants घेतो, storage मध्ये save करून row update करतो
+# ✅ Variant files ची नावं ठरलेली (variant_name) आणि variant_storage overwrite करतो - दोन jobs एकाच image वर
+#    चालले तरी suffix लागलेल्या orphan files बनत नाहीत
+# Jobs फक्त web worker process च्या memory मध्ये असतात - restart / crash झाला तर pending jobs हरवतात.
+# अशा images चे variants {} राहतात; `manage.py generate_image_variants` (deploy नंतर / cron) ते परत बनवतो
+
+VARIANTS_DIR = 'product_images/variants/'
+IMAGE_VARIANT_WORKERS = getattr(settings, 'IMAGE_VARIANT_WORKERS', 2)
+
+_lock = threading.Lock()
+_process_pool = None
+_dispatcher = None
+
+
+# Pools lazily बनतात (प्रत्येक web worker process मध्ये एकदाच)
+# ✅ 'spawn' वापरतो - threads असलेल्या process मधून fork करणं सुरक्षित नाही
+def _pools():
+    global _process_pool, _dispatcher
+    with _lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=IMAGE_VARIANT_WORKERS, mp_context=multiprocessing.get_context('spawn'),
+            )
+        if _dispatcher is None:
+            _dispatcher = ThreadPoolExecutor(max_workers=IMAGE_VARIANT_WORKERS, thread_name_prefix='image-variants')
+    return _process_pool, _dispatcher
+
+
+def _reset_process_pool(broken):
+    global _process_pool
+    with _lock:
+        if _process_pool is broken:
+            _process_pool = None
+    broken.shutdown(wait=False)
+
+
+# 'product_images/shoe.png' -> 'product_images/variants/shoe_png_thumbnail.webp'
+# ✅ Original चं extension पण नावात ठेवतो, नाहीतर shoe.png आणि shoe.jpg चे variants एकच होतील
+def variant_name(original_name, variant, fmt):
+    stem = os.path.basename(original_name).replace('.', '_')
+    extension = VARIANT_FORMATS[fmt][0]
+    return f'{VARIANTS_DIR}{stem}_{variant}.{extension}'
+
+
+# Original साठी होऊ शकणारे सर्व variant names (delete / cleanup साठी)
+def all_variant_names(original_name):
+    return [variant_name(original_name, variant, fmt) for variant in VARIANT_SIZES for fmt in VARIANT_FORMATS]
+
+
+# Row मधल्या variants JSON वरून URLs (request असेल तर ImageField सारखेच absolute URLs)
+def variant_urls(variants, request=None):
+    urls = {}
+    for variant, formats in variants.items():
+        urls[variant] = {}
+        for fmt, name in formats.items():
+            url = variant_storage.url(name)
+            urls[variant][fmt] = request.build_absolute_uri(url) if request is not None else url
+    return urls
+
+
+# एका ProductImage चे variants बनवून save करतो (dispatcher thread मध्ये किंवा command मधून direct)
+# ✅ force=True असेल तर storage मधल्या आधीच्या variant files (stale / corrupt) atomic overwrite होतात
+def generate_variants(image_id, force=False):
+    try:
+        image = ProductImage.objects.get(pk=image_id)
+    except ProductImage.DoesNotExist:
+        return None
+
+    name = image.image.name
+    with image.image.storage.open(name, 'rb') as fh:
+        data = fh.read()
+
+    process_pool, _ = _pools()
+    try:
+        rendered = process_pool.submit(render_variants, data).result()
+    except BrokenProcessPool:
+        # Worker process crash झाला (उदा. OOM) तर पुढच्या jobs साठी नवीन pool बनेल
+        _reset_process_pool(process_pool)
+        raise
+
+    variants = {}
+    for (variant, fmt), content in rendered.items():
+        target = variant_name(name, variant, fmt)
+        if force or not variant_storage.exists(target):
+            variant_storage.save(target, ContentFile(content))
+        variants.setdefault(variant, {})[fmt] = target
+
+    # update() signals पाठवत नाही, म्हणून catalog cache स्वतः invalidate करतो
+    ProductImage.objects.filter(pk=image_id).update(variants=variants, updated_at=timezone.now())
+    bump_catalog_version()
+    return variants
+
+
+def _run_job(image_id):
+    try:
+        generate_variants(image_id)
+    except Exception:
+        logger.exception('Variant generation failed for ProductImage %s', image_id)
+    finally:
+        # Dispatcher thread चे स्वतःचे DB connections असतात, job नंतर बंद करतो
+        connections.close_all()
+
+
+# Transaction commit झाल्यानंतर images साठी background variant jobs schedule करतो
+def schedule_variants(image_ids):
+    image_ids = list(image_ids)
+
+    def dispatch():
+        _, dispatcher = _pools()
+        for image_id in image_ids:
+            dispatcher.submit(_run_job, image_id)
+
+    transaction.on_commit(dispatch)
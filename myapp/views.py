@@ -1,4 +1,6 @@
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
@@ -9,14 +11,88 @@ from myapp.authentication import AdminJWTAuthentication
 from django.contrib.auth.models import User
 from django.contrib.auth.hashers import make_password
 from datetime import datetime, timedelta
+from functools import partial
 import jwt
 from django.conf import settings
-from .models import Cart, Contact, Order, OrderItem, Product , ProductImage
+from django.db import connection, transaction
+from django.db.models import DecimalField, F, Sum
+from .models import Address, Cart, Contact, Order, OrderItem, Product , ProductImage
+from .addresses import save_address
+from .analytics import available as analytics_available, cached_sales_report
+from .cache import bump_catalog_version, cached_catalog_response
+from .cart import cart_summary
+from .cart_store import cart_data, cart_product_id, checkout_cart, sync_cart, update_cart
+from .fast_serializers import product_values, serialize_orders, serialize_products
+from .exports import (
+    ORDER_CSV_HEADER, PRODUCT_CSV_HEADER, IgnoreClientContentNegotiation, export_response, order_csv_rows,
+    order_records, product_csv_rows, product_records,
+)
+from .conditional import build_validators, catalog_state, conditional_get, mark_deleted, product_state, queryset_state
+from .idempotency import idempotent
+from .inventory import OutOfStock, mark_order_paid, reserve_stock, set_stock, stock_levels
+from .media import enqueue_file_deletions, save_image_files, validate_images
+from .pagination import AdminOrderKeysetPagination, OrderKeysetPagination, ProductCursorPagination, ProductSearchPagination
+from .rollups import sales_summary
+from .search import search_products
+from .variants import schedule_variants
 from .serializers import (
-    AddressSerializer, AdminLoginSerializer, ContactSerializer, OrderSerializer, ProductSerializer,
-    CartSerializer,
+    AddressBookSerializer, AddressSerializer, AdminLoginSerializer, AdminOrderFilterSerializer, CartBatchSerializer, CartSummarySerializer, ContactSerializer, OrderSerializer, ProductSerializer,
+    CartSerializer, SalesAnalyticsQuerySerializer, SalesReportQuerySerializer, SalesSummarySerializer, renders, requested_fields,
 )
 
+# Order list serialize करतो - फक्त output मध्ये येणारे relations prefetch होतात (`?fields=` / `?expand=`)
+# ✅ `?fields=` / `?expand=` नसतील तर fast-path serializer (myapp/fast_serializers.py)
+def _serialize_orders(request, orders):
+    spec = requested_fields(request)
+    if not spec:
+        return serialize_orders(orders)
+    probe = OrderSerializer(**spec)
+    orders = orders.with_details(items=renders(probe, 'items'), images=renders(probe, 'items.product_images'))
+    return OrderSerializer(orders, many=True, **spec).data
+
+
+# Orders list response (user आणि admin) - user ला `?cursor=` / `?page_size=` असतील तर keyset page, admin ला नेहमी
+# ✅ Page कितीही मोठा असला तरी queries तेवढ्याच; validators फक्त page च्या rows वरून (पूर्ण table वर count(*) नाही)
+def _order_list_response(request, orders, view, scope=None, pagination_class=OrderKeysetPagination):
+    paginator = pagination_class()
+    page = paginator.paginate_queryset(orders, request, view)
+    if page is None:
+        # Orders मध्ये product name / images पण येतात, म्हणून catalog state पण validators मध्ये घेतो
+        validators = build_validators(request, queryset_state(orders), *catalog_state(), scope=scope)
+        return conditional_get(request, validators, lambda: Response(_serialize_orders(request, orders)))
+
+    # Next link / approximate count बदलले तरी ETag बदलायला हवा
+    validators = build_validators(
+        request, queryset_state(page), *catalog_state(), scope=scope,
+        extra=(paginator.get_next_link(), paginator.approximate_count),
+    )
+    return conditional_get(
+        request, validators, lambda: paginator.get_paginated_response(_serialize_orders(request, page)),
+    )
+
+
+# Checkout साठी address -> (address, error response)
+# ✅ `address_id` असेल तर user च्या address book मधला, नाहीतर fields validate करून book मधली जुळणारी row / नवीन row
+def _checkout_address(request, user):
+    address_id = request.data.get('address_id')
+    if address_id not in (None, ''):
+        try:
+            return Address.objects.get(id=int(address_id), user=user), None
+        except (TypeError, ValueError, Address.DoesNotExist):
+            return None, Response({'error': 'Address not found!'}, status=status.HTTP_400_BAD_REQUEST)
+
+    serializer = AddressSerializer(data=request.data)
+    if not serializer.is_valid():
+        return None, Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    address, _ = save_address(user, serializer.validated_data)
+    return address, None
+
+
+# Stock कमी पडलेल्या products सह 409
+def _out_of_stock(exc):
+    return Response({'error': 'Out of stock!', 'product_ids': exc.product_ids}, status=status.HTTP_409_CONFLICT)
+# ---------------------------------------------------------------------------------------------------
+
 # Admin साठी Login API
 class AdminLoginView(APIView):
     def post(self, request):
@@ -99,9 +175,74 @@ class LoginUser(APIView):
 # ---------------------------------------------------------------------------------------------------
 
 # सर्व Product साठी ViewSet (Public)
+# ✅ images एका query मध्ये prefetch होतात (प्रत्येक product साठी वेगळी query नाही)
+# ✅ list नेहमी cursor pagination ने येते (default 20 products, `?page_size=` / `?cursor=`)
+# ✅ list / retrieve चे responses catalog version नुसार cache होतात (myapp/cache.py)
+# ✅ ETag / Last-Modified जुळले तर 304 (myapp/conditional.py)
+# ✅ `?fields=` / `?expand=` ने output कमी करता येतो
 class ProductViewSet(viewsets.ModelViewSet):
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
+    pagination_class = ProductCursorPagination
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.update(requested_fields(self.request))
+        return super().get_serializer(*args, **kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if renders(self.get_serializer(), 'images'):
+            queryset = queryset.prefetch_related('images')
+        return queryset
+
+    # `?fields=` / `?expand=` नसतील तर DRF serializer ऐवजी `.values()` वर चालणारा fast path
+    def _paginated_products(self, queryset):
+        if requested_fields(self.request):
+            page = self.paginate_queryset(queryset)
+            data = self.get_serializer(queryset if page is None else page, many=True).data
+        else:
+            rows = product_values(queryset)
+            page = self.paginate_queryset(rows)
+            data = serialize_products(rows if page is None else page, self.request)
+
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def list(self, request, *args, **kwargs):
+        validators = build_validators(request, *catalog_state())
+        build = partial(
+            cached_catalog_response, request,
+            lambda: self._paginated_products(self.filter_queryset(self.get_queryset())),
+        )
+        return conditional_get(request, validators, build)
+
+    def retrieve(self, request, *args, **kwargs):
+        build = partial(cached_catalog_response, request, partial(super().retrieve, request, *args, **kwargs))
+        try:
+            product_id = int(kwargs['pk'])
+        except ValueError:
+            return build()
+
+        validators = build_validators(request, *product_state(product_id))
+        return conditional_get(request, validators, build)
+
+    # Product name / description मध्ये full-text search (GET /product/search/?q=...)
+    @action(detail=False, methods=['get'], pagination_class=ProductSearchPagination)
+    def search(self, request):
+        term = request.query_params.get('q', '').strip()
+        if not term:
+            return Response({'error': 'Search query (q) is required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        return self._paginated_products(search_products(self.get_queryset(), term))
+# ---------------------------------------------------------------------------------------------------
+
+# सर्व Products streaming export (NDJSON / CSV) करण्याची API (Public)
+class ProductExportView(APIView):
+    content_negotiation_class = IgnoreClientContentNegotiation
+
+    def get(self, request):
+        return export_response(request, 'products', product_records(request), PRODUCT_CSV_HEADER, product_csv_rows)
 # ---------------------------------------------------------------------------------------------------
 
 # Product साठी Multiple Images Upload करण्याची API
@@ -118,8 +259,32 @@ class ProductImageUploadView(APIView):
         if not images:
             return Response({'error': 'No images provided'}, status=status.HTTP_400_BAD_REQUEST)
 
-        for img in images:
-            ProductImage.objects.create(product=product_instance, image=img)
+        # सर्व images आधी parallel मध्ये decode + validate - एकही invalid असेल तर काहीच save होत नाही
+        errors = validate_images(images)
+        if errors:
+            return Response({'error': 'Invalid images', 'images': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        names = save_image_files(images)
+        try:
+            with transaction.atomic():
+                created = ProductImage.objects.bulk_create(
+                    [ProductImage(product=product_instance, image=name) for name in names]
+                )
+                # MySQL bulk insert नंतर ids देत नाही - नावांवरून परत घेतो
+                image_ids = [image.pk for image in created]
+                if None in image_ids:
+                    image_ids = list(
+                        ProductImage.objects.filter(product=product_instance, image__in=names).values_list('id', flat=True)
+                    )
+                # bulk_create signals पाठवत नाही, म्हणून catalog cache स्वतः invalidate करतो
+                transaction.on_commit(bump_catalog_version)
+
+                # Thumbnail / card / full variants background मध्ये बनतात
+                schedule_variants(image_ids)
+        except Exception:
+            # Rows rollback झाले - files queue मधून (दुसरा upload तीच file वापरत नसेल तर) grace नंतर निघतात
+            enqueue_file_deletions(names)
+            raise
 
         return Response({'message': 'Images uploaded successfully'}, status=status.HTTP_201_CREATED)
 # ---------------------------------------------------------------------------------------------------
@@ -128,9 +293,17 @@ class ProductImageUploadView(APIView):
 class DeleteProductImagesView(APIView):
     def delete(self, request, product_id):
         images = ProductImage.objects.filter(product_id=product_id)
-        for image in images:
-            image.image.delete()
-            image.delete()
+        with transaction.atomic():
+            names = list(images.values_list('image', flat=True))
+            # ProductImage ला कुठलाही FK refer करत नाही - collector आणि per-row post_delete signals (प्रत्येक image ला
+            # DeletionMark upsert + on_commit) सोडून एकच DELETE; signals चं काम इथे एकदाच
+            images._raw_delete(images.db)
+            if names:
+                mark_deleted(ProductImage)
+                transaction.on_commit(bump_catalog_version)
+
+            # Files request मध्ये delete होत नाहीत - queue मधून background worker काढतो (myapp/media.py)
+            enqueue_file_deletions(names)
         return Response({'message': 'Product images deleted successfully.'}, status=status.HTTP_200_OK)
 # ---------------------------------------------------------------------------------------------------
 
@@ -139,6 +312,7 @@ class CartView(APIView):
     permission_classes = [IsAuthenticated]
     authentication_classes = [JWTAuthentication]
 
+    @idempotent
     def post(self, request):
         user = request.user
         product_id = request.data.get('product_id')
@@ -146,42 +320,91 @@ class CartView(APIView):
 
         if not product_id:
             return Response({'error': 'Product ID is required.'}, status=status.HTTP_400_BAD_REQUEST)
+        if quantity < 1:
+            return Response({'error': 'Quantity must be at least 1.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            product_instance = Product.objects.get(id=product_id)
-        except Product.DoesNotExist:
+        if not Product.objects.filter(id=product_id).exists():
             return Response({'error': 'Product not found.'}, status=status.HTTP_404_NOT_FOUND)
 
-        cart_item, created = Cart.objects.get_or_create(user=user, product=product_instance)
-        if not created:
-            cart_item.quantity += quantity
-            cart_item.save()
+        # Upsert + F() increment (किंवा cache mode मध्ये cart store) - एकाच वेळी दोन requests आले तरी quantity हरवत नाही
+        update_cart(user, [{'op': 'add', 'product_id': int(product_id), 'quantity': quantity}])
 
         return Response({'message': 'Product added to cart successfully!'}, status=status.HTTP_200_OK)
 
     def get(self, request):
         user = request.user
         cart_items = Cart.objects.filter(user=user)
-        serializer = CartSerializer(cart_items, many=True)
+
+        # `?fields=` / `?expand=` नसतील तर fast path (cache mode मध्ये cache मधून), असतील तर फक्त लागणारे product / images load करतो
+        spec = requested_fields(request)
+        if not spec:
+            return Response(cart_data(user), status=status.HTTP_200_OK)
+
+        sync_cart(user)
+        probe = CartSerializer(**spec)
+        if renders(probe, 'product') or 'subtotal' in probe.fields:
+            cart_items = cart_items.select_related('product')
+        if renders(probe, 'product.images'):
+            cart_items = cart_items.prefetch_related('product__images')
+
+        serializer = CartSerializer(cart_items, many=True, **spec)
         return Response(serializer.data, status=status.HTTP_200_OK)
 # ---------------------------------------------------------------------------------------------------
 
+# Cart summary API - items, line subtotals, item count आणि grand total (database मध्ये calculate, constant queries)
+class CartSummaryView(APIView):
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [JWTAuthentication]
+
+    def get(self, request):
+        # Cache cart store असेल तर आधी Cart table up-to-date करतो
+        sync_cart(request.user)
+        return Response(CartSummarySerializer(cart_summary(request.user)).data, status=status.HTTP_200_OK)
+# ---------------------------------------------------------------------------------------------------
+
+# Cart मध्ये अनेक बदल (add / set / remove) एकाच request आणि transaction मध्ये करण्याची API
+# ✅ Response मध्ये बदलानंतरचा पूर्ण cart (GET /cart/ सारखाच)
+class CartBatchView(APIView):
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [JWTAuthentication]
+
+    def post(self, request):
+        serializer = CartBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        operations = serializer.validated_data['operations']
+
+        product_ids = {operation['product_id'] for operation in operations}
+        missing = product_ids - set(Product.objects.filter(id__in=product_ids).values_list('id', flat=True))
+        if missing:
+            return Response(
+                {'error': 'Product not found.', 'product_ids': sorted(missing)}, status=status.HTTP_404_NOT_FOUND,
+            )
+
+        update_cart(request.user, operations)
+        return Response(cart_data(request.user), status=status.HTTP_200_OK)
+# ---------------------------------------------------------------------------------------------------
+
 # Cart मध्ये Product ची Quantity Update करण्याची API
 class UpdateCartQuantityView(APIView):
     permission_classes = [IsAuthenticated]
     authentication_classes = [JWTAuthentication]
 
     def post(self, request):
-        cart_id = request.data.get('cart_id')
-        quantity = request.data.get('quantity')
-
         try:
-            cart_item = Cart.objects.get(id=cart_id, user=request.user)
-            cart_item.quantity = quantity
-            cart_item.save()
-            return Response({'message': 'Quantity updated successfully'}, status=status.HTTP_200_OK)
-        except Cart.DoesNotExist:
+            cart_id = int(request.data.get('cart_id'))
+            quantity = int(request.data.get('quantity'))
+        except (TypeError, ValueError):
+            return Response({'message': 'cart_id and quantity must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+        if quantity < 0:
+            return Response({'message': 'Quantity cannot be negative'}, status=status.HTTP_400_BAD_REQUEST)
+
+        product_id = cart_product_id(request.user, cart_id)
+        if product_id is None:
             return Response({'message': 'Cart item not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        update_cart(request.user, [{'op': 'set', 'product_id': product_id, 'quantity': quantity}])
+        return Response({'message': 'Quantity updated successfully'}, status=status.HTTP_200_OK)
 # ---------------------------------------------------------------------------------------------------
 
 # Cart मधून Product Delete करण्याची API
@@ -190,12 +413,12 @@ class DeleteCartItemView(APIView):
     authentication_classes = [JWTAuthentication]
 
     def delete(self, request, cart_id):
-        try:
-            cart_item = Cart.objects.get(id=cart_id, user=request.user)
-            cart_item.delete()
-            return Response({'message': 'Item removed from cart'}, status=status.HTTP_200_OK)
-        except Cart.DoesNotExist:
+        product_id = cart_product_id(request.user, cart_id)
+        if product_id is None:
             return Response({'message': 'Cart item not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        update_cart(request.user, [{'op': 'remove', 'product_id': product_id}])
+        return Response({'message': 'Item removed from cart'}, status=status.HTTP_200_OK)
 # ---------------------------------------------------------------------------------------------------
 
 # Checkout करण्यासाठी (Buy Now किंवा Cart Checkout) API
@@ -203,6 +426,7 @@ class CheckoutView(APIView):
     permission_classes = [IsAuthenticated]
     authentication_classes = [JWTAuthentication]
 
+    @idempotent
     def post(self, request):
         user = request.user
         checkout_type = request.data.get('checkout_type')  # 'cart' or 'buy_now'
@@ -218,53 +442,100 @@ class CheckoutView(APIView):
             except Product.DoesNotExist:
                 return Response({'error': 'Product not found!'}, status=status.HTTP_400_BAD_REQUEST)
 
-            address_serializer = AddressSerializer(data=request.data)
-            if not address_serializer.is_valid():
-                return Response(address_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            try:
+                quantity = int(product_data.get('quantity', 1))
+            except (TypeError, ValueError):
+                quantity = 0
+            if quantity < 1:
+                return Response({'error': 'Quantity must be a positive integer!'}, status=status.HTTP_400_BAD_REQUEST)
 
-            address = address_serializer.save(user=user)
+            try:
+                with transaction.atomic():
+                    address, error = _checkout_address(request, user)
+                    if error is not None:
+                        return error
 
-            order = Order.objects.create(user=user, address=address, total_price=product.price)
+                    order = Order.objects.create(user=user, address=address, total_price=product.price * quantity)
 
-            OrderItem.objects.create(
-                order=order,
-                product=product,
-                quantity=product_data.get('quantity', 1),
-                price=product.price
-            )
+                    # Cart checkout सारखा bulk_create - नवीन order ला OrderItem signals (touch_order) ची गरज नाही
+                    OrderItem.objects.bulk_create([OrderItem(
+                        order=order,
+                        product=product,
+                        quantity=quantity,
+                        price=product.price
+                    )])
+
+                    reserve_stock(order, {product.id: quantity})
+            except OutOfStock as exc:
+                return _out_of_stock(exc)
 
             return Response({'message': 'Buy Now Order placed successfully!'}, status=status.HTTP_201_CREATED)
 
         elif checkout_type == 'cart':
-            cart_items = Cart.objects.filter(user=user)
+            # Cache mode मध्ये cart आधी database मध्ये लिहिला जातो आणि checkout होईपर्यंत lock राहतो
+            with checkout_cart(user):
+                return self._checkout_cart(request, user)
+
+        else:
+            return Response({'error': 'Invalid checkout type!'}, status=status.HTTP_400_BAD_REQUEST)
 
-            if not cart_items.exists():
-                return Response({'error': 'Your cart is empty!'}, status=status.HTTP_400_BAD_REQUEST)
+    # ✅ पूर्ण checkout एकाच transaction मध्ये: cart rows lock, एक aggregate, एक bulk insert, stock reserve, एक delete
+    # ✅ Cart मध्ये कितीही items असले तरी queries तेवढ्याच
+    def _checkout_cart(self, request, user):
+        try:
+            with transaction.atomic():
+                cart_items = Cart.objects.filter(user=user)
+                # Checkout होईपर्यंत दुसरा request हा cart बदलू / परत checkout करू शकत नाही (products lock होत नाहीत)
+                lock = cart_items.select_for_update(of=('self',)) if connection.features.has_select_for_update_of else cart_items.select_for_update()
+                lines = list(lock.values_list('id', 'product_id', 'quantity', 'product__price'))
 
-            address_serializer = AddressSerializer(data=request.data)
-            if not address_serializer.is_valid():
-                return Response(address_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+                if not lines:
+                    return Response({'error': 'Your cart is empty!'}, status=status.HTTP_400_BAD_REQUEST)
 
-            address = address_serializer.save(user=user)
+                address, error = _checkout_address(request, user)
+                if error is not None:
+                    return error
 
-            total_price = sum(item.product.price * item.quantity for item in cart_items)
+                cart_ids = [cart_id for cart_id, _, _, _ in lines]
+                locked_items = Cart.objects.filter(pk__in=cart_ids)
+                total_price = locked_items.aggregate(total=Sum(
+                    F('quantity') * F('product__price'), output_field=DecimalField(max_digits=10, decimal_places=2),
+                ))['total']
 
-            order = Order.objects.create(user=user, address=address, total_price=total_price)
+                order = Order.objects.create(user=user, address=address, total_price=total_price)
 
-            for item in cart_items:
-                OrderItem.objects.create(
-                    order=order,
-                    product=item.product,
-                    quantity=item.quantity,
-                    price=item.product.price
-                )
+                OrderItem.objects.bulk_create([
+                    OrderItem(order=order, product_id=product_id, quantity=quantity, price=price)
+                    for _, product_id, quantity, price in lines
+                ])
 
-            cart_items.delete()
+                # Tracked products चा stock reserve - कमी पडला तर पूर्ण checkout rollback, cart तसाच राहतो
+                reserve_stock(order, {product_id: quantity for _, product_id, quantity, _ in lines})
 
-            return Response({'message': 'Cart Order placed successfully!'}, status=status.HTTP_201_CREATED)
+                locked_items.delete()
+        except OutOfStock as exc:
+            return _out_of_stock(exc)
 
-        else:
-            return Response({'error': 'Invalid checkout type!'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'message': 'Cart Order placed successfully!'}, status=status.HTTP_201_CREATED)
+# ---------------------------------------------------------------------------------------------------
+
+# User चा address book - सर्व saved addresses (GET) आणि नवीन address add (POST, तोच असेल तर जुनीच row)
+class AddressBookView(APIView):
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [JWTAuthentication]
+
+    def get(self, request):
+        addresses = Address.objects.filter(user=request.user).order_by('-id')
+        return Response(AddressBookSerializer(addresses, many=True).data)
+
+    def post(self, request):
+        serializer = AddressSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        address, created = save_address(request.user, serializer.validated_data)
+        return Response(
+            AddressBookSerializer(address).data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
 # ---------------------------------------------------------------------------------------------------
 
 # User च्या सर्व Order List साठी API
@@ -274,9 +545,8 @@ class UserOrdersView(APIView):
 
     def get(self, request):
         user = request.user
-        orders = Order.objects.filter(user=user).order_by('-created_at')
-        serializer = OrderSerializer(orders, many=True)
-        return Response(serializer.data)
+        orders = Order.objects.filter(user=user).order_by('-created_at', '-id')
+        return _order_list_response(request, orders, self, scope=user.pk)
 # ---------------------------------------------------------------------------------------------------
 
 # User चा Order Cancel करण्यासाठी API
@@ -287,6 +557,7 @@ class CancelOrderView(APIView):
     def delete(self, request, order_id):
         try:
             order = Order.objects.get(id=order_id, user=request.user)
+            # Unpaid order चा reserved stock delete सोबतच परत shards मध्ये (signals.release_order_stock)
             order.delete()
             return Response({'message': 'Order cancelled successfully!'}, status=status.HTTP_200_OK)
         except Order.DoesNotExist:
@@ -298,18 +569,108 @@ class AdminOrderListView(APIView):
     authentication_classes = [AdminJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
+    # ?created_after=&created_before=&user=&min_total=&max_total= filters, नेहमी keyset pages (?page_size=&cursor=),
+    # ?count=approximate (COUNT(*) scan शिवाय total चा अंदाज)
     def get(self, request):
+        filters = AdminOrderFilterSerializer(data=request.query_params)
+        if not filters.is_valid():
+            return Response(filters.errors, status=status.HTTP_400_BAD_REQUEST)
+
         try:
-            orders = Order.objects.all().order_by('-created_at')
-            serializer = OrderSerializer(orders, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            orders = filters.filter(Order.objects.all()).order_by('-created_at', '-id')
+            return _order_list_response(request, orders, self, pagination_class=AdminOrderKeysetPagination)
+        except APIException:
+            raise
         except Exception as e:
             print("Error in fetching orders: ", e)
             return Response({'error': 'Something went wrong'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 # ---------------------------------------------------------------------------------------------------
 
+# Admin साठी सर्व Orders streaming export (NDJSON / CSV) करण्याची API
+class AdminOrderExportView(APIView):
+    authentication_classes = [AdminJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    content_negotiation_class = IgnoreClientContentNegotiation
+
+    def get(self, request):
+        return export_response(request, 'orders', order_records(request), ORDER_CSV_HEADER, order_csv_rows)
+# ---------------------------------------------------------------------------------------------------
+
+# Admin साठी Product चा stock बघण्याची (GET) आणि विकता येणारा stock set करण्याची (POST {"quantity": n}) API
+class AdminProductStockView(APIView):
+    authentication_classes = [AdminJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, product_id):
+        if not Product.objects.filter(id=product_id).exists():
+            return Response({'error': 'Product not found!'}, status=status.HTTP_404_NOT_FOUND)
+        levels = stock_levels([product_id]).get(product_id)
+        return Response({
+            'product_id': product_id,
+            'tracked': levels is not None,
+            'available': levels['available'] if levels else None,
+            'reserved': levels['reserved'] if levels else None,
+        })
+
+    def post(self, request, product_id):
+        try:
+            quantity = int(request.data.get('quantity'))
+        except (TypeError, ValueError):
+            quantity = -1
+        if quantity < 0:
+            return Response({'error': 'quantity must be a non-negative integer'}, status=status.HTTP_400_BAD_REQUEST)
+        if not Product.objects.filter(id=product_id).exists():
+            return Response({'error': 'Product not found!'}, status=status.HTTP_404_NOT_FOUND)
+
+        set_stock(product_id, quantity)
+        return self.get(request, product_id)
+# ---------------------------------------------------------------------------------------------------
+
+# Admin साठी Order चा payment confirm करण्याची API - reserved stock consume होतो
+class AdminOrderPaidView(APIView):
+    authentication_classes = [AdminJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, order_id):
+        try:
+            order = mark_order_paid(order_id)
+        except Order.DoesNotExist:
+            return Response({'error': 'Order not found!'}, status=status.HTTP_404_NOT_FOUND)
+        except OutOfStock as exc:
+            # Reservation expire झाला आणि तेवढा stock आता उरला नाही
+            return _out_of_stock(exc)
+        return Response({'message': 'Order marked as paid.', 'paid_at': order.paid_at})
+# ---------------------------------------------------------------------------------------------------
+
+# Admin dashboard साठी sales analytics - फक्त daily rollup tables वाचते (refresh_rollups command)
+class AdminSalesAnalyticsView(APIView):
+    authentication_classes = [AdminJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        query = SalesAnalyticsQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        return Response(SalesSummarySerializer(sales_summary(**query.validated_data)).data)
+# ---------------------------------------------------------------------------------------------------
+
+# Admin साठी NumPy sales report - revenue percentiles, basket sizes, price elasticity, cohort retention
+class AdminSalesReportView(APIView):
+    authentication_classes = [AdminJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if not analytics_available():
+            return Response({'error': 'Sales reports need numpy installed.'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        query = SalesReportQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        return Response(cached_sales_report(**query.validated_data))
+# ---------------------------------------------------------------------------------------------------
+
 # Contact Form Submit करण्यासाठी व सर्व Contact List मिळवण्यासाठी API
 class ContactView(APIView):
+    @idempotent
     def post(self, request):
         serializer = ContactSerializer(data=request.data)
         if serializer.is_valid():
@@ -1,5 +1,6 @@
 
 import os
+from corsheaders.defaults import default_headers
 import json
 from pathlib import Path
 from datetime import timedelta
@@ -22,8 +23,17 @@ ALLOWED_HOSTS = ['.onrender.com']
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Upload होत असतानाच file चा SHA-256 काढण्यासाठी (content-addressed product images - myapp/storage.py)
+FILE_UPLOAD_HANDLERS = [
+    'myapp.storage.HashingMemoryFileUploadHandler',
+    'myapp.storage.HashingTemporaryFileUploadHandler',
+]
+
 # CORS
 CORS_ALLOW_ALL_ORIGINS = True
+# Checkout / cart / contact retries साठी Idempotency-Key header (myapp/idempotency.py)
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
+CORS_EXPOSE_HEADERS = ['Idempotent-Replayed']
 
 # Installed apps
 INSTALLED_APPS = [
@@ -43,6 +53,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'myapp.middleware.CompressionMiddleware',  # API responses साठी br / gzip (myapp/middleware.py)
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -93,6 +104,45 @@ else:
 # MySQL connector
 pymysql.install_as_MySQLdb()
 
+# Cache (REDIS_URL असेल तर सर्व workers मध्ये shared Redis, नाहीतर per-process local memory LRU cache)
+redis_url = os.environ.get('REDIS_URL')
+
+if redis_url:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': redis_url,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'freshnest',
+            'OPTIONS': {'MAX_ENTRIES': 5000},
+        },
+        # Idempotency keys / locks सगळ्या workers मध्ये shared हवेत - Redis नसेल तर database table
+        # ✅ Table migration 0041 (`migrate`) बनवतो
+        'idempotency': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'idempotency_cache',
+        },
+    }
+
+# Idempotency-Key responses आणि locks (myapp/idempotency.py) - LocMem वर चालत नाही (system check myapp.E001)
+IDEMPOTENCY_CACHE_ALIAS = 'default' if redis_url else 'idempotency'
+# App समोर किती reverse proxies X-Forwarded-For मध्ये client IP लिहितात (nginx / load balancer) - anonymous callers चा
+# idempotency scope त्या IP वरून. 0 = direct (REMOTE_ADDR); proxies नसताना वाढवला तर client स्वतःचा IP खोटा देऊ शकतो
+IDEMPOTENCY_TRUSTED_PROXIES = int(os.environ.get('IDEMPOTENCY_TRUSTED_PROXIES', 0))
+
+# Product catalog responses किती seconds cache मध्ये ठेवायचे
+# ✅ LocMem (REDIS_URL नाही) वर catalog version database मध्ये (CatalogVersion) - सगळे gunicorn workers एकाच वेळी invalidate होतात
+CATALOG_CACHE_TIMEOUT = 300
+
+# Cart storage: 'database' (default) किंवा 'cache' - cart cache मध्ये आणि बदल background मध्ये Cart table मध्ये (myapp/cart_store.py)
+# ✅ 'cache' mode साठी REDIS_URL (shared cache) लागतो - LocMem वर system check error (myapp.E002)
+CART_STORE = os.environ.get('CART_STORE', 'database')
+
 # Static files
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
@@ -118,6 +168,17 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
+    # orjson वर चालणारे JSON renderer / parser (myapp/renderers.py, myapp/parsers.py)
+    # ✅ stdlib वर परत जायचं असेल तर 'rest_framework.renderers.JSONRenderer' / 'rest_framework.parsers.JSONParser'
+    'DEFAULT_RENDERER_CLASSES': (
+        'myapp.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'myapp.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 SIMPLE_JWT = {
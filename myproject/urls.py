@@ -2,9 +2,9 @@ from django.contrib import admin
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from myapp.views import (
-    AdminLoginView, AdminOrderListView, CancelOrderView, CheckoutView, ProductViewSet, CartView, UpdateCartQuantityView, DeleteCartItemView,
+    AdminLoginView, AdminOrderExportView, AdminOrderListView, AdminOrderPaidView, AdminProductStockView, AdminSalesAnalyticsView, AdminSalesReportView, AddressBookView, CancelOrderView, CheckoutView, ProductViewSet, CartView, CartBatchView, CartSummaryView, UpdateCartQuantityView, DeleteCartItemView,
     RegisterUser, LoginUser, ProductImageUploadView, DeleteProductImagesView, UserOrdersView,
-    ContactView, ContactDeleteView,
+    ContactView, ContactDeleteView, ProductExportView,
 )
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from django.conf import settings
@@ -21,6 +21,14 @@ urlpatterns = [
     # Admin login
     path('api/admin-login/', AdminLoginView.as_view()),  # admin लॉगिन API
     path('api/admin/orders/', AdminOrderListView.as_view()),  # admin ला सर्व orders बघण्यासाठी
+    path('api/admin/orders/export/', AdminOrderExportView.as_view()),  # admin साठी सर्व orders NDJSON / CSV मध्ये stream करण्यासाठी
+    path('api/admin/orders/<int:order_id>/paid/', AdminOrderPaidView.as_view()),  # admin ने order चा payment confirm करण्यासाठी (reserved stock consume)
+    path('api/admin/products/<int:product_id>/stock/', AdminProductStockView.as_view()),  # admin साठी product stock बघणे / set करणे
+    path('api/admin/analytics/sales/', AdminSalesAnalyticsView.as_view()),  # admin dashboard साठी daily sales rollups
+    path('api/admin/analytics/report/', AdminSalesReportView.as_view()),  # admin साठी NumPy sales report (percentiles, baskets, elasticity, cohorts)
+
+    # Catalog export
+    path('export/products/', ProductExportView.as_view(), name='export-products'),  # सर्व products NDJSON / CSV मध्ये stream करण्यासाठी
 
     # Product images
     path('upload-images/', ProductImageUploadView.as_view(), name='upload-images'),  # प्रॉडक्ट इमेज अपलोड करण्यासाठी
@@ -36,11 +44,14 @@ urlpatterns = [
 
     # Cart operations
     path('cart/', CartView.as_view(), name='cart'),  # cart मध्ये item add / बघण्यासाठी
+    path('cart/summary/', CartSummaryView.as_view(), name='cart-summary'),  # cart items + subtotals + total एकाच response मध्ये
+    path('cart/batch/', CartBatchView.as_view(), name='cart-batch'),  # cart मध्ये अनेक add / set / remove एकाच request मध्ये
     path('cart/update/', UpdateCartQuantityView.as_view(), name='update-cart'),  # cart मध्ये quantity update करण्यासाठी
     path('cart/delete/<int:cart_id>/', DeleteCartItemView.as_view(), name='delete-cart'),  # cart मधून item delete करण्यासाठी
 
     # Checkout product
     path('checkout/', CheckoutView.as_view(), name='checkout'),  # checkout साठी
+    path('addresses/', AddressBookView.as_view(), name='addresses'),  # user चा address book (checkout ला address_id)
 
     # User orders
     path('my-orders/', UserOrdersView.as_view()),  # user चे स्वतःचे orders बघण्यासाठी